@@ -1,25 +1,33 @@
 #!/usr/bin/env python3
 
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import json
+import math
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
 import re
+from itertools import islice
 import xml.etree.ElementTree as ET
 from urllib.parse import quote
-from scraper import WebScraper
+from scraper import FetchContext, IncompleteFetch, WebScraper
+from exporters import format_timestamps
+from memo import memoized
+from endpoints import endpoint
+from logs import configure_logging
 
 
 class DevToScraper(WebScraper):
     """Scraper for Dev.to articles using their public API"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=0.5)
-        self.base_url = "https://dev.to"
-        self.api_url = "https://dev.to/api"
+        self.base_url = endpoint('devto.web')
+        self.api_url = endpoint('devto.api')
 
+    @memoized()
     def get_articles(self, page: int = 1, per_page: int = 30, tag: str = None, state: str = "rising") -> List[Dict]:
         """Get articles from Dev.to
         state can be: fresh, rising, all
@@ -36,6 +44,7 @@ class DevToScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             articles = response.json()
 
@@ -55,17 +64,51 @@ class DevToScraper(WebScraper):
                     'reading_time_minutes': article.get('reading_time_minutes'),
                     'positive_reactions': article.get('positive_reactions_count', 0),
                     'comments_count': article.get('comments_count', 0),
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': ctx.scraped_at
                 })
 
             return result
 
         except Exception as e:
-            print(f"Error fetching Dev.to articles: {e}")
+            self.log.error("Error fetching Dev.to articles: %s", e)
             return []
 
+    @memoized()
     def search_articles(self, query: str, page: int = 1, per_page: int = 30) -> List[Dict]:
         """Search for articles on Dev.to"""
+        return list(self.iter_search_articles(query, page, per_page))
+
+    def iter_search_articles(self, query: str, page: int = 1, per_page: int = 30, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield articles as they are parsed, stopping after max_items"""
+        url, params = self._search_request(query, page, per_page)
+
+        try:
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            yield from islice(self._parse_search_articles(response.json(), FetchContext.from_response(response)), max_items)
+
+        except Exception as e:
+            self.log.error("Error searching Dev.to: %s", e)
+
+    def harvest_articles(self, query: str, max_items: int = 1000, per_page: int = 100, prefetch: int = 4) -> Iterator[Dict]:
+        """Yield up to max_items articles for a tag, fetching pages concurrently"""
+        per_page = min(per_page, 100)
+
+        def fetch_page(n):
+            url, params = self._search_request(query, n + 1, per_page)
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+                response.raise_for_status()
+                items = list(self._parse_search_articles(response.json(), FetchContext.from_response(response)))
+            except Exception as e:
+                self.log.error("Error harvesting Dev.to (page %s): %s", n + 1, e)
+                return [], False
+
+            return items, len(items) == per_page
+
+        yield from self._harvest_pages(fetch_page, math.ceil(max_items / per_page), max_items, prefetch)
+
+    def _search_request(self, query: str, page: int = 1, per_page: int = 30) -> Tuple[str, Dict]:
         url = f"{self.api_url}/articles"
         params = {
             'page': page,
@@ -73,39 +116,33 @@ class DevToScraper(WebScraper):
             'tag': query  # Dev.to search is mainly tag-based via API
         }
 
-        try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            articles = response.json()
+        return url, params
 
-            result = []
-            for article in articles:
-                result.append({
-                    'id': article.get('id'),
-                    'title': article.get('title'),
-                    'description': article.get('description'),
-                    'url': article.get('url'),
-                    'author': article.get('user', {}).get('username'),
-                    'tags': article.get('tag_list', []),
-                    'published_at': article.get('published_at'),
-                    'positive_reactions': article.get('positive_reactions_count', 0),
-                    'comments_count': article.get('comments_count', 0),
-                    'reading_time_minutes': article.get('reading_time_minutes'),
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return result
-
-        except Exception as e:
-            print(f"Error searching Dev.to: {e}")
-            return []
+    def _parse_search_articles(self, articles: List[Dict], ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        for article in articles:
+            yield {
+                'id': article.get('id'),
+                'title': article.get('title'),
+                'description': article.get('description'),
+                'url': article.get('url'),
+                'author': article.get('user', {}).get('username'),
+                'tags': article.get('tag_list', []),
+                'published_at': article.get('published_at'),
+                'positive_reactions': article.get('positive_reactions_count', 0),
+                'comments_count': article.get('comments_count', 0),
+                'reading_time_minutes': article.get('reading_time_minutes'),
+                'scraped_at': scraped_at
+            }
 
+    @memoized()
     def get_article_with_content(self, article_id: int) -> Dict:
         """Get full article content"""
         url = f"{self.api_url}/articles/{article_id}"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             article = response.json()
 
@@ -122,27 +159,97 @@ class DevToScraper(WebScraper):
                 'positive_reactions': article.get('positive_reactions_count', 0),
                 'comments_count': article.get('comments_count', 0),
                 'reading_time_minutes': article.get('reading_time_minutes'),
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': ctx.scraped_at
             }
 
         except Exception as e:
-            print(f"Error fetching Dev.to article: {e}")
+            self.log.error("Error fetching Dev.to article: %s", e)
             return {}
 
 
 class ArXivScraper(WebScraper):
     """Scraper for ArXiv preprint papers"""
 
+    cache_ttl = 21600
+
     def __init__(self):
         super().__init__(delay=3.0)  # ArXiv requests 3 second delay
-        self.base_url = "http://export.arxiv.org/api/query"
+        self.base_url = endpoint('arxiv.api')
 
+    @memoized()
     def search_papers(self, query: str, max_results: int = 20, sort_by: str = "relevance", sort_order: str = "descending") -> List[Dict]:
         """Search ArXiv papers
         sort_by: relevance, lastUpdatedDate, submittedDate
         sort_order: ascending, descending
         """
-        params = {
+        return list(self.iter_search_papers(query, max_results, sort_by, sort_order))
+
+    def iter_search_papers(self, query: str, max_results: int = 20, sort_by: str = "relevance", sort_order: str = "descending", max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield papers as they are parsed, stopping after max_items"""
+        params = self._search_params(query, max_results, sort_by, sort_order)
+
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=10)
+            response.raise_for_status()
+            yield from islice(self._parse_search_feed(ET.fromstring(response.content), FetchContext.from_response(response)), max_items)
+
+        except Exception as e:
+            self.log.error("Error searching ArXiv: %s", e)
+
+    def harvest_papers(self, query: str, sort_by: str = "submittedDate", sort_order: str = "descending",
+                       max_items: int = 1000, page_size: int = 200, prefetch: int = 2,
+                       since: Optional[int] = None, strict: bool = False) -> Iterator[Dict]:
+        """Yield up to max_items papers, paging through results with start offsets
+
+        arXiv asks for one request every 3 seconds, which the rate limiter
+        enforces; prefetching only hides the response time of each page.
+        `since` (epoch seconds) restricts the query to papers submitted from
+        that minute on. With strict, a failed page raises IncompleteFetch
+        instead of quietly ending the harvest.
+        """
+        ns = {'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'}
+        date_range = ''
+        if since is not None:
+            start = datetime.fromtimestamp(since, timezone.utc).strftime('%Y%m%d%H%M')
+            end = (datetime.now(timezone.utc) + timedelta(days=1)).strftime('%Y%m%d%H%M')
+            date_range = f' AND submittedDate:[{start} TO {end}]'
+
+        def fetch_page(n):
+            params = self._search_params(query, page_size, sort_by, sort_order)
+            params['search_query'] += date_range
+            params['start'] = n * page_size
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=30)
+                response.raise_for_status()
+                root = ET.fromstring(response.content)
+                items = list(self._parse_search_feed(root, FetchContext.from_response(response)))
+            except Exception as e:
+                self.log.error("Error harvesting ArXiv (start=%s): %s", params['start'], e)
+                if strict:
+                    raise IncompleteFetch(f"arXiv page at start={params['start']} failed: {e}") from e
+                return [], False
+
+            total = root.find('opensearch:totalResults', ns)
+            total = int(total.text) if total is not None and total.text else 0
+            return items, bool(items) and params['start'] + len(items) < total
+
+        yield from self._harvest_pages(fetch_page, math.ceil(max_items / page_size), max_items, prefetch)
+
+    def iter_papers_since(self, query: str, since: int, max_items: int = 1000) -> Iterator[Dict]:
+        """Yield papers matching query first published after `since` (epoch seconds), newest first
+
+        Raises IncompleteFetch, after the papers it got, if a page fails.
+        """
+        papers = self.harvest_papers(query, "submittedDate", "descending", max_items=max_items,
+                                     page_size=min(max_items, 100), since=since, strict=True)
+        for paper in papers:
+            published = datetime.fromisoformat(paper['published'].replace('Z', '+00:00'))
+            if published.timestamp() <= since:
+                return
+            yield paper
+
+    def _search_params(self, query: str, max_results: int = 20, sort_by: str = "relevance", sort_order: str = "descending") -> Dict:
+        return {
             'search_query': f'all:{query}',
             'start': 0,
             'max_results': max_results,
@@ -150,49 +257,38 @@ class ArXivScraper(WebScraper):
             'sortOrder': sort_order
         }
 
-        try:
-            response = self.session.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
-
-            # Parse XML response
-            root = ET.fromstring(response.content)
+    def _parse_search_feed(self, root: ET.Element, ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        # Define namespaces
+        ns = {
+            'atom': 'http://www.w3.org/2005/Atom',
+            'arxiv': 'http://arxiv.org/schemas/atom'
+        }
 
-            # Define namespaces
-            ns = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
+        for entry in root.findall('atom:entry', ns):
+            paper = {
+                'id': entry.find('atom:id', ns).text.replace('http://arxiv.org/abs/', ''),
+                'title': entry.find('atom:title', ns).text.strip().replace('\n', ' '),
+                'summary': entry.find('atom:summary', ns).text.strip()[:500],
+                'authors': [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)],
+                'published': entry.find('atom:published', ns).text,
+                'updated': entry.find('atom:updated', ns).text,
+                'categories': [cat.get('term') for cat in entry.findall('atom:category', ns)],
+                'pdf_url': None,
+                'url': None,
+                'scraped_at': scraped_at
             }
 
-            papers = []
-            for entry in root.findall('atom:entry', ns):
-                paper = {
-                    'id': entry.find('atom:id', ns).text.replace('http://arxiv.org/abs/', ''),
-                    'title': entry.find('atom:title', ns).text.strip().replace('\n', ' '),
-                    'summary': entry.find('atom:summary', ns).text.strip()[:500],
-                    'authors': [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)],
-                    'published': entry.find('atom:published', ns).text,
-                    'updated': entry.find('atom:updated', ns).text,
-                    'categories': [cat.get('term') for cat in entry.findall('atom:category', ns)],
-                    'pdf_url': None,
-                    'url': None,
-                    'scraped_at': datetime.now().isoformat()
-                }
-
-                # Get links
-                for link in entry.findall('atom:link', ns):
-                    if link.get('type') == 'application/pdf':
-                        paper['pdf_url'] = link.get('href')
-                    elif link.get('type') == 'text/html':
-                        paper['url'] = link.get('href')
-
-                papers.append(paper)
+            # Get links
+            for link in entry.findall('atom:link', ns):
+                if link.get('type') == 'application/pdf':
+                    paper['pdf_url'] = link.get('href')
+                elif link.get('type') == 'text/html':
+                    paper['url'] = link.get('href')
 
-            return papers
-
-        except Exception as e:
-            print(f"Error searching ArXiv: {e}")
-            return []
+            yield paper
 
+    @memoized()
     def get_category_papers(self, category: str = "cs.AI", max_results: int = 20) -> List[Dict]:
         """Get recent papers from specific category
         Common categories: cs.AI, cs.LG, cs.CL, cs.CV
@@ -207,6 +303,7 @@ class ArXivScraper(WebScraper):
 
         try:
             response = self.session.get(self.base_url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
 
             root = ET.fromstring(response.content)
@@ -222,7 +319,7 @@ class ArXivScraper(WebScraper):
                     'published': entry.find('atom:published', ns).text,
                     'updated': entry.find('atom:updated', ns).text,
                     'categories': [cat.get('term') for cat in entry.findall('atom:category', ns)],
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': ctx.scraped_at
                 }
 
                 for link in entry.findall('atom:link', ns):
@@ -236,17 +333,19 @@ class ArXivScraper(WebScraper):
             return papers
 
         except Exception as e:
-            print(f"Error fetching ArXiv category: {e}")
+            self.log.error("Error fetching ArXiv category: %s", e)
             return []
 
 
 class ProductHuntScraper(WebScraper):
     """Scraper for Product Hunt launches"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://www.producthunt.com"
-        self.api_url = "https://api.producthunt.com/v2/api/graphql"
+        self.base_url = endpoint('producthunt.web')
+        self.api_url = endpoint('producthunt.api')
 
     def get_trending_products(self, days_ago: int = 0, limit: int = 20) -> List[Dict]:
         """Get trending products from Product Hunt
@@ -306,9 +405,10 @@ class ProductHuntScraper(WebScraper):
                 headers=headers,
                 timeout=10
             )
+            ctx = FetchContext.from_response(response)
 
             if response.status_code == 401:
-                print("Product Hunt API requires authentication. Using web scraping fallback...")
+                self.log.info("Product Hunt API requires authentication. Using web scraping fallback...")
                 return self._scrape_trending_web(days_ago, limit)
 
             response.raise_for_status()
@@ -329,13 +429,13 @@ class ProductHuntScraper(WebScraper):
                     'topics': [t['node']['name'] for t in node.get('topics', {}).get('edges', [])],
                     'maker': node.get('user', {}).get('name', ''),
                     'created_at': node.get('createdAt'),
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': ctx.scraped_at
                 })
 
             return products
 
         except Exception as e:
-            print(f"Error with Product Hunt API: {e}")
+            self.log.error("Error with Product Hunt API: %s", e)
             return self._scrape_trending_web(days_ago, limit)
 
     def _scrape_trending_web(self, days_ago: int = 0, limit: int = 20) -> List[Dict]:
@@ -348,6 +448,7 @@ class ProductHuntScraper(WebScraper):
 
         try:
             html = self.fetch(url)
+            ctx = FetchContext()
             if not html:
                 return []
 
@@ -368,7 +469,7 @@ class ProductHuntScraper(WebScraper):
                         'tagline': tagline_elem.text.strip() if tagline_elem else '',
                         'votes': votes_elem.text.strip() if votes_elem else '0',
                         'url': self.base_url + card.get('href', ''),
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except:
                     continue
@@ -376,23 +477,27 @@ class ProductHuntScraper(WebScraper):
             return products
 
         except Exception as e:
-            print(f"Error scraping Product Hunt: {e}")
+            self.log.error("Error scraping Product Hunt: %s", e)
             return []
 
 
 class PapersWithCodeScraper(WebScraper):
     """Scraper for Papers with Code"""
 
+    cache_ttl = 3600
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://paperswithcode.com"
+        self.base_url = endpoint('paperswithcode.web')
 
+    @memoized()
     def get_trending_papers(self, limit: int = 20) -> List[Dict]:
         """Get trending papers from Papers with Code"""
         url = f"{self.base_url}/trending"
 
         try:
             html = self.fetch(url)
+            ctx = FetchContext()
             if not html:
                 return []
 
@@ -437,19 +542,20 @@ class PapersWithCodeScraper(WebScraper):
                         'code_url': code_url,
                         'stars': stars,
                         'published': published_date,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
                 except Exception as e:
-                    print(f"Error parsing paper item: {e}")
+                    self.log.warning("Error parsing paper item: %s", e)
                     continue
 
             return papers
 
         except Exception as e:
-            print(f"Error fetching Papers with Code: {e}")
+            self.log.error("Error fetching Papers with Code: %s", e)
             return []
 
+    @memoized()
     def search_papers(self, query: str, limit: int = 20) -> List[Dict]:
         """Search papers on Papers with Code"""
         url = f"{self.base_url}/search"
@@ -457,9 +563,10 @@ class PapersWithCodeScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
             papers = []
 
             # Find search results
@@ -489,7 +596,7 @@ class PapersWithCodeScraper(WebScraper):
                         'abstract': abstract_elem.text.strip()[:500] if abstract_elem else '',
                         'url': paper_url,
                         'stars': stars,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
                 except:
@@ -498,23 +605,27 @@ class PapersWithCodeScraper(WebScraper):
             return papers
 
         except Exception as e:
-            print(f"Error searching Papers with Code: {e}")
+            self.log.error("Error searching Papers with Code: %s", e)
             return []
 
 
 class LobstersScraper(WebScraper):
     """Scraper for Lobste.rs community"""
 
+    cache_ttl = 600
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://lobste.rs"
+        self.base_url = endpoint('lobsters.web')
 
+    @memoized()
     def get_hottest_stories(self, limit: int = 25) -> List[Dict]:
         """Get hottest stories from Lobste.rs"""
         url = f"{self.base_url}/hottest.json"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             stories = response.json()
 
@@ -533,21 +644,23 @@ class LobstersScraper(WebScraper):
                         'tags': story.get('tags', []),
                         'created_at': story.get('created_at'),
                         'comments_url': story.get('comments_url'),
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
             return result
 
         except Exception as e:
-            print(f"Error fetching Lobste.rs hottest: {e}")
+            self.log.error("Error fetching Lobste.rs hottest: %s", e)
             return []
 
+    @memoized()
     def get_newest_stories(self, limit: int = 25) -> List[Dict]:
         """Get newest stories from Lobste.rs"""
         url = f"{self.base_url}/newest.json"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             stories = response.json()
 
@@ -566,15 +679,16 @@ class LobstersScraper(WebScraper):
                         'tags': story.get('tags', []),
                         'created_at': story.get('created_at'),
                         'comments_url': story.get('comments_url'),
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
             return result
 
         except Exception as e:
-            print(f"Error fetching Lobste.rs newest: {e}")
+            self.log.error("Error fetching Lobste.rs newest: %s", e)
             return []
 
+    @memoized()
     def search_stories(self, query: str, limit: int = 25) -> List[Dict]:
         """Search stories on Lobste.rs"""
         url = f"{self.base_url}/search"
@@ -582,9 +696,10 @@ class LobstersScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
             stories = []
 
             # Find story items
@@ -617,7 +732,7 @@ class LobstersScraper(WebScraper):
                         'comments_url': comments_url,
                         'author': author_elem.text.strip() if author_elem else '',
                         'tags': tags,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
                 except:
@@ -626,15 +741,17 @@ class LobstersScraper(WebScraper):
             return stories
 
         except Exception as e:
-            print(f"Error searching Lobste.rs: {e}")
+            self.log.error("Error searching Lobste.rs: %s", e)
             return []
 
+    @memoized()
     def get_story_with_comments(self, story_id: str, limit: int = 10) -> Dict:
         """Get a story with its comments"""
         url = f"{self.base_url}/s/{story_id}.json"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             data = response.json()
 
@@ -661,11 +778,11 @@ class LobstersScraper(WebScraper):
                     'indent_level': comment.get('indent_level', 0)
                 })
 
-            story['scraped_at'] = datetime.now().isoformat()
+            story['scraped_at'] = ctx.scraped_at
             return story
 
         except Exception as e:
-            print(f"Error fetching Lobste.rs story: {e}")
+            self.log.error("Error fetching Lobste.rs story: %s", e)
             return {}
 
 
@@ -738,10 +855,11 @@ def demo_additional_scrapers():
 
     filename = f"additional_scrapers_sample_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(filename, 'w') as f:
-        json.dump(sample_data, f, indent=2, default=str)
+        json.dump(format_timestamps(sample_data), f, indent=2, default=str)
 
     print(f"\n\n✅ Sample data saved to: {filename}")
 
 
 if __name__ == "__main__":
+    configure_logging()
     demo_additional_scrapers()
\ No newline at end of file
@@ -1,29 +1,44 @@
 #!/usr/bin/env python3
 
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import json
+import math
+import os
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Tuple
 import re
+from itertools import islice
 from urllib.parse import quote, urljoin
-from scraper import WebScraper
+from scraper import FetchContext, IncompleteFetch, WebScraper
+from exporters import format_timestamps
+from memo import memoized
+from endpoints import endpoint
+from logs import configure_logging
 
 
 class StackOverflowScraper(WebScraper):
     """Scraper for Stack Overflow using Stack Exchange API"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=0.5)
-        self.base_url = "https://stackoverflow.com"
-        self.api_url = "https://api.stackexchange.com/2.3"
+        self.base_url = endpoint('stackoverflow.web')
+        self.api_url = endpoint('stackoverflow.api')
         self.site = "stackoverflow"
+        # An app key raises the daily quota and is required past page 25
+        self.key = os.environ.get('STACKEXCHANGE_KEY')
 
+    @memoized()
     def get_trending_questions(self, tagged: str = None, sort: str = "hot", limit: int = 30) -> List[Dict]:
         """Get trending questions from Stack Overflow
         sort: hot, week, month, interesting, featured
         """
+        return list(self.iter_trending_questions(tagged, sort, limit))
+
+    def iter_trending_questions(self, tagged: str = None, sort: str = "hot", limit: int = 30) -> Iterator[Dict]:
+        """Yield trending questions as they are parsed"""
         url = f"{self.api_url}/questions"
         params = {
             'order': 'desc',
@@ -38,12 +53,12 @@ class StackOverflowScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             data = response.json()
 
-            questions = []
             for item in data.get('items', []):
-                questions.append({
+                yield {
                     'id': item.get('question_id'),
                     'title': item.get('title'),
                     'link': item.get('link'),
@@ -53,22 +68,84 @@ class StackOverflowScraper(WebScraper):
                     'is_answered': item.get('is_answered', False),
                     'tags': item.get('tags', []),
                     'owner': item.get('owner', {}).get('display_name', 'anonymous'),
-                    'creation_date': datetime.fromtimestamp(item.get('creation_date', 0)).isoformat(),
-                    'last_activity': datetime.fromtimestamp(item.get('last_activity_date', 0)).isoformat(),
+                    'creation_date': int(item.get('creation_date', 0)),
+                    'last_activity': int(item.get('last_activity_date', 0)),
                     'body_preview': item.get('body', '')[:500],
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return questions
+                    'scraped_at': ctx.scraped_at
+                }
 
         except Exception as e:
-            print(f"Error fetching Stack Overflow questions: {e}")
-            return []
+            self.log.error("Error fetching Stack Overflow questions: %s", e)
 
+    @memoized()
     def search_questions(self, query: str, tagged: str = None, sort: str = "relevance", limit: int = 30) -> List[Dict]:
         """Search for questions on Stack Overflow
         sort: activity, votes, creation, relevance
         """
+        return list(self.iter_search_questions(query, tagged, sort, limit))
+
+    def iter_search_questions(self, query: str, tagged: str = None, sort: str = "relevance", limit: int = 30, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield questions as they are parsed, stopping after max_items"""
+        url, params = self._search_request(query, tagged, sort, limit)
+
+        try:
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            yield from islice(self._parse_search_items(response.json(), FetchContext.from_response(response)), max_items)
+
+        except Exception as e:
+            self.log.error("Error searching Stack Overflow: %s", e)
+
+    def harvest_questions(self, query: str, tagged: str = None, sort: str = "creation", max_items: int = 1000,
+                          page_size: int = 100, prefetch: int = 4, since: Optional[int] = None,
+                          strict: bool = False) -> Iterator[Dict]:
+        """Yield up to max_items questions, fetching result pages concurrently
+
+        Without STACKEXCHANGE_KEY the API refuses pages past 25, which caps
+        anonymous harvests at 2500 questions. `since` (epoch seconds) limits
+        the harvest to questions created after it. With strict, a failed page,
+        or more results past that cap, raises IncompleteFetch instead of
+        quietly ending the harvest.
+        """
+        url, params = self._search_request(query, tagged, sort, page_size)
+        if since is not None:
+            params['fromdate'] = int(since) + 1  # fromdate is inclusive
+        page_size = params['pagesize']
+        pages = math.ceil(max_items / page_size)
+        if not self.key:
+            pages = min(pages, 25)
+        capped = []
+
+        def fetch_page(n):
+            try:
+                response = self.session.get(url, params=dict(params, page=n + 1), timeout=10)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                self.log.error("Error harvesting Stack Overflow (page %s): %s", n + 1, e)
+                if strict:
+                    raise IncompleteFetch(f"Stack Overflow page {n + 1} failed: {e}") from e
+                return [], False
+
+            has_more = data.get('has_more', False)
+            if has_more and n + 1 == pages and pages * page_size < max_items:
+                capped.append(n + 1)
+            return list(self._parse_search_items(data, FetchContext.from_response(response))), has_more
+
+        yield from self._harvest_pages(fetch_page, pages, max_items, prefetch)
+        if strict and capped:
+            raise IncompleteFetch(f"Stack Overflow has more results past page {capped[0]}; set STACKEXCHANGE_KEY")
+
+    def iter_questions_since(self, query: str, since: int, tagged: str = None, max_items: int = 1000) -> Iterator[Dict]:
+        """Yield questions matching query created after `since` (epoch seconds), newest first
+
+        Raises IncompleteFetch, after the questions it got, if a page fails or
+        the anonymous page cap is reached.
+        """
+        yield from self.harvest_questions(query, tagged, sort="creation", max_items=max_items, since=since,
+                                          strict=True)
+
+    def _search_request(self, query: str, tagged: str = None, sort: str = "relevance", limit: int = 30) -> Tuple[str, Dict]:
         url = f"{self.api_url}/search/advanced"
         params = {
             'order': 'desc',
@@ -81,35 +158,30 @@ class StackOverflowScraper(WebScraper):
 
         if tagged:
             params['tagged'] = tagged
+        if self.key:
+            params['key'] = self.key
+
+        return url, params
+
+    def _parse_search_items(self, data: Dict, ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        for item in data.get('items', []):
+            yield {
+                'id': item.get('question_id'),
+                'title': item.get('title'),
+                'link': item.get('link'),
+                'score': item.get('score', 0),
+                'answer_count': item.get('answer_count', 0),
+                'view_count': item.get('view_count', 0),
+                'is_answered': item.get('is_answered', False),
+                'tags': item.get('tags', []),
+                'owner': item.get('owner', {}).get('display_name', 'anonymous'),
+                'creation_date': int(item.get('creation_date', 0)),
+                'body_preview': item.get('body', '')[:500],
+                'scraped_at': scraped_at
+            }
 
-        try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            questions = []
-            for item in data.get('items', []):
-                questions.append({
-                    'id': item.get('question_id'),
-                    'title': item.get('title'),
-                    'link': item.get('link'),
-                    'score': item.get('score', 0),
-                    'answer_count': item.get('answer_count', 0),
-                    'view_count': item.get('view_count', 0),
-                    'is_answered': item.get('is_answered', False),
-                    'tags': item.get('tags', []),
-                    'owner': item.get('owner', {}).get('display_name', 'anonymous'),
-                    'creation_date': datetime.fromtimestamp(item.get('creation_date', 0)).isoformat(),
-                    'body_preview': item.get('body', '')[:500],
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return questions
-
-        except Exception as e:
-            print(f"Error searching Stack Overflow: {e}")
-            return []
-
+    @memoized()
     def get_question_with_answers(self, question_id: int, limit: int = 5) -> Dict:
         """Get a question with its top answers"""
         url = f"{self.api_url}/questions/{question_id}"
@@ -121,6 +193,7 @@ class StackOverflowScraper(WebScraper):
         try:
             # Get question details
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             data = response.json()
 
@@ -136,7 +209,7 @@ class StackOverflowScraper(WebScraper):
                 'body': question.get('body', '')[:2000],
                 'tags': question.get('tags', []),
                 'owner': question.get('owner', {}).get('display_name', 'anonymous'),
-                'creation_date': datetime.fromtimestamp(question.get('creation_date', 0)).isoformat(),
+                'creation_date': int(question.get('creation_date', 0)),
                 'answers': []
             }
 
@@ -161,29 +234,36 @@ class StackOverflowScraper(WebScraper):
                     'is_accepted': answer.get('is_accepted', False),
                     'body': answer.get('body', '')[:1000],
                     'owner': answer.get('owner', {}).get('display_name', 'anonymous'),
-                    'creation_date': datetime.fromtimestamp(answer.get('creation_date', 0)).isoformat()
+                    'creation_date': int(answer.get('creation_date', 0))
                 })
 
-            result['scraped_at'] = datetime.now().isoformat()
+            result['scraped_at'] = ctx.scraped_at
             return result
 
         except Exception as e:
-            print(f"Error fetching question with answers: {e}")
+            self.log.error("Error fetching question with answers: %s", e)
             return {}
 
 
 class HuggingFaceScraper(WebScraper):
     """Scraper for Hugging Face models, datasets, and spaces"""
 
+    cache_ttl = 3600
+
     def __init__(self):
         super().__init__(delay=0.5)
-        self.base_url = "https://huggingface.co"
-        self.api_url = f"{self.base_url}/api"
+        self.base_url = endpoint('huggingface.web')
+        self.api_url = endpoint('huggingface.api')
 
+    @memoized()
     def get_trending_models(self, sort: str = "downloads", limit: int = 30) -> List[Dict]:
         """Get trending models from Hugging Face
         sort: downloads, likes, modified, created
         """
+        return list(self.iter_trending_models(sort, limit))
+
+    def iter_trending_models(self, sort: str = "downloads", limit: int = 30) -> Iterator[Dict]:
+        """Yield trending models as they are parsed"""
         url = f"{self.api_url}/models"
         params = {
             'sort': sort,
@@ -193,12 +273,12 @@ class HuggingFaceScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             models = response.json()
 
-            result = []
             for model in models:
-                result.append({
+                yield {
                     'id': model.get('id'),
                     'name': model.get('id', '').split('/')[-1] if '/' in model.get('id', '') else model.get('id'),
                     'author': model.get('id', '').split('/')[0] if '/' in model.get('id', '') else '',
@@ -211,50 +291,97 @@ class HuggingFaceScraper(WebScraper):
                     'created_at': model.get('created_at', ''),
                     'modified_at': model.get('lastModified', ''),
                     'private': model.get('private', False),
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return result
+                    'scraped_at': ctx.scraped_at
+                }
 
         except Exception as e:
-            print(f"Error fetching Hugging Face models: {e}")
-            return []
+            self.log.error("Error fetching Hugging Face models: %s", e)
 
+    @memoized()
     def search_models(self, query: str, limit: int = 30) -> List[Dict]:
         """Search for models on Hugging Face"""
+        return list(self.iter_search_models(query, limit))
+
+    def iter_search_models(self, query: str, limit: int = 30, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield models as they are parsed, stopping after max_items"""
+        url, params = self._search_models_request(query, limit)
+
+        try:
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            yield from islice(self._parse_search_models(response.json(), FetchContext.from_response(response)), max_items)
+
+        except Exception as e:
+            self.log.error("Error searching Hugging Face models: %s", e)
+
+    def harvest_models(self, query: str, max_items: int = 1000, page_size: int = 100) -> Iterator[Dict]:
+        """Yield up to max_items models, following the API's Link: rel="next" cursor
+
+        Each page's cursor is only known once the previous page has arrived, so
+        pages are fetched one after another rather than prefetched.
+        """
+        url, params = self._search_models_request(query, min(page_size, max_items))
+        count = 0
+
+        while url and count < max_items:
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+                response.raise_for_status()
+                items = list(self._parse_search_models(response.json(), FetchContext.from_response(response)))
+            except Exception as e:
+                self.log.error("Error harvesting Hugging Face models: %s", e)
+                return
+
+            for item in islice(items, max_items - count):
+                count += 1
+                yield item
+
+            # The next URL already carries the query and cursor
+            url = response.links.get('next', {}).get('url')
+            params = None
+
+    def _search_models_request(self, query: str, limit: int = 30) -> Tuple[str, Dict]:
         url = f"{self.api_url}/models"
         params = {
             'search': query,
             'limit': limit
         }
 
+        return url, params
+
+    def _parse_search_models(self, models: List[Dict], ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        for model in models:
+            yield {
+                'id': model.get('id'),
+                'name': model.get('id', '').split('/')[-1] if '/' in model.get('id', '') else model.get('id'),
+                'author': model.get('id', '').split('/')[0] if '/' in model.get('id', '') else '',
+                'url': f"{self.base_url}/{model.get('id')}",
+                'downloads': model.get('downloads', 0),
+                'likes': model.get('likes', 0),
+                'task': model.get('pipeline_tag', ''),
+                'tags': model.get('tags', []),
+                'scraped_at': scraped_at
+            }
+
+    @memoized()
+    def get_trending_datasets(self, sort: str = "downloads", limit: int = 30) -> List[Dict]:
+        """Get trending datasets from Hugging Face"""
+        return list(self.iter_trending_datasets(sort, limit))
+
+    def iter_trending_datasets(self, sort: str = "downloads", limit: int = 30, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield datasets as they are parsed, stopping after max_items"""
+        url, params = self._trending_datasets_request(sort, limit)
+
         try:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            models = response.json()
-
-            result = []
-            for model in models:
-                result.append({
-                    'id': model.get('id'),
-                    'name': model.get('id', '').split('/')[-1] if '/' in model.get('id', '') else model.get('id'),
-                    'author': model.get('id', '').split('/')[0] if '/' in model.get('id', '') else '',
-                    'url': f"{self.base_url}/{model.get('id')}",
-                    'downloads': model.get('downloads', 0),
-                    'likes': model.get('likes', 0),
-                    'task': model.get('pipeline_tag', ''),
-                    'tags': model.get('tags', []),
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return result
+            yield from islice(self._parse_datasets(response.json(), FetchContext.from_response(response)), max_items)
 
         except Exception as e:
-            print(f"Error searching Hugging Face models: {e}")
-            return []
+            self.log.error("Error fetching Hugging Face datasets: %s", e)
 
-    def get_trending_datasets(self, sort: str = "downloads", limit: int = 30) -> List[Dict]:
-        """Get trending datasets from Hugging Face"""
+    def _trending_datasets_request(self, sort: str = "downloads", limit: int = 30) -> Tuple[str, Dict]:
         url = f"{self.api_url}/datasets"
         params = {
             'sort': sort,
@@ -262,34 +389,27 @@ class HuggingFaceScraper(WebScraper):
             'limit': limit
         }
 
-        try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            datasets = response.json()
-
-            result = []
-            for dataset in datasets:
-                result.append({
-                    'id': dataset.get('id'),
-                    'name': dataset.get('id', '').split('/')[-1] if '/' in dataset.get('id', '') else dataset.get('id'),
-                    'author': dataset.get('id', '').split('/')[0] if '/' in dataset.get('id', '') else '',
-                    'url': f"{self.base_url}/datasets/{dataset.get('id')}",
-                    'downloads': dataset.get('downloads', 0),
-                    'likes': dataset.get('likes', 0),
-                    'task_categories': dataset.get('task_categories', []),
-                    'tags': dataset.get('tags', []),
-                    'size_categories': dataset.get('size_categories', []),
-                    'created_at': dataset.get('created_at', ''),
-                    'modified_at': dataset.get('lastModified', ''),
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return result
-
-        except Exception as e:
-            print(f"Error fetching Hugging Face datasets: {e}")
-            return []
+        return url, params
+
+    def _parse_datasets(self, datasets: List[Dict], ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        for dataset in datasets:
+            yield {
+                'id': dataset.get('id'),
+                'name': dataset.get('id', '').split('/')[-1] if '/' in dataset.get('id', '') else dataset.get('id'),
+                'author': dataset.get('id', '').split('/')[0] if '/' in dataset.get('id', '') else '',
+                'url': f"{self.base_url}/datasets/{dataset.get('id')}",
+                'downloads': dataset.get('downloads', 0),
+                'likes': dataset.get('likes', 0),
+                'task_categories': dataset.get('task_categories', []),
+                'tags': dataset.get('tags', []),
+                'size_categories': dataset.get('size_categories', []),
+                'created_at': dataset.get('created_at', ''),
+                'modified_at': dataset.get('lastModified', ''),
+                'scraped_at': scraped_at
+            }
 
+    @memoized()
     def get_trending_spaces(self, sort: str = "likes", limit: int = 30) -> List[Dict]:
         """Get trending spaces (apps) from Hugging Face"""
         url = f"{self.api_url}/spaces"
@@ -301,6 +421,7 @@ class HuggingFaceScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             spaces = response.json()
 
@@ -316,23 +437,25 @@ class HuggingFaceScraper(WebScraper):
                     'tags': space.get('tags', []),
                     'created_at': space.get('created_at', ''),
                     'modified_at': space.get('lastModified', ''),
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': ctx.scraped_at
                 })
 
             return result
 
         except Exception as e:
-            print(f"Error fetching Hugging Face spaces: {e}")
+            self.log.error("Error fetching Hugging Face spaces: %s", e)
             return []
 
 
 class HashnodeScraper(WebScraper):
     """Scraper for Hashnode blog platform"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=0.5)
-        self.base_url = "https://hashnode.com"
-        self.api_url = "https://gql.hashnode.com"
+        self.base_url = endpoint('hashnode.web')
+        self.api_url = endpoint('hashnode.api')
 
     def get_trending_posts(self, period: str = "7", limit: int = 20) -> List[Dict]:
         """Get trending posts from Hashnode
@@ -376,6 +499,7 @@ class HashnodeScraper(WebScraper):
                 json={'query': query, 'variables': variables},
                 timeout=10
             )
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             data = response.json()
 
@@ -394,13 +518,13 @@ class HashnodeScraper(WebScraper):
                     'responses': node.get('responseCount', 0),
                     'views': node.get('views', 0),
                     'published_at': node.get('publishedAt'),
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': ctx.scraped_at
                 })
 
             return posts
 
         except Exception as e:
-            print(f"Error fetching Hashnode trending posts: {e}")
+            self.log.error("Error fetching Hashnode trending posts: %s", e)
             return []
 
     def search_posts(self, query: str, limit: int = 20) -> List[Dict]:
@@ -445,6 +569,7 @@ class HashnodeScraper(WebScraper):
                 json={'query': graphql_query, 'variables': variables},
                 timeout=10
             )
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
                 # Fallback to web scraping
@@ -466,13 +591,13 @@ class HashnodeScraper(WebScraper):
                     'reactions': node.get('reactionCount', 0),
                     'responses': node.get('responseCount', 0),
                     'published_at': node.get('publishedAt'),
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': ctx.scraped_at
                 })
 
             return posts
 
         except Exception as e:
-            print(f"Error searching Hashnode: {e}")
+            self.log.error("Error searching Hashnode: %s", e)
             return self._search_posts_web(query, limit)
 
     def _search_posts_web(self, query: str, limit: int) -> List[Dict]:
@@ -481,6 +606,7 @@ class HashnodeScraper(WebScraper):
             # Use explore page as fallback
             url = f"{self.base_url}/explore"
             html = self.fetch(url)
+            ctx = FetchContext()
             if not html:
                 return []
 
@@ -495,23 +621,26 @@ class HashnodeScraper(WebScraper):
                     posts.append({
                         'title': title_elem.text.strip(),
                         'url': card.select_one('a')['href'] if card.select_one('a') else '',
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
             return posts
 
         except Exception as e:
-            print(f"Error in web fallback: {e}")
+            self.log.error("Error in web fallback: %s", e)
             return []
 
 
 class TechCrunchScraper(WebScraper):
     """Scraper for TechCrunch tech news"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://techcrunch.com"
+        self.base_url = endpoint('techcrunch.web')
 
+    @memoized()
     def get_latest_articles(self, category: str = None, limit: int = 20) -> List[Dict]:
         """Get latest articles from TechCrunch
         category: startups, venture, security, crypto, apps, etc.
@@ -523,6 +652,7 @@ class TechCrunchScraper(WebScraper):
 
         try:
             html = self.fetch(url)
+            ctx = FetchContext()
             if not html:
                 return []
 
@@ -548,7 +678,7 @@ class TechCrunchScraper(WebScraper):
                             'author': author_elem.text.strip() if author_elem else '',
                             'published_at': time_elem.get('datetime', '') if time_elem else '',
                             'category': category or 'general',
-                            'scraped_at': datetime.now().isoformat()
+                            'scraped_at': ctx.scraped_at
                         })
                 except:
                     continue
@@ -556,15 +686,17 @@ class TechCrunchScraper(WebScraper):
             return articles
 
         except Exception as e:
-            print(f"Error fetching TechCrunch articles: {e}")
+            self.log.error("Error fetching TechCrunch articles: %s", e)
             return []
 
+    @memoized()
     def search_articles(self, query: str, limit: int = 20) -> List[Dict]:
         """Search for articles on TechCrunch"""
         url = f"{self.base_url}/search/{quote(query)}"
 
         try:
             html = self.fetch(url)
+            ctx = FetchContext()
             if not html:
                 return []
 
@@ -587,7 +719,7 @@ class TechCrunchScraper(WebScraper):
                             'url': link_elem.get('href', '') if link_elem else '',
                             'excerpt': excerpt_elem.text.strip()[:500] if excerpt_elem else '',
                             'published_at': time_elem.get('datetime', '') if time_elem else '',
-                            'scraped_at': datetime.now().isoformat()
+                            'scraped_at': ctx.scraped_at
                         })
                 except:
                     continue
@@ -595,13 +727,15 @@ class TechCrunchScraper(WebScraper):
             return articles
 
         except Exception as e:
-            print(f"Error searching TechCrunch: {e}")
+            self.log.error("Error searching TechCrunch: %s", e)
             return []
 
+    @memoized()
     def get_article_content(self, article_url: str) -> Dict:
         """Get full article content"""
         try:
             html = self.fetch(article_url)
+            ctx = FetchContext()
             if not html:
                 return {}
 
@@ -627,20 +761,22 @@ class TechCrunchScraper(WebScraper):
                 'author': author.text.strip() if author else '',
                 'published_at': time_elem.get('datetime', '') if time_elem else '',
                 'content': '\n\n'.join(paragraphs[:5]),
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': ctx.scraped_at
             }
 
         except Exception as e:
-            print(f"Error fetching article content: {e}")
+            self.log.error("Error fetching article content: %s", e)
             return {}
 
 
 class AngelListScraper(WebScraper):
     """Scraper for AngelList/Wellfound startup data"""
 
+    cache_ttl = 3600
+
     def __init__(self):
         super().__init__(delay=2.0)  # Be respectful
-        self.base_url = "https://wellfound.com"
+        self.base_url = endpoint('wellfound.web')
         # Add common browser headers to avoid blocks
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -656,7 +792,7 @@ class AngelListScraper(WebScraper):
         """Get trending startups from AngelList"""
         # Note: AngelList has moved to Wellfound.com
         # Using web scraping approach for public data
-        url = "https://wellfound.com/startups"
+        url = f"{self.base_url}/startups"
 
         try:
             params = {}
@@ -666,9 +802,10 @@ class AngelListScraper(WebScraper):
                 params['market'] = market
 
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
             startups = []
 
             # Find startup cards
@@ -692,7 +829,7 @@ class AngelListScraper(WebScraper):
                         'team_size': team_size_elem.text.strip() if team_size_elem else '',
                         'location': location or '',
                         'market': market or '',
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     }
 
                     if startup['name']:  # Only add if we got a name
@@ -704,19 +841,20 @@ class AngelListScraper(WebScraper):
             return startups
 
         except Exception as e:
-            print(f"Error fetching AngelList/Wellfound startups: {e}")
+            self.log.error("Error fetching AngelList/Wellfound startups: %s", e)
             return []
 
     def search_startups(self, query: str, limit: int = 20) -> List[Dict]:
         """Search for startups on AngelList/Wellfound"""
-        url = f"https://wellfound.com/search"
+        url = f"{self.base_url}/search"
         params = {'q': query, 'type': 'companies'}
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
             startups = []
 
             # Find search results
@@ -732,7 +870,7 @@ class AngelListScraper(WebScraper):
                         'name': name_elem.text.strip() if name_elem else '',
                         'tagline': tagline_elem.text.strip()[:200] if tagline_elem else '',
                         'url': f"https://wellfound.com{link_elem.get('href', '')}" if link_elem else '',
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
                 except:
@@ -741,12 +879,12 @@ class AngelListScraper(WebScraper):
             return startups
 
         except Exception as e:
-            print(f"Error searching AngelList/Wellfound: {e}")
+            self.log.error("Error searching AngelList/Wellfound: %s", e)
             return []
 
     def get_job_listings(self, role: str = None, location: str = None, limit: int = 20) -> List[Dict]:
         """Get job listings from AngelList/Wellfound"""
-        url = "https://wellfound.com/jobs"
+        url = f"{self.base_url}/jobs"
         params = {}
 
         if role:
@@ -756,9 +894,10 @@ class AngelListScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
             jobs = []
 
             # Find job cards
@@ -778,7 +917,7 @@ class AngelListScraper(WebScraper):
                         'location': location_elem.text.strip() if location_elem else '',
                         'salary': salary_elem.text.strip() if salary_elem else '',
                         'url': f"https://wellfound.com{link_elem.get('href', '')}" if link_elem else '',
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
 
                 except:
@@ -787,7 +926,7 @@ class AngelListScraper(WebScraper):
             return jobs
 
         except Exception as e:
-            print(f"Error fetching job listings: {e}")
+            self.log.error("Error fetching job listings: %s", e)
             return []
 
 
@@ -860,10 +999,11 @@ def demo_additional_scrapers_v2():
 
     filename = f"scrapers_v2_sample_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(filename, 'w') as f:
-        json.dump(sample_data, f, indent=2, default=str)
+        json.dump(format_timestamps(sample_data), f, indent=2, default=str)
 
     print(f"\n\n✅ Sample data saved to: {filename}")
 
 
 if __name__ == "__main__":
+    configure_logging()
     demo_additional_scrapers_v2()
\ No newline at end of file
@@ -2,21 +2,29 @@
 
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
 import json
-from typing import List, Dict, Optional
-from scraper import WebScraper
+import math
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Iterator, Optional, Tuple
+from scraper import FetchContext, WebScraper
+from memo import memoized
+from endpoints import endpoint
+from logs import configure_logging
 import re
+from itertools import islice
 
 
 class KaggleScraper(WebScraper):
     """Scraper for Kaggle datasets, competitions, and notebooks"""
 
+    cache_ttl = 3600
+
     def __init__(self):
         super().__init__(delay=2.0)
-        self.base_url = "https://www.kaggle.com"
-        self.api_url = "https://www.kaggle.com/api/v1"
+        self.base_url = endpoint('kaggle.web')
+        self.api_url = endpoint('kaggle.api')
 
+    @memoized()
     def get_trending_datasets(self, limit: int = 20) -> List[Dict]:
         """Get trending datasets"""
         url = f"{self.base_url}/datasets"
@@ -28,12 +36,13 @@ class KaggleScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"Kaggle returned status {response.status_code}")
+                self.log.warning("Kaggle returned status %s", response.status_code)
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             # Look for dataset cards in the page
             datasets = []
@@ -84,7 +93,7 @@ class KaggleScraper(WebScraper):
                         'author': author,
                         'url': dataset_url,
                         'downloads': downloads,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except Exception as e:
                     continue
@@ -92,21 +101,23 @@ class KaggleScraper(WebScraper):
             return datasets
 
         except Exception as e:
-            print(f"Error fetching Kaggle datasets: {e}")
+            self.log.error("Error fetching Kaggle datasets: %s", e)
             return []
 
+    @memoized()
     def get_competitions(self, limit: int = 20) -> List[Dict]:
         """Get active competitions"""
         url = f"{self.base_url}/competitions"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"Kaggle returned status {response.status_code}")
+                self.log.warning("Kaggle returned status %s", response.status_code)
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             competitions = []
             comp_cards = soup.select('div.competition-tile, a[href*="/competitions/"]')
@@ -139,7 +150,7 @@ class KaggleScraper(WebScraper):
                         'prize': prize,
                         'teams': teams,
                         'url': comp_url,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except Exception as e:
                     continue
@@ -147,29 +158,33 @@ class KaggleScraper(WebScraper):
             return competitions
 
         except Exception as e:
-            print(f"Error fetching Kaggle competitions: {e}")
+            self.log.error("Error fetching Kaggle competitions: %s", e)
             return []
 
 
 class IndieHackersScraper(WebScraper):
     """Scraper for Indie Hackers posts and discussions"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=2.0)
-        self.base_url = "https://www.indiehackers.com"
+        self.base_url = endpoint('indiehackers.web')
 
+    @memoized()
     def get_trending_posts(self, limit: int = 20) -> List[Dict]:
         """Get trending posts from Indie Hackers"""
         url = f"{self.base_url}/posts"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"Indie Hackers returned status {response.status_code}")
+                self.log.warning("Indie Hackers returned status %s", response.status_code)
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             posts = []
 
@@ -210,7 +225,7 @@ class IndieHackersScraper(WebScraper):
                         'upvotes': upvotes,
                         'comments': comments,
                         'url': post_url,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except Exception as e:
                     continue
@@ -218,20 +233,22 @@ class IndieHackersScraper(WebScraper):
             return posts
 
         except Exception as e:
-            print(f"Error fetching Indie Hackers posts: {e}")
+            self.log.error("Error fetching Indie Hackers posts: %s", e)
             return []
 
+    @memoized()
     def get_groups_discussions(self, group: str = "startup", limit: int = 20) -> List[Dict]:
         """Get discussions from specific groups"""
         url = f"{self.base_url}/group/{group}"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
             discussions = []
 
             # Parse group discussions
@@ -245,7 +262,7 @@ class IndieHackersScraper(WebScraper):
                     discussions.append({
                         'title': title,
                         'group': group,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except:
                     continue
@@ -253,29 +270,33 @@ class IndieHackersScraper(WebScraper):
             return discussions
 
         except Exception as e:
-            print(f"Error fetching group discussions: {e}")
+            self.log.error("Error fetching group discussions: %s", e)
             return []
 
 
 class TheVergeScraper(WebScraper):
     """Scraper for The Verge tech news"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=2.0)
-        self.base_url = "https://www.theverge.com"
+        self.base_url = endpoint('theverge.web')
 
+    @memoized()
     def get_latest_articles(self, category: str = "tech", limit: int = 20) -> List[Dict]:
         """Get latest articles from The Verge"""
         url = f"{self.base_url}/{category}"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"The Verge returned status {response.status_code}")
+                self.log.warning("The Verge returned status %s", response.status_code)
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             articles = []
 
@@ -310,7 +331,7 @@ class TheVergeScraper(WebScraper):
                         'excerpt': excerpt,
                         'url': article_url,
                         'published_at': published_at,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except Exception as e:
                     continue
@@ -318,29 +339,33 @@ class TheVergeScraper(WebScraper):
             return articles
 
         except Exception as e:
-            print(f"Error fetching The Verge articles: {e}")
+            self.log.error("Error fetching The Verge articles: %s", e)
             return []
 
 
 class ArsTechnicaScraper(WebScraper):
     """Scraper for Ars Technica technical articles"""
 
+    cache_ttl = 900
+
     def __init__(self):
         super().__init__(delay=2.0)
-        self.base_url = "https://arstechnica.com"
+        self.base_url = endpoint('arstechnica.web')
 
+    @memoized()
     def get_latest_articles(self, category: str = "information-technology", limit: int = 20) -> List[Dict]:
         """Get latest technical articles"""
         url = f"{self.base_url}/{category}/"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"Ars Technica returned status {response.status_code}")
+                self.log.warning("Ars Technica returned status %s", response.status_code)
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             articles = []
 
@@ -383,7 +408,7 @@ class ArsTechnicaScraper(WebScraper):
                         'url': article_url,
                         'comments': comments,
                         'published_at': published_at,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except Exception as e:
                     continue
@@ -391,70 +416,104 @@ class ArsTechnicaScraper(WebScraper):
             return articles
 
         except Exception as e:
-            print(f"Error fetching Ars Technica articles: {e}")
+            self.log.error("Error fetching Ars Technica articles: %s", e)
             return []
 
 
 class NPMScraper(WebScraper):
     """Scraper for npm package trends"""
 
+    cache_ttl = 3600
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://www.npmjs.com"
-        self.api_url = "https://registry.npmjs.org"
-        self.search_api = "https://api.npms.io/v2"
+        self.base_url = endpoint('npm.web')
+        self.api_url = endpoint('npm.registry')
+        self.search_api = endpoint('npm.search')
+        self.downloads_api = endpoint('npm.downloads')
 
+    @memoized()
     def search_packages(self, query: str, limit: int = 20) -> List[Dict]:
         """Search for packages on npm using npms.io API"""
-        url = f"{self.search_api}/search"
-        params = {
-            'q': query,
-            'size': limit
-        }
+        return list(self.iter_search_packages(query, limit))
+
+    def iter_search_packages(self, query: str, limit: int = 20, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield packages as they are parsed, stopping after max_items"""
+        url, params = self._search_request(query, limit)
 
         try:
             response = self.session.get(url, params=params, timeout=10)
 
             if response.status_code != 200:
-                print(f"npm search returned status {response.status_code}")
-                return []
-
-            data = response.json()
-            packages = []
+                self.log.warning("npm search returned status %s", response.status_code)
+                return
 
-            for result in data.get('results', []):
-                pkg = result.get('package', {})
-                score = result.get('score', {})
-
-                packages.append({
-                    'name': pkg.get('name'),
-                    'version': pkg.get('version'),
-                    'description': pkg.get('description'),
-                    'keywords': pkg.get('keywords', []),
-                    'author': pkg.get('author', {}).get('name') if isinstance(pkg.get('author'), dict) else pkg.get('author'),
-                    'publisher': pkg.get('publisher', {}).get('username') if pkg.get('publisher') else '',
-                    'date': pkg.get('date'),
-                    'links': pkg.get('links', {}),
-                    'score_final': score.get('final'),
-                    'score_quality': score.get('detail', {}).get('quality'),
-                    'score_popularity': score.get('detail', {}).get('popularity'),
-                    'score_maintenance': score.get('detail', {}).get('maintenance'),
-                    'url': f"{self.base_url}/package/{pkg.get('name')}",
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return packages
+            yield from islice(self._parse_search_results(response.json(), FetchContext.from_response(response)), max_items)
 
         except Exception as e:
-            print(f"Error searching npm: {e}")
-            return []
+            self.log.error("Error searching npm: %s", e)
+
+    def harvest_packages(self, query: str, max_items: int = 1000, page_size: int = 250, prefetch: int = 4) -> Iterator[Dict]:
+        """Yield up to max_items packages, fetching result pages concurrently by offset"""
+        url, params = self._search_request(query, min(page_size, 250))
+        page_size = params['size']
+
+        def fetch_page(n):
+            try:
+                response = self.session.get(url, params=dict(params, **{'from': n * page_size}), timeout=10)
+                if response.status_code != 200:
+                    self.log.warning("npm search returned status %s", response.status_code)
+                    return [], False
+                data = response.json()
+            except Exception as e:
+                self.log.error("Error harvesting npm (from=%s): %s", n * page_size, e)
+                return [], False
+
+            items = list(self._parse_search_results(data, FetchContext.from_response(response)))
+            return items, bool(items) and (n + 1) * page_size < data.get('total', 0)
+
+        yield from self._harvest_pages(fetch_page, math.ceil(max_items / page_size), max_items, prefetch)
+
+    def _search_request(self, query: str, limit: int = 20) -> Tuple[str, Dict]:
+        url = f"{self.search_api}/search"
+        params = {
+            'q': query,
+            'size': limit
+        }
 
+        return url, params
+
+    def _parse_search_results(self, data: Dict, ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        for result in data.get('results', []):
+            pkg = result.get('package', {})
+            score = result.get('score', {})
+
+            yield {
+                'name': pkg.get('name'),
+                'version': pkg.get('version'),
+                'description': pkg.get('description'),
+                'keywords': pkg.get('keywords', []),
+                'author': pkg.get('author', {}).get('name') if isinstance(pkg.get('author'), dict) else pkg.get('author'),
+                'publisher': pkg.get('publisher', {}).get('username') if pkg.get('publisher') else '',
+                'date': pkg.get('date'),
+                'links': pkg.get('links', {}),
+                'score_final': score.get('final'),
+                'score_quality': score.get('detail', {}).get('quality'),
+                'score_popularity': score.get('detail', {}).get('popularity'),
+                'score_maintenance': score.get('detail', {}).get('maintenance'),
+                'url': f"{self.base_url}/package/{pkg.get('name')}",
+                'scraped_at': scraped_at
+            }
+
+    @memoized()
     def get_package_info(self, package_name: str) -> Optional[Dict]:
         """Get detailed info for a specific package"""
         url = f"{self.api_url}/{package_name}"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
                 return None
@@ -476,21 +535,23 @@ class NPMScraper(WebScraper):
                 'devDependencies': latest_info.get('devDependencies', {}),
                 'created': data.get('time', {}).get('created'),
                 'modified': data.get('time', {}).get('modified'),
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': ctx.scraped_at
             }
 
         except Exception as e:
-            print(f"Error fetching package info: {e}")
+            self.log.error("Error fetching package info: %s", e)
             return None
 
+    @memoized()
     def get_downloads_stats(self, package_name: str, period: str = 'last-week') -> Optional[Dict]:
         """Get download statistics for a package
         period: last-day, last-week, last-month, last-year
         """
-        url = f"https://api.npmjs.org/downloads/point/{period}/{package_name}"
+        url = f"{self.downloads_api}/point/{period}/{package_name}"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
                 return None
@@ -503,40 +564,45 @@ class NPMScraper(WebScraper):
                 'period': period,
                 'start': data.get('start'),
                 'end': data.get('end'),
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': ctx.scraped_at
             }
 
         except Exception as e:
-            print(f"Error fetching download stats: {e}")
+            self.log.error("Error fetching download stats: %s", e)
             return None
 
 
 class PyPIScraper(WebScraper):
     """Scraper for PyPI package trends"""
 
+    cache_ttl = 600
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://pypi.org"
-        self.api_url = "https://pypi.org/pypi"
+        self.base_url = endpoint('pypi.web')
+        self.api_url = endpoint('pypi.api')
 
+    @memoized()
     def get_trending_packages(self, limit: int = 20) -> List[Dict]:
         """Get trending/recently updated packages"""
+        return list(islice(self.iter_newest_packages(), limit))
+
+    def iter_newest_packages(self) -> Iterator[Dict]:
+        """Yield packages from the newest-packages RSS feed, newest first"""
         # PyPI RSS feed for newest packages
         url = f"{self.base_url}/rss/packages.xml"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"PyPI RSS returned status {response.status_code}")
-                return []
+                self.log.warning("PyPI RSS returned status %s", response.status_code)
+                return
 
             soup = BeautifulSoup(response.text, 'xml')
 
-            packages = []
-            items = soup.find_all('item')
-
-            for item in items[:limit]:
+            for item in soup.find_all('item'):
                 try:
                     title = item.find('title').text if item.find('title') else ''
                     description = item.find('description').text if item.find('description') else ''
@@ -552,23 +618,39 @@ class PyPIScraper(WebScraper):
                         package_name = title
                         version = ''
 
-                    packages.append({
+                    yield {
                         'name': package_name,
                         'version': version,
                         'description': description,
                         'url': link,
                         'published_at': pub_date,
-                        'scraped_at': datetime.now().isoformat()
-                    })
+                        'scraped_at': ctx.scraped_at
+                    }
                 except Exception as e:
                     continue
 
-            return packages
-
         except Exception as e:
-            print(f"Error fetching PyPI packages: {e}")
-            return []
+            self.log.error("Error fetching PyPI packages: %s", e)
 
+    def iter_packages_since(self, since: int, query: Optional[str] = None) -> Iterator[Dict]:
+        """Yield newest packages published after `since` (epoch seconds)
+
+        The feed is global and only lists the latest few dozen uploads, so poll
+        it more often than it turns over. `query`, if given, keeps packages
+        whose name or description mentions it.
+        """
+        for package in self.iter_newest_packages():
+            try:
+                published = parsedate_to_datetime(package['published_at']).timestamp()
+            except (TypeError, ValueError):
+                continue
+            if published <= since:
+                continue
+            if query and query.lower() not in f"{package['name']} {package['description']}".lower():
+                continue
+            yield package
+
+    @memoized()
     def search_packages(self, query: str, limit: int = 20) -> List[Dict]:
         """Search for packages on PyPI"""
         # Use PyPI's search endpoint
@@ -577,12 +659,13 @@ class PyPIScraper(WebScraper):
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
-                print(f"PyPI search returned status {response.status_code}")
+                self.log.warning("PyPI search returned status %s", response.status_code)
                 return []
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.parse_html(response.text)
 
             packages = []
             results = soup.select('a[class*="package-snippet"]')
@@ -606,7 +689,7 @@ class PyPIScraper(WebScraper):
                         'version': version,
                         'description': description,
                         'url': package_url,
-                        'scraped_at': datetime.now().isoformat()
+                        'scraped_at': ctx.scraped_at
                     })
                 except Exception as e:
                     continue
@@ -614,15 +697,17 @@ class PyPIScraper(WebScraper):
             return packages
 
         except Exception as e:
-            print(f"Error searching PyPI: {e}")
+            self.log.error("Error searching PyPI: %s", e)
             return []
 
+    @memoized()
     def get_package_stats(self, package_name: str) -> Optional[Dict]:
         """Get detailed stats for a specific package"""
         url = f"{self.api_url}/{package_name}/json"
 
         try:
             response = self.session.get(url, timeout=10)
+            ctx = FetchContext.from_response(response)
 
             if response.status_code != 200:
                 return None
@@ -640,11 +725,11 @@ class PyPIScraper(WebScraper):
                 'keywords': info.get('keywords'),
                 'requires_python': info.get('requires_python'),
                 'downloads': data.get('downloads', {}),
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': ctx.scraped_at
             }
 
         except Exception as e:
-            print(f"Error fetching package stats: {e}")
+            self.log.error("Error fetching package stats: %s", e)
             return None
 
 
@@ -742,4 +827,5 @@ def demo_scrapers_v3():
 
 
 if __name__ == "__main__":
+    configure_logging()
     demo_scrapers_v3()
\ No newline at end of file
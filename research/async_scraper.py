@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from scraper import WebScraper, HackerNewsScraper, RedditScraper, GitHubTrendingScraper
+from additional_scrapers import DevToScraper, ArXivScraper
+from additional_scrapers_v2 import StackOverflowScraper, HuggingFaceScraper
+from additional_scrapers_v3 import NPMScraper
+from rate_limit import get_rate_limiter
+from http_cache import get_default_cache
+from transport import get_transport
+from retry import body_backoff, get_retry_policy
+from metrics import get_metrics
+from logs import log_context
+
+try:
+    import aiohttp
+except ImportError:  # Only the async stack needs aiohttp
+    aiohttp = None
+
+
+class AsyncWebScraper:
+    """asyncio counterpart of WebScraper built on aiohttp
+
+    Each async scraper wraps its synchronous twin (self.sync) and reuses its
+    request builders and parsers, so both stacks return identical dicts.
+    """
+
+    sync_class = WebScraper
+
+    def __init__(self, session: Optional['aiohttp.ClientSession'] = None, delay: Optional[float] = None):
+        if aiohttp is None:
+            raise ImportError("The async scrapers require aiohttp: pip install aiohttp")
+
+        self.sync = self.sync_class()
+        self.delay = self.sync.delay if delay is None else delay
+        self.timeout = aiohttp.ClientTimeout(total=10)
+
+        # Same headers as the sync session; aiohttp manages encoding and keep-alive itself
+        self.headers = {k: v for k, v in self.sync.session.headers.items()
+                        if k not in ('Accept-Encoding', 'Connection')}
+
+        self._session = session
+        self._owns_session = False
+
+    @property
+    def log(self):
+        return self.sync.log
+
+    def use_session(self, session: 'aiohttp.ClientSession'):
+        """Share a ClientSession (and its connection pool) with other scrapers"""
+        self._session = session
+        self._owns_session = False
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=get_transport().aiohttp_connector())
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get(self, url: str, params: Optional[Dict] = None) -> Tuple[bytes, Optional[str]]:
+        """GET url and return (body, charset), going through the shared response cache if enabled"""
+        cache = get_default_cache()
+        ttl = self.sync.cache_ttl
+        if cache is None or ttl <= 0:
+            status, headers, body, charset, final_url = await self._send(url, params)
+            return body, charset
+
+        key = cache.make_key('GET', url, params)
+        entry = cache.get(key)
+        if entry is not None and entry.fresh:
+            return entry.body, _charset(entry.headers)
+
+        status, headers, body, charset, final_url = await self._send(
+            url, params, entry.revalidation_headers() if entry is not None else None
+        )
+
+        if status == 304 and entry is not None:
+            cache.refresh(key, ttl)
+            return entry.body, _charset(entry.headers)
+
+        if status == 200:
+            cache.put(key, 'GET', final_url, status, headers, body, ttl)
+
+        return body, charset
+
+    async def _send(self, url: str, params: Optional[Dict] = None,
+                    extra_headers: Optional[Dict] = None) -> Tuple[int, Dict[str, str], bytes, Optional[str], str]:
+        """Send one rate-limited GET and return (status, headers, body, charset, final url)
+
+        Retries follow the same policy as the sync adapter (see retry).
+        """
+        limiter = get_rate_limiter()
+        policy = get_retry_policy()
+        rate = 1.0 / self.delay if self.delay > 0 else None
+        session = self._get_session()
+        headers = dict(self.headers, **extra_headers) if extra_headers else self.headers
+        routed_url = get_transport().route_url(url)
+        attempt = 0
+
+        while True:
+            await limiter.acquire_async(url, rate=rate)
+            try:
+                start = time.perf_counter()
+                async with session.get(routed_url, params=params, headers=headers, timeout=self.timeout) as response:
+                    ttfb = time.perf_counter() - start
+                    body = await response.read()
+                    self._record_timings(url, ttfb, time.perf_counter() - start - ttfb, len(body))
+                    wait = policy.delay_after_response('GET', response.status, response.headers, attempt)
+                    if wait is None:
+                        if response.status != 304:
+                            response.raise_for_status()
+                        backoff = body_backoff(url, body)
+                        if backoff:
+                            limiter.pause(url, backoff)
+                        final_url = str(response.url) if routed_url == url else url
+                        return response.status, dict(response.headers), body, response.charset, final_url
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                wait = policy.delay_after_error('GET', attempt)
+                if wait is None:
+                    raise
+
+            limiter.pause(url, wait)
+            attempt += 1
+
+    def _record_timings(self, url: str, ttfb: float, transfer: float, size: int):
+        labels = {'source': type(self).__name__, 'method': '', 'host': urlparse(url).hostname or ''}
+        metrics = get_metrics()
+        metrics.observe('http_ttfb_seconds', ttfb, **labels)
+        metrics.observe('http_transfer_seconds', transfer, **labels)
+        metrics.observe('http_response_bytes', size, **labels)
+
+    async def fetch(self, url: str, params: Optional[Dict] = None) -> Optional[str]:
+        try:
+            body, charset = await self._get(url, params)
+            return body.decode(charset or 'utf-8', errors='replace')
+        except Exception as e:
+            self.log.error("Error fetching %s: %s", url, e)
+            return None
+
+    async def fetch_json(self, url: str, params: Optional[Dict] = None) -> Optional[Any]:
+        try:
+            body, charset = await self._get(url, params)
+            return json.loads(body)
+        except Exception as e:
+            self.log.error("Error fetching %s: %s", url, e)
+            return None
+
+    async def fetch_xml(self, url: str, params: Optional[Dict] = None) -> Optional[ET.Element]:
+        try:
+            body, charset = await self._get(url, params)
+            return ET.fromstring(body)
+        except Exception as e:
+            self.log.error("Error fetching %s: %s", url, e)
+            return None
+
+
+def _charset(headers: Dict[str, str]) -> Optional[str]:
+    for name, value in headers.items():
+        if name.lower() == 'content-type' and 'charset=' in value:
+            return value.split('charset=')[-1].split(';')[0].strip()
+    return None
+
+
+class AsyncHackerNewsScraper(AsyncWebScraper):
+    sync_class = HackerNewsScraper
+
+    async def search_stories(self, query: str, sort: str = 'popularity', dateRange: str = 'week') -> List[Dict]:
+        url, params = self.sync._search_request(query, sort, dateRange)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_hits(data))
+        except Exception as e:
+            self.log.error("Error searching stories: %s", e)
+            return []
+
+
+class AsyncRedditScraper(AsyncWebScraper):
+    sync_class = RedditScraper
+
+    async def search_posts(self, query: str, subreddit: Optional[str] = None, sort: str = 'relevance', time: str = 'week') -> List[Dict]:
+        url, params = self.sync._search_request(query, subreddit, sort, time)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_listing(data))
+        except Exception as e:
+            self.log.error("Error searching Reddit: %s", e)
+            return []
+
+
+class AsyncGitHubScraper(AsyncWebScraper):
+    sync_class = GitHubTrendingScraper
+
+    async def search_repos(self, query: str, sort: str = 'stars', order: str = 'desc', limit: int = 30) -> List[Dict]:
+        url, params = self.sync._search_request(query, sort, order, limit)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_results(data))
+        except Exception as e:
+            self.log.error("Error searching GitHub: %s", e)
+            return []
+
+
+class AsyncDevToScraper(AsyncWebScraper):
+    sync_class = DevToScraper
+
+    async def search_articles(self, query: str, page: int = 1, per_page: int = 30) -> List[Dict]:
+        url, params = self.sync._search_request(query, page, per_page)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_articles(data))
+        except Exception as e:
+            self.log.error("Error searching Dev.to: %s", e)
+            return []
+
+
+class AsyncArXivScraper(AsyncWebScraper):
+    sync_class = ArXivScraper
+
+    async def search_papers(self, query: str, max_results: int = 20, sort_by: str = "relevance", sort_order: str = "descending") -> List[Dict]:
+        params = self.sync._search_params(query, max_results, sort_by, sort_order)
+        root = await self.fetch_xml(self.sync.base_url, params)
+        if root is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_feed(root))
+        except Exception as e:
+            self.log.error("Error searching ArXiv: %s", e)
+            return []
+
+
+class AsyncStackOverflowScraper(AsyncWebScraper):
+    sync_class = StackOverflowScraper
+
+    async def search_questions(self, query: str, tagged: str = None, sort: str = "relevance", limit: int = 30) -> List[Dict]:
+        url, params = self.sync._search_request(query, tagged, sort, limit)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_items(data))
+        except Exception as e:
+            self.log.error("Error searching Stack Overflow: %s", e)
+            return []
+
+
+class AsyncHuggingFaceScraper(AsyncWebScraper):
+    sync_class = HuggingFaceScraper
+
+    async def search_models(self, query: str, limit: int = 30) -> List[Dict]:
+        url, params = self.sync._search_models_request(query, limit)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_models(data))
+        except Exception as e:
+            self.log.error("Error searching Hugging Face models: %s", e)
+            return []
+
+    async def get_trending_datasets(self, sort: str = "downloads", limit: int = 30) -> List[Dict]:
+        url, params = self.sync._trending_datasets_request(sort, limit)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_datasets(data))
+        except Exception as e:
+            self.log.error("Error fetching Hugging Face datasets: %s", e)
+            return []
+
+
+class AsyncNPMScraper(AsyncWebScraper):
+    sync_class = NPMScraper
+
+    async def search_packages(self, query: str, limit: int = 20) -> List[Dict]:
+        url, params = self.sync._search_request(query, limit)
+        data = await self.fetch_json(url, params)
+        if data is None:
+            return []
+
+        try:
+            return list(self.sync._parse_search_results(data))
+        except Exception as e:
+            self.log.error("Error searching npm: %s", e)
+            return []
+
+
+class AsyncResearchAggregator:
+    """Research many topics across the API-backed sources on one event loop
+
+    All scrapers share one ClientSession. Use as an async context manager:
+
+        async with AsyncResearchAggregator() as aggregator:
+            results = await aggregator.multi_topic_research(topics)
+    """
+
+    def __init__(self, max_connections: int = 100, max_connections_per_host: int = 10):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._session = None
+
+        self.hn = AsyncHackerNewsScraper()
+        self.reddit = AsyncRedditScraper()
+        self.github = AsyncGitHubScraper()
+        self.devto = AsyncDevToScraper()
+        self.arxiv = AsyncArXivScraper()
+        self.stackoverflow = AsyncStackOverflowScraper()
+        self.huggingface = AsyncHuggingFaceScraper()
+        self.npm = AsyncNPMScraper()
+
+    def _scrapers(self) -> List[AsyncWebScraper]:
+        return [self.hn, self.reddit, self.github, self.devto, self.arxiv,
+                self.stackoverflow, self.huggingface, self.npm]
+
+    async def open(self):
+        if self._session is None or self._session.closed:
+            connector = get_transport().aiohttp_connector(self.max_connections, self.max_connections_per_host)
+            self._session = aiohttp.ClientSession(connector=connector)
+            for scraper in self._scrapers():
+                scraper.use_session(self._session)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _source_tasks(self, topic: str) -> Dict[str, Any]:
+        """Awaitables for each source of research['sources'], keyed by source"""
+        async def hackernews():
+            return {'stories': (await self.hn.search_stories(topic, dateRange='month'))[:10]}
+
+        async def reddit():
+            return {'posts': (await self.reddit.search_posts(topic, time='month'))[:10]}
+
+        async def huggingface():
+            models, datasets = await asyncio.gather(
+                self.huggingface.search_models(topic, limit=5),
+                self.huggingface.get_trending_datasets(limit=5)
+            )
+            return {'models': models, 'datasets': datasets}
+
+        async def tagged(key, awaitable):
+            # Each task runs in its own copy of the context, so this tags only its own log records
+            with log_context(topic=topic, source=key):
+                return await awaitable
+
+        tasks = {
+            'hackernews': hackernews(),
+            'reddit': reddit(),
+            'github': self.github.search_repos(topic, sort='stars', limit=10),
+            'devto': self.devto.search_articles(topic, per_page=10),
+            'arxiv': self.arxiv.search_papers(topic, max_results=10),
+            'stackoverflow': self.stackoverflow.search_questions(topic, limit=10),
+            'huggingface': huggingface(),
+            'npm': self.npm.search_packages(topic, limit=10),
+        }
+        return {key: tagged(key, task) for key, task in tasks.items()}
+
+    async def research_topic(self, topic: str) -> Dict:
+        """Query every API-backed source for one topic concurrently"""
+        await self.open()
+
+        research = {
+            'topic': topic,
+            'timestamp': datetime.now().isoformat(),
+            'sources': {}
+        }
+
+        tasks = self._source_tasks(topic)
+        results = await asyncio.gather(*tasks.values())
+        research['sources'] = dict(zip(tasks.keys(), results))
+
+        return research
+
+    async def iter_research(self, topic: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (source key, result) pairs for a topic as each source finishes"""
+        await self.open()
+
+        async def keyed(key, awaitable):
+            return key, await awaitable
+
+        for next_done in asyncio.as_completed([keyed(key, task) for key, task in self._source_tasks(topic).items()]):
+            yield await next_done
+
+    async def iter_multi_topic_research(self, topics: List[str]) -> AsyncIterator[Tuple[str, str, Any]]:
+        """Yield (topic, source key, result) triples across all topics as they finish"""
+        await self.open()
+
+        async def keyed(topic, key, awaitable):
+            return topic, key, await awaitable
+
+        pending = [keyed(topic, key, task) for topic in topics for key, task in self._source_tasks(topic).items()]
+        for next_done in asyncio.as_completed(pending):
+            yield await next_done
+
+    async def multi_topic_research(self, topics: List[str], max_concurrent_topics: Optional[int] = None) -> Dict:
+        """Research many topics at once
+
+        max_concurrent_topics bounds how many topics are in flight; by default
+        every topic is started immediately and the per-source rate limits and
+        connection limits pace the actual requests. The topics share one
+        retry budget.
+        """
+        await self.open()
+        get_retry_policy().budget.reset()
+        semaphore = asyncio.Semaphore(max_concurrent_topics) if max_concurrent_topics else None
+
+        async def run(topic):
+            if semaphore is None:
+                return await self.research_topic(topic)
+            async with semaphore:
+                return await self.research_topic(topic)
+
+        results = await asyncio.gather(*(run(topic) for topic in topics))
+        return dict(zip(topics, results))
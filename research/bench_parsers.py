@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import argparse
+import glob
+import os
+import statistics
+import time
+from bs4 import BeautifulSoup
+from parsing import available_parsers
+
+
+def time_parse(html: str, parser: str, repeat: int) -> float:
+    """Median seconds to build a soup for html with the given parser"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        BeautifulSoup(html, parser)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def save_fixture(url: str, name: str, fixtures_dir: str):
+    from scraper import WebScraper
+
+    html = WebScraper(delay=0).fetch(url)
+    if not html:
+        raise SystemExit(f"Could not fetch {url}")
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = os.path.join(fixtures_dir, f"{name}.html")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"Saved {len(html):,} bytes to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on saved pages")
+    parser.add_argument('fixtures', nargs='?', default='fixtures', help="directory of saved *.html pages")
+    parser.add_argument('--repeat', type=int, default=5, help="parses per page and backend (median is reported)")
+    parser.add_argument('--save', nargs=2, metavar=('URL', 'NAME'), help="fetch URL into FIXTURES/NAME.html and exit")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixture(args.save[0], args.save[1], args.fixtures)
+        return
+
+    pages = sorted(glob.glob(os.path.join(args.fixtures, '*.html')))
+    if not pages:
+        print(f"No *.html fixtures in {args.fixtures}/")
+        print("Save some first, e.g.: python bench_parsers.py --save https://news.ycombinator.com hn_front")
+        return
+
+    backends = available_parsers()
+    print(f"Backends: {', '.join(backends)} | median of {args.repeat} parses\n")
+    print(f"{'page':<30} {'KB':>8} " + ' '.join(f"{b + ' ms':>14}" for b in backends))
+    print('-' * (40 + 15 * len(backends)))
+
+    totals = {b: 0.0 for b in backends}
+    for path in pages:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            html = f.read()
+
+        row = []
+        for backend in backends:
+            seconds = time_parse(html, backend, args.repeat)
+            totals[backend] += seconds
+            row.append(f"{seconds * 1000:>14.2f}")
+
+        name = os.path.splitext(os.path.basename(path))[0]
+        print(f"{name[:30]:<30} {len(html) / 1024:>8.1f} " + ' '.join(row))
+
+    print('-' * (40 + 15 * len(backends)))
+    print(f"{'total':<30} {'':>8} " + ' '.join(f"{totals[b] * 1000:>14.2f}" for b in backends))
+
+    baseline = totals.get('html.parser')
+    if baseline:
+        for backend in backends:
+            if backend != 'html.parser' and totals[backend]:
+                print(f"{backend}: {baseline / totals[backend]:.1f}x faster than html.parser")
+
+
+if __name__ == "__main__":
+    main()
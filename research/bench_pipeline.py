@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+from http_cache import disable_cache
+from logs import configure_logging
+from memo import get_memo_cache
+from replay import use_cassette
+
+
+def count_items(result: Any) -> int:
+    """Items in a source result: list length, summed over the lists of a dict result"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return sum(count_items(value) for value in result.values() if isinstance(value, (list, dict)))
+    return 0
+
+
+def new_aggregator():
+    from enhanced_scraper import ResearchAggregator
+
+    # Replayed failures must not open breakers and skip sources between repeats
+    return ResearchAggregator(breaker_threshold=1_000_000)
+
+
+def bench_sources(topics: List[str], repeat: int) -> Dict[str, Dict]:
+    """Median time and items per source, each source run on its own over the recorded responses"""
+    aggregator = new_aggregator()
+    timings, items = {}, {}
+    for _ in range(repeat):
+        # Start cold: no memoized parse results from the previous round
+        get_memo_cache().clear()
+        elapsed, found = {}, {}
+        for topic in topics:
+            for key, label, task, fallback in aggregator._source_tasks(topic, get_comments=True):
+                start = time.perf_counter()
+                result = task()
+                elapsed[key] = elapsed.get(key, 0.0) + time.perf_counter() - start
+                found[key] = found.get(key, 0) + count_items(result)
+        for key, seconds in elapsed.items():
+            timings.setdefault(key, []).append(seconds)
+        items = found
+
+    return {key: {'median_ms': statistics.median(seconds) * 1000, 'items': items[key]}
+            for key, seconds in timings.items()}
+
+
+def bench_pipeline(topics: List[str], repeat: int, concurrent: bool) -> Dict[str, float]:
+    """Median time of research_topic over all topics, and items per second"""
+    timings, items = [], 0
+    for _ in range(repeat):
+        aggregator = new_aggregator()
+        get_memo_cache().clear()
+        start = time.perf_counter()
+        results = [aggregator.research_topic(topic, fetch_content=True, concurrent=concurrent) for topic in topics]
+        timings.append(time.perf_counter() - start)
+        items = sum(count_items(source) for research in results for source in research['sources'].values())
+
+    seconds = statistics.median(timings)
+    return {'median_ms': seconds * 1000, 'items': items, 'items_per_s': items / seconds if seconds else 0.0}
+
+
+def record(cassette_dir: str, topics: List[str]):
+    with use_cassette(cassette_dir, mode='record') as cassette:
+        aggregator = new_aggregator()
+        for topic in topics:
+            aggregator.research_topic(topic, fetch_content=True)
+    with open(os.path.join(cassette_dir, 'topics.json'), 'w', encoding='utf-8') as f:
+        json.dump(topics, f)
+    print(f"Recorded {cassette.recorded} responses for {len(topics)} topics in {cassette_dir}/")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Benchmarks that got more than `tolerance` slower than in baseline"""
+    regressions = []
+    current = dict(results['sources'], pipeline=results['pipeline'])
+    previous = dict(baseline.get('sources', {}), pipeline=baseline.get('pipeline', {}))
+    for name, row in current.items():
+        before = previous.get(name, {}).get('median_ms')
+        if before and row['median_ms'] > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.1f} ms -> {row['median_ms']:.1f} ms "
+                               f"(+{(row['median_ms'] / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers' parse paths and research_topic offline, "
+                                                 "over responses recorded once from the live sites")
+    parser.add_argument('topics', nargs='*', help="topics (default: the ones the cassette was recorded for)")
+    parser.add_argument('--cassette', default='fixtures/cassettes', help="directory of recorded responses")
+    parser.add_argument('--record', action='store_true', help="record the topics from the live sites and exit")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark (median is reported)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="seconds added to each replayed response in the pipeline benchmark")
+    parser.add_argument('--concurrent', action='store_true', help="query sources concurrently in the pipeline benchmark")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="slowdown over the baseline that fails the run")
+    parser.add_argument('--save', help="write this run's results as JSON")
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    # Every request must reach the cassette, and every parse must run
+    disable_cache()
+
+    topics = args.topics
+    if not topics:
+        try:
+            with open(os.path.join(args.cassette, 'topics.json'), encoding='utf-8') as f:
+                topics = json.load(f)
+        except FileNotFoundError:
+            sys.exit(f"No topics given and no recording in {args.cassette}/; "
+                     f"record one first, e.g.: python bench_pipeline.py --record rust")
+
+    if args.record:
+        record(args.cassette, topics)
+        return
+
+    with use_cassette(args.cassette, mode='replay') as cassette:
+        sources = bench_sources(topics, args.repeat)
+    with use_cassette(args.cassette, mode='replay', latency=args.latency) as pipeline_cassette:
+        pipeline = bench_pipeline(topics, args.repeat, args.concurrent)
+
+    print(f"Topics: {', '.join(topics)} | median of {args.repeat} runs\n")
+    print(f"{'source':<20} {'ms':>10} {'items':>8}")
+    print('-' * 40)
+    for key, row in sorted(sources.items(), key=lambda item: item[1]['median_ms'], reverse=True):
+        print(f"{key:<20} {row['median_ms']:>10.2f} {row['items']:>8}")
+    print('-' * 40)
+    print(f"{'research_topic':<20} {pipeline['median_ms']:>10.2f} {pipeline['items']:>8} "
+          f"({pipeline['items_per_s']:.0f} items/s, {args.latency * 1000:.0f} ms injected latency)")
+
+    misses = cassette.misses + pipeline_cassette.misses
+    if misses:
+        print(f"\n{misses} requests had no recording; re-record with --record to cover them")
+
+    results = {'topics': topics, 'repeat': args.repeat, 'latency': args.latency,
+               'sources': sources, 'pipeline': pipeline}
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nSlower than {args.baseline} by more than {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class CircuitBreaker:
+    """Stops calling a source after repeated failures, probing now and then for recovery
+
+    closed: calls go through; failure_threshold consecutive failures open it.
+    open: calls are skipped until reset_timeout seconds have passed, then the
+    breaker is half-open.
+    half_open: one probe call goes through; success closes the breaker,
+    failure opens it for another reset_timeout.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.skipped = 0
+        self.last_error = None
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; counts the call as skipped if not"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.skipped += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def status(self) -> Dict:
+        with self._lock:
+            status = {
+                'state': self._current_state(),
+                'consecutive_failures': self.failures,
+                'skipped': self.skipped,
+                'last_error': self.last_error,
+            }
+            if self._state == self.OPEN:
+                status['retry_in'] = round(max(0.0, self._opened_at + self.reset_timeout - time.monotonic()), 1)
+            return status
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per source key, created on first use with shared settings"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def statuses(self, state: Optional[str] = None) -> Dict[str, Dict]:
+        """Status of every breaker, or only of those currently in `state`"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        statuses = {breaker.name: breaker.status() for breaker in breakers}
+        if state is not None:
+            statuses = {name: status for name, status in statuses.items() if status['state'] == state}
+        return statuses
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import contextlib
+import contextvars
+import os
+import threading
+from typing import Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+
+# Base URL of every site and API the scrapers talk to, by '<source>.<role>'.
+# Scrapers build their request URLs from these, so a run can be pointed at a
+# caching proxy, a regional mirror or a replay server without code changes.
+DEFAULT_ENDPOINTS = {
+    'hackernews.web': 'https://news.ycombinator.com',
+    'hackernews.firebase': 'https://hacker-news.firebaseio.com/v0',
+    'hackernews.algolia': 'https://hn.algolia.com/api/v1',
+    'reddit.web': 'https://www.reddit.com',
+    'github.web': 'https://github.com',
+    'github.api': 'https://api.github.com',
+    'devto.web': 'https://dev.to',
+    'devto.api': 'https://dev.to/api',
+    'arxiv.api': 'http://export.arxiv.org/api/query',
+    'producthunt.web': 'https://www.producthunt.com',
+    'producthunt.api': 'https://api.producthunt.com/v2/api/graphql',
+    'paperswithcode.web': 'https://paperswithcode.com',
+    'lobsters.web': 'https://lobste.rs',
+    'stackoverflow.web': 'https://stackoverflow.com',
+    'stackoverflow.api': 'https://api.stackexchange.com/2.3',
+    'huggingface.web': 'https://huggingface.co',
+    'huggingface.api': 'https://huggingface.co/api',
+    'hashnode.web': 'https://hashnode.com',
+    'hashnode.api': 'https://gql.hashnode.com',
+    'techcrunch.web': 'https://techcrunch.com',
+    'wellfound.web': 'https://wellfound.com',
+    'kaggle.web': 'https://www.kaggle.com',
+    'kaggle.api': 'https://www.kaggle.com/api/v1',
+    'indiehackers.web': 'https://www.indiehackers.com',
+    'theverge.web': 'https://www.theverge.com',
+    'arstechnica.web': 'https://arstechnica.com',
+    'npm.web': 'https://www.npmjs.com',
+    'npm.registry': 'https://registry.npmjs.org',
+    'npm.search': 'https://api.npms.io/v2',
+    'npm.downloads': 'https://api.npmjs.org/downloads',
+    'pypi.web': 'https://pypi.org',
+    'pypi.api': 'https://pypi.org/pypi',
+}
+
+# RESEARCH_ENDPOINT_HACKERNEWS_ALGOLIA=http://mirror/algolia overrides 'hackernews.algolia'
+ENV_PREFIX = 'RESEARCH_ENDPOINT_'
+
+_overrides = contextvars.ContextVar('endpoint_overrides', default=None)
+
+
+def env_name(name: str) -> str:
+    return ENV_PREFIX + name.upper().replace('.', '_')
+
+
+class EndpointRegistry:
+    """Base URLs by endpoint name: the defaults, then environment variables, then set()
+
+    override_endpoints() layers further overrides for the code running
+    inside it. Scrapers read their endpoints when they are created, so
+    overrides apply to scrapers created afterwards.
+    """
+
+    def __init__(self, defaults: Optional[Mapping[str, str]] = None, environ: Optional[Mapping[str, str]] = None):
+        self._endpoints = dict(DEFAULT_ENDPOINTS if defaults is None else defaults)
+        self._lock = threading.Lock()
+        environ = os.environ if environ is None else environ
+        for name in self._endpoints:
+            if environ.get(env_name(name)):
+                self._endpoints[name] = environ[env_name(name)].rstrip('/')
+
+    def _check(self, names):
+        unknown = sorted(set(names) - set(self._endpoints))
+        if unknown:
+            raise KeyError(f"Unknown endpoints: {', '.join(unknown)}")
+
+    def get(self, name: str) -> str:
+        overrides = _overrides.get()
+        if overrides and name in overrides:
+            return overrides[name]
+        with self._lock:
+            if name not in self._endpoints:
+                raise KeyError(f"Unknown endpoint: {name}")
+            return self._endpoints[name]
+
+    def set(self, name: str, url: str):
+        self.update({name: url})
+
+    def update(self, endpoints: Mapping[str, str]):
+        self._check(endpoints)
+        with self._lock:
+            self._endpoints.update((name, url.rstrip('/')) for name, url in endpoints.items())
+
+    def all(self) -> Dict[str, str]:
+        """Every endpoint as currently resolved, overrides included"""
+        with self._lock:
+            names = list(self._endpoints)
+        return {name: self.get(name) for name in names}
+
+    def origins(self) -> List[str]:
+        """The distinct scheme://host[:port] origins of all endpoints"""
+        return sorted({f"{parts.scheme}://{parts.netloc}" for parts in map(urlsplit, self.all().values())})
+
+
+_default_registry = EndpointRegistry()
+
+
+def get_endpoints() -> EndpointRegistry:
+    return _default_registry
+
+
+def endpoint(name: str) -> str:
+    """The base URL for name, e.g. endpoint('hackernews.algolia')"""
+    return _default_registry.get(name)
+
+
+@contextlib.contextmanager
+def override_endpoints(endpoints: Mapping[str, str]) -> Iterator[None]:
+    """Use other base URLs for the scrapers created inside the block
+
+        with override_endpoints({'hackernews.algolia': 'http://localhost:8080/algolia'}):
+            scraper = HackerNewsScraper()
+    """
+    _default_registry._check(endpoints)
+    merged = dict(_overrides.get() or {})
+    merged.update((name, url.rstrip('/')) for name, url in endpoints.items())
+    token = _overrides.set(merged)
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
@@ -1,20 +1,39 @@
 #!/usr/bin/env python3
 
+import contextlib
+import contextvars
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import json
+import threading
 import time
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import re
 from urllib.parse import urljoin
-from scraper import WebScraper, HackerNewsScraper, RedditScraper, GitHubTrendingScraper
+from scraper import FetchContext, WebScraper, HackerNewsScraper, RedditScraper, GitHubTrendingScraper, walk_comment_tree
 from additional_scrapers import DevToScraper, ArXivScraper, ProductHuntScraper, PapersWithCodeScraper, LobstersScraper
 from additional_scrapers_v2 import StackOverflowScraper, HuggingFaceScraper, HashnodeScraper, TechCrunchScraper, AngelListScraper
 from additional_scrapers_v3 import KaggleScraper, IndieHackersScraper, TheVergeScraper, ArsTechnicaScraper, PyPIScraper, NPMScraper
+from memo import memoized
+from retry import get_retry_policy
+from circuit_breaker import CircuitBreaker, CircuitBreakers
+from metrics import get_metrics
+from logs import current_run_id, get_logger, log_context, new_run_id
+from profiling import make_profiler
+from endpoints import override_endpoints
+from item_store import ItemStore
+from records import RECORD_TYPES
+from exporters import ColumnarWriter, NDJSONWriter, iter_research_records, write_research_columnar
+
+
+log = get_logger('aggregator')
 
 
 class ContentFetcher(WebScraper):
+    cache_ttl = 86400
+
     def __init__(self):
         super().__init__(delay=1.0)
 
@@ -132,8 +151,16 @@ class ContentFetcher(WebScraper):
 
 
 class EnhancedHackerNewsScraper(HackerNewsScraper):
+    @memoized()
     def get_story_with_comments(self, story_id: str, comment_limit: int = 10) -> Dict:
-        """Get story details with top comments"""
+        """Get story details with top comments
+
+        Each top-level comment comes with its nested replies, or none with
+        use_api; `replies` always counts its direct replies.
+        """
+        if self.use_api:
+            return self._api_story_with_comments(story_id, comment_limit)
+
         url = f"{self.base_url}/item?id={story_id}"
         html = self.fetch(url)
         if not html:
@@ -174,79 +201,43 @@ class EnhancedHackerNewsScraper(HackerNewsScraper):
 
         return story
 
-    def _extract_top_comments(self, soup, limit: int = 10) -> List[Dict]:
-        """Extract top-level comments with their replies"""
-        comments = []
-        comment_trees = soup.select('.comment-tree > tbody > tr.athing.comtr')
-
-        for comment_elem in comment_trees[:limit]:
-            comment = self._parse_comment_tree(comment_elem, soup)
-            if comment:
-                comments.append(comment)
-
-        return comments
+    def _api_story_with_comments(self, story_id: str, comment_limit: int) -> Dict:
+        item = self.get_item(story_id)
+        if not item:
+            return {}
 
-    def _parse_comment_tree(self, comment_elem, soup) -> Optional[Dict]:
-        """Parse comment with nested replies"""
-        try:
-            comment_id = comment_elem.get('id')
-
-            # Check indentation level
-            indent_elem = comment_elem.select_one('.ind img')
-            indent = 0
-            if indent_elem and indent_elem.get('width'):
-                indent = int(indent_elem['width']) // 40
-
-            # Only process top-level comments (indent = 0)
-            if indent > 0:
-                return None
-
-            # Get comment text
-            text_elem = comment_elem.select_one('.commtext')
-            text = ''
-            if text_elem:
-                for br in text_elem.find_all('br'):
-                    br.replace_with('\n')
-                text = text_elem.get_text().strip()
-
-            # Get metadata
-            user_elem = comment_elem.select_one('.hnuser')
-            author = user_elem.text.strip() if user_elem else '[deleted]'
-
-            age_elem = comment_elem.select_one('.age')
-            age = age_elem.text.strip() if age_elem else ''
-
-            # Count direct replies
-            reply_count = 0
-            next_elem = comment_elem.find_next_sibling('tr')
-            while next_elem and 'athing' in next_elem.get('class', []):
-                next_indent_elem = next_elem.select_one('.ind img')
-                if next_indent_elem and next_indent_elem.get('width'):
-                    next_indent = int(next_indent_elem['width']) // 40
-                    if next_indent == 1:  # Direct reply
-                        reply_count += 1
-                    elif next_indent == 0:  # Next top-level comment
-                        break
-                next_elem = next_elem.find_next_sibling('tr')
+        url = f"{self.base_url}/item?id={story_id}"
+        story = {
+            'id': story_id,
+            'url': url,
+            'title': item.get('title', ''),
+            'link': item.get('url') or url,
+            'points': item.get('score', 0),
+            'author': item.get('by', ''),
+            'age': self._api_age(item),
+        }
+        # Top-level comments only: every reply would be a request of its own
+        tree = self.get_comment_tree(story_id, max_comments=comment_limit, max_depth=1)
+        story['comments'] = self._story_comments(tree)
+        return story
 
-            return {
-                'id': comment_id,
-                'author': author,
-                'text': text[:1000],  # Limit comment text
-                'age': age,
-                'replies': reply_count
-            }
+    def _extract_top_comments(self, soup, limit: int = 10) -> List[Dict]:
+        """Top-level comments with their nested replies"""
+        return self._story_comments(self._build_comment_tree(soup)[:limit])
 
-        except Exception as e:
-            print(f"Error parsing comment: {e}")
-            return None
+    @staticmethod
+    def _story_comments(tree: List[Dict]) -> List[Dict]:
+        """The top-level nodes of a comment tree, with every comment's text cut to 1000 characters"""
+        for node in walk_comment_tree(tree):
+            node['text'] = node['text'][:1000]
+        return tree
 
     def search_topics(self, topics: List[str], dateRange: str = 'week', limit: int = 10) -> Dict[str, List[Dict]]:
         """Search for multiple topics and organize results"""
         results = {}
 
         for topic in topics:
-            print(f"Searching for: {topic}")
+            self.log.info("Searching for: %s", topic)
             stories = self.search_stories(topic, dateRange=dateRange)[:limit]
             results[topic] = stories
 
@@ -254,6 +245,7 @@ class EnhancedHackerNewsScraper(HackerNewsScraper):
 
 
 class EnhancedRedditScraper(RedditScraper):
+    @memoized()
     def get_post_with_comments(self, post_url: str, comment_limit: int = 10) -> Dict:
         """Get Reddit post with top comments"""
         if not post_url.endswith('.json'):
@@ -261,6 +253,7 @@ class EnhancedRedditScraper(RedditScraper):
 
         try:
             response = self.session.get(post_url, params={'limit': comment_limit}, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             data = response.json()
 
@@ -275,7 +268,8 @@ class EnhancedRedditScraper(RedditScraper):
                 'score': post_data['score'],
                 'num_comments': post_data['num_comments'],
                 'subreddit': post_data['subreddit'],
-                'created_utc': datetime.fromtimestamp(post_data['created_utc']).isoformat()
+                'created_utc': int(post_data['created_utc']),
+                'scraped_at': ctx.scraped_at
             }
 
             # Extract top comments
@@ -291,14 +285,14 @@ class EnhancedRedditScraper(RedditScraper):
                             'text': c['body'][:500],  # Limit text length
                             'score': c['score'],
                             'replies': c.get('replies', {}).get('data', {}).get('count', 0) if isinstance(c.get('replies'), dict) else 0,
-                            'created_utc': datetime.fromtimestamp(c['created_utc']).isoformat()
+                            'created_utc': int(c['created_utc'])
                         })
 
             post['top_comments'] = comments
             return post
 
         except Exception as e:
-            print(f"Error fetching post with comments: {e}")
+            self.log.error("Error fetching post with comments: %s", e)
             return {}
 
     def search_multiple_topics(self, topics: List[str], subreddits: List[str] = None, time: str = 'week', limit: int = 10) -> Dict:
@@ -311,7 +305,7 @@ class EnhancedRedditScraper(RedditScraper):
         for topic in topics:
             results[topic] = {}
             for subreddit in subreddits:
-                print(f"Searching r/{subreddit} for: {topic}")
+                self.log.info("Searching r/%s for: %s", subreddit, topic)
                 posts = self.search_posts(topic, subreddit=subreddit if subreddit != 'all' else None, time=time)[:limit]
                 results[topic][subreddit] = posts
 
@@ -319,37 +313,112 @@ class EnhancedRedditScraper(RedditScraper):
 
 
 class ResearchAggregator:
-    def __init__(self):
-        self.hn = EnhancedHackerNewsScraper()
-        self.reddit = EnhancedRedditScraper()
-        self.github = GitHubTrendingScraper()
-        # OpenAI Community scraper removed (was in separate file)
-        self.devto = DevToScraper()
-        self.arxiv = ArXivScraper()
-        # self.producthunt = ProductHuntScraper()  # BLOCKED - 403
-        self.paperswithcode = PapersWithCodeScraper()
-        self.lobsters = LobstersScraper()
-        self.stackoverflow = StackOverflowScraper()
-        self.huggingface = HuggingFaceScraper()
-        # self.hashnode = HashnodeScraper()  # BLOCKED - API issues
-        self.techcrunch = TechCrunchScraper()
-        # self.angellist = AngelListScraper()  # BLOCKED - Cloudflare
-
-        # V3 scrapers
-        self.kaggle = KaggleScraper()
-        self.indiehackers = IndieHackersScraper()
-        self.theverge = TheVergeScraper()
-        self.arstechnica = ArsTechnicaScraper()
-        self.pypi = PyPIScraper()
-        self.npm = NPMScraper()
-
-        self.fetcher = ContentFetcher()
-
-    def research_topic(self, topic: str, fetch_content: bool = False, get_comments: bool = True) -> Dict:
-        """Comprehensive research on a specific topic"""
-        print(f"\n{'='*60}")
-        print(f"RESEARCHING: {topic}")
-        print('='*60)
+    """Queries every source for a topic
+
+    Each source sits behind a circuit breaker: after breaker_threshold
+    consecutive failed runs (only failed requests, an exception, a missed
+    deadline, or taking longer than slow_source_seconds) the source is skipped
+    for breaker_reset seconds, then probed once. Skipped and failing sources
+    are listed in research['source_status'].
+
+    Source run times, and the request and parse timings recorded by the
+    scrapers, go to the metrics registry (see metrics); with metrics_path set
+    they are written there in Prometheus text format after every topic.
+
+    With profile_dir set, each source's fetch and parse phases are profiled
+    (profiler='sampling' or 'cprofile', see profiling) and the profiles,
+    cumulative over the topics so far, are written there after every topic.
+
+    endpoints overrides base URLs of the endpoint registry for this
+    aggregator's scrapers, e.g. {'hackernews.algolia': 'http://mirror/algolia'}.
+
+    hn_api reads Hacker News stories and comments from its Firebase API,
+    fetching items concurrently, instead of scraping the HTML pages.
+
+    The sources in BLOCKED_SOURCES usually refuse scrapers (403 or a failing
+    API) and are left out unless include_blocked is set. Breaker state does
+    not outlive the aggregator, so without this every new process would pay
+    for them again until their breakers open.
+    """
+
+    BLOCKED_SOURCES = ('product_hunt', 'hashnode', 'angellist')
+
+    def __init__(self, max_workers: int = 8, source_timeout: Optional[float] = None,
+                 store: Optional[ItemStore] = None, breaker_threshold: int = 3, breaker_reset: float = 300.0,
+                 slow_source_seconds: Optional[float] = None, metrics_path: Optional[str] = None,
+                 profile_dir: Optional[str] = None, profiler: str = 'sampling',
+                 endpoints: Optional[Dict[str, str]] = None, hn_api: bool = False,
+                 include_blocked: bool = False):
+        # Scrapers read their base URLs (see endpoints) when they are created
+        with override_endpoints(endpoints or {}):
+            self.hn = EnhancedHackerNewsScraper(use_api=hn_api)
+            self.reddit = EnhancedRedditScraper()
+            self.github = GitHubTrendingScraper()
+            # OpenAI Community scraper removed (was in separate file)
+            self.devto = DevToScraper()
+            self.arxiv = ArXivScraper()
+            self.producthunt = ProductHuntScraper()  # Often blocked (403); only with include_blocked
+            self.paperswithcode = PapersWithCodeScraper()
+            self.lobsters = LobstersScraper()
+            self.stackoverflow = StackOverflowScraper()
+            self.huggingface = HuggingFaceScraper()
+            self.hashnode = HashnodeScraper()  # GraphQL API often fails; only with include_blocked
+            self.techcrunch = TechCrunchScraper()
+            self.angellist = AngelListScraper()  # Often behind Cloudflare (403); only with include_blocked
+
+            # V3 scrapers
+            self.kaggle = KaggleScraper()
+            self.indiehackers = IndieHackersScraper()
+            self.theverge = TheVergeScraper()
+            self.arstechnica = ArsTechnicaScraper()
+            self.pypi = PyPIScraper()
+            self.npm = NPMScraper()
+
+            self.fetcher = ContentFetcher()
+
+        # Defaults for concurrent research_topic runs
+        self.max_workers = max_workers
+        self.source_timeout = source_timeout
+
+        # Every research_topic result is upserted here when set
+        self.store = store
+        self.include_blocked = include_blocked
+
+        self.breakers = CircuitBreakers(breaker_threshold, breaker_reset)
+        self.slow_source_seconds = slow_source_seconds
+        self.metrics_path = metrics_path
+        self.profile_dir = profile_dir
+        self.profiler = make_profiler(profiler) if profile_dir else None
+        # Scrapers whose request outcomes decide whether a source's run failed
+        self._source_scrapers = {
+            'hackernews': [self.hn], 'reddit': [self.reddit], 'github': [self.github], 'devto': [self.devto],
+            'arxiv': [self.arxiv], 'product_hunt': [self.producthunt], 'papers_with_code': [self.paperswithcode],
+            'lobsters': [self.lobsters], 'stackoverflow': [self.stackoverflow], 'huggingface': [self.huggingface],
+            'hashnode': [self.hashnode], 'techcrunch': [self.techcrunch], 'angellist': [self.angellist],
+            'kaggle': [self.kaggle], 'indiehackers': [self.indiehackers], 'theverge': [self.theverge],
+            'arstechnica': [self.arstechnica], 'pypi': [self.pypi], 'npm': [self.npm],
+        }
+
+    def research_topic(self, topic: str, fetch_content: bool = False, get_comments: bool = True,
+                       concurrent: bool = False, max_workers: Optional[int] = None,
+                       source_timeout: Optional[float] = None) -> Dict:
+        """Comprehensive research on a specific topic
+
+        concurrent: query all sources at the same time instead of one after another
+        max_workers: number of sources queried at once (defaults to self.max_workers)
+        source_timeout: seconds a source may run before its result is dropped
+                        (defaults to self.source_timeout, concurrent mode only)
+
+        Each call starts with a fresh retry budget. Log records emitted while it
+        runs carry the topic and a run_id (a new one unless the caller set one).
+        """
+        with log_context(run_id=current_run_id() or new_run_id(), topic=topic):
+            return self._research_topic(topic, fetch_content, get_comments, concurrent, max_workers, source_timeout)
+
+    def _research_topic(self, topic: str, fetch_content: bool, get_comments: bool, concurrent: bool,
+                        max_workers: Optional[int], source_timeout: Optional[float]) -> Dict:
+        get_retry_policy().budget.reset()
+        log.info("Researching: %s", topic)
 
         research = {
             'topic': topic,
@@ -357,144 +426,342 @@ class ResearchAggregator:
             'sources': {}
         }
 
-        # Hacker News research
-        print("\n📰 Searching Hacker News...")
+        tasks = self._source_tasks(topic, get_comments)
+
+        if concurrent:
+            results = self._run_sources_concurrently(
+                tasks,
+                max_workers=max_workers or self.max_workers,
+                source_timeout=source_timeout if source_timeout is not None else self.source_timeout
+            )
+        else:
+            results = {}
+            for key, label, task, fallback in tasks:
+                log.info("%s", label)
+                try:
+                    results[key] = task()
+                except Exception as e:
+                    log.error("%s failed: %s: %s", key, type(e).__name__, e)
+                    results[key] = fallback
+
+        # Keep the source order stable regardless of completion order
+        for key, label, task, fallback in tasks:
+            research['sources'][key] = results[key]
+
+        failing = {key: status for key, status in self.breakers.statuses().items()
+                   if status['state'] != CircuitBreaker.CLOSED or status['consecutive_failures']}
+        if failing:
+            research['source_status'] = failing
+
+        # Fetch content from top URLs if requested
+        hn_stories = research['sources']['hackernews']['stories']
+        if fetch_content and hn_stories:
+            log.info("Fetching article content")
+            top_urls = [s['url'] for s in hn_stories[:3] if s.get('url') and not s['url'].startswith('https://news.ycombinator.com')]
+            if concurrent and top_urls:
+                with ThreadPoolExecutor(max_workers=min(len(top_urls), max_workers or self.max_workers)) as executor:
+                    futures = [executor.submit(contextvars.copy_context().run, self._fetch_content, url)
+                               for url in top_urls]
+                    research['fetched_content'] = [future.result() for future in futures]
+            else:
+                research['fetched_content'] = [self._fetch_content(url) for url in top_urls]
+
+        if self.store is not None:
+            added = self.store.add_research(research)
+            log.info("Stored %d new items in %s", added, self.store.path)
+
+        if self.metrics_path:
+            get_metrics().write_prometheus(self.metrics_path)
+        if self.profiler is not None:
+            self.profiler.write(self.profile_dir)
+
+        return research
+
+    def _fetch_content(self, url: str) -> Dict:
+        log.info("Fetching: %s", url)
+        with self._profiled('content'):
+            return self.fetcher.fetch_article_content(url)
+
+    def _profiled(self, key: str):
+        return self.profiler.source(key) if self.profiler is not None else contextlib.nullcontext()
+
+    def _source_tasks(self, topic: str, get_comments: bool) -> List[Tuple[str, str, Callable[[], Any], Any]]:
+        """Ordered (key, banner, task, fallback) entries, one per source in research['sources']
+
+        The fallback is used when a source raises, misses its deadline in
+        concurrent mode or is skipped by its circuit breaker.
+        """
+        tasks = [
+            ('hackernews', "📰 Searching Hacker News...",
+             lambda: self._research_hackernews(topic, get_comments),
+             {'stories': [], 'top_story_with_comments': None}),
+            ('reddit', "📱 Searching Reddit...",
+             lambda: self._research_reddit(topic, get_comments),
+             {'posts': [], 'top_post_with_comments': None}),
+            # OpenAI Community scraper removed (was in separate file)
+            # GitHub search using API
+            ('github', "🔧 Searching GitHub...",
+             lambda: self.github.search_repos(topic, sort='stars', limit=10), []),
+            ('devto', "📝 Searching Dev.to...",
+             lambda: self.devto.search_articles(topic, per_page=10), []),
+            ('arxiv', "📚 Searching ArXiv...",
+             lambda: self.arxiv.search_papers(topic, max_results=10), []),
+            ('product_hunt', "🚀 Checking Product Hunt...",
+             lambda: self.producthunt.get_trending_products(days_ago=0, limit=10), []),
+            ('papers_with_code', "🔬 Searching Papers with Code...",
+             lambda: self.paperswithcode.search_papers(topic, limit=10), []),
+            ('lobsters', "🦞 Searching Lobste.rs...",
+             lambda: self.lobsters.search_stories(topic, limit=10), []),
+            ('stackoverflow', "💻 Searching Stack Overflow...",
+             lambda: self.stackoverflow.search_questions(topic, limit=10), []),
+            ('huggingface', "🤗 Searching Hugging Face...",
+             lambda: {
+                 'models': self.huggingface.search_models(topic, limit=5),
+                 'datasets': self.huggingface.get_trending_datasets(limit=5)
+             },
+             {'models': [], 'datasets': []}),
+            ('hashnode', "📝 Searching Hashnode...",
+             lambda: self.hashnode.search_posts(topic, limit=10), []),
+            ('techcrunch', "📰 Searching TechCrunch...",
+             lambda: self.techcrunch.search_articles(topic, limit=10), []),
+            ('angellist', "🚀 Searching AngelList/Wellfound...",
+             lambda: self.angellist.search_startups(topic, limit=10), []),
+            ('kaggle', "📊 Searching Kaggle...",
+             lambda: {
+                 'datasets': self.kaggle.get_trending_datasets(limit=5),
+                 'competitions': self.kaggle.get_competitions(limit=5)
+             },
+             {'datasets': [], 'competitions': []}),
+            ('indiehackers', "💡 Searching Indie Hackers...",
+             lambda: self.indiehackers.get_trending_posts(limit=10), []),
+            ('theverge', "📰 Searching The Verge...",
+             lambda: self.theverge.get_latest_articles(category="tech", limit=10), []),
+            ('arstechnica', "🔬 Searching Ars Technica...",
+             lambda: self.arstechnica.get_latest_articles(limit=10), []),
+            ('pypi', "🐍 Searching PyPI...",
+             lambda: self.pypi.search_packages(topic, limit=10) if topic else self.pypi.get_trending_packages(limit=10), []),
+            ('npm', "📦 Searching npm...",
+             lambda: self.npm.search_packages(topic, limit=10), []),
+        ]
+        return [(key, label, self._guarded(key, task, fallback), fallback) for key, label, task, fallback in tasks
+                if self.include_blocked or key not in self.BLOCKED_SOURCES]
+
+    def _guarded(self, key: str, task: Callable[[], Any], fallback: Any) -> Callable[[], Any]:
+        """Wrap a source task so its circuit breaker decides whether it runs and records how it went
+
+        run.abandon(reason) records a failure for a run that missed its
+        deadline; the run then records nothing when it finishes, so a source
+        that always succeeds just after the deadline still trips its breaker.
+        """
+        breaker = self.breakers.get(key)
+        scrapers = self._source_scrapers.get(key, [])
+        lock = threading.Lock()
+        state = {'settled': False}
+
+        def settle() -> bool:
+            # Each run records one outcome: its own, or the deadline's
+            with lock:
+                if state['settled']:
+                    return False
+                state['settled'] = True
+                return True
+
+        def abandon(reason: str):
+            if settle():
+                breaker.record_failure(reason)
+
+        def run():
+            with log_context(source=key), self._profiled(key):
+                return guarded()
+
+        def guarded():
+            if not breaker.allow():
+                log.warning("Skipped, circuit open (last error: %s)", breaker.last_error)
+                return fallback
+
+            before = [(s.requests_ok, s.requests_failed) for s in scrapers]
+            start = time.monotonic()
+            try:
+                result = task()
+            except Exception as e:
+                if settle():
+                    breaker.record_failure(f"{type(e).__name__}: {e}")
+                raise
+            elapsed = time.monotonic() - start
+            if not settle():
+                log.info("Finished after %.1fs, already abandoned", elapsed)
+                return result
+
+            ok = sum(s.requests_ok - b[0] for s, b in zip(scrapers, before))
+            failed = sum(s.requests_failed - b[1] for s, b in zip(scrapers, before))
+            if failed and not ok:
+                breaker.record_failure(f"{failed} failed requests")
+                outcome = 'failed'
+            elif self.slow_source_seconds is not None and elapsed > self.slow_source_seconds:
+                breaker.record_failure(f"slow: {elapsed:.1f}s")
+                outcome = 'slow'
+            else:
+                breaker.record_success()
+                outcome = 'ok'
+            get_metrics().observe('research_source_seconds', elapsed, source=key, outcome=outcome)
+            return result
+
+        run.abandon = abandon
+        return run
+
+    def _research_hackernews(self, topic: str, get_comments: bool) -> Dict:
         hn_stories = self.hn.search_stories(topic, dateRange='month')[:10]
-        research['sources']['hackernews'] = {
+        result = {
             'stories': hn_stories,
             'top_story_with_comments': None
         }
 
         if hn_stories and get_comments:
             top_story = hn_stories[0]
-            print(f"   Getting comments for top story: {top_story['title'][:60]}...")
-            full_story = self.hn.get_story_with_comments(top_story['id'], comment_limit=5)
-            research['sources']['hackernews']['top_story_with_comments'] = full_story
+            self.hn.log.info("Getting comments for top story: %s", top_story['title'][:60])
+            result['top_story_with_comments'] = self.hn.get_story_with_comments(top_story['id'], comment_limit=5)
+
+        return result
 
-        # Reddit research
-        print("\n📱 Searching Reddit...")
+    def _research_reddit(self, topic: str, get_comments: bool) -> Dict:
         reddit_results = self.reddit.search_posts(topic, time='month')[:10]
-        research['sources']['reddit'] = {
+        result = {
             'posts': reddit_results,
             'top_post_with_comments': None
         }
 
         if reddit_results and get_comments:
             top_post = reddit_results[0]
-            print(f"   Getting comments for: {top_post['title'][:60]}...")
-            post_with_comments = self.reddit.get_post_with_comments(top_post['permalink'])
-            research['sources']['reddit']['top_post_with_comments'] = post_with_comments
-
-        # OpenAI Community scraper removed (was in separate file)
-
-        # GitHub search using API
-        print("\n🔧 Searching GitHub...")
-        github_repos = self.github.search_repos(topic, sort='stars', limit=10)
-        research['sources']['github'] = github_repos
-
-        # Dev.to articles
-        print("\n📝 Searching Dev.to...")
-        devto_articles = self.devto.search_articles(topic, per_page=10)
-        research['sources']['devto'] = devto_articles
-
-        # ArXiv papers
-        print("\n📚 Searching ArXiv...")
-        arxiv_papers = self.arxiv.search_papers(topic, max_results=10)
-        research['sources']['arxiv'] = arxiv_papers
-
-        # Product Hunt - BLOCKED (403 Forbidden)
-        # print("\n🚀 Checking Product Hunt...")
-        # product_hunt_items = self.producthunt.get_trending_products(days_ago=0, limit=10)
-        # research['sources']['product_hunt'] = product_hunt_items
-
-        # Papers with Code
-        print("\n🔬 Searching Papers with Code...")
-        pwc_papers = self.paperswithcode.search_papers(topic, limit=10)
-        research['sources']['papers_with_code'] = pwc_papers
-
-        # Lobste.rs stories
-        print("\n🦞 Searching Lobste.rs...")
-        lobsters_stories = self.lobsters.search_stories(topic, limit=10)
-        research['sources']['lobsters'] = lobsters_stories
-
-        # Stack Overflow questions
-        print("\n💻 Searching Stack Overflow...")
-        so_questions = self.stackoverflow.search_questions(topic, limit=10)
-        research['sources']['stackoverflow'] = so_questions
-
-        # Hugging Face models and datasets
-        print("\n🤗 Searching Hugging Face...")
-        hf_models = self.huggingface.search_models(topic, limit=5)
-        hf_datasets = self.huggingface.get_trending_datasets(limit=5)
-        research['sources']['huggingface'] = {
-            'models': hf_models,
-            'datasets': hf_datasets
-        }
+            self.reddit.log.info("Getting comments for: %s", top_post['title'][:60])
+            result['top_post_with_comments'] = self.reddit.get_post_with_comments(top_post['permalink'])
+
+        return result
+
+    def iter_research(self, topic: str, get_comments: bool = True, max_workers: Optional[int] = None,
+                      source_timeout: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """Yield (source key, result) pairs for a topic as each source finishes
+
+        Sources are queried concurrently, so consumers can start on the fast
+        sources before the slowest one returns.
+        """
+        yield from self._iter_sources_concurrently(
+            self._source_tasks(topic, get_comments),
+            max_workers=max_workers or self.max_workers,
+            source_timeout=source_timeout if source_timeout is not None else self.source_timeout
+        )
+
+    def harvest_topic(self, topic: str, max_items: int = 1000, as_records: bool = False) -> Iterator[Tuple[str, Any]]:
+        """Yield (source key, item) pairs from a deep, paginated harvest of each API source
+
+        Sources are harvested one after another, each prefetching its own result
+        pages, so memory stays bounded by a few pages regardless of max_items.
+        as_records yields slotted records.Record objects instead of dicts for
+        sources that have a record type, for callers that keep the items.
+        """
+        harvesters = [
+            ('hackernews', lambda: self.hn.harvest_stories(topic, max_items=max_items)),
+            ('github', lambda: self.github.harvest_repos(topic, max_items=max_items)),
+            ('devto', lambda: self.devto.harvest_articles(topic, max_items=max_items)),
+            ('arxiv', lambda: self.arxiv.harvest_papers(topic, max_items=max_items)),
+            ('stackoverflow', lambda: self.stackoverflow.harvest_questions(topic, max_items=max_items)),
+            ('huggingface', lambda: self.huggingface.harvest_models(topic, max_items=max_items)),
+            ('npm', lambda: self.npm.harvest_packages(topic, max_items=max_items)),
+        ]
 
-        # Hashnode - BLOCKED (GraphQL API issues)
-        # print("\n📝 Searching Hashnode...")
-        # hashnode_posts = self.hashnode.search_posts(topic, limit=10)
-        # research['sources']['hashnode'] = hashnode_posts
-
-        # TechCrunch articles
-        print("\n📰 Searching TechCrunch...")
-        tc_articles = self.techcrunch.search_articles(topic, limit=10)
-        research['sources']['techcrunch'] = tc_articles
-
-        # AngelList/Wellfound - BLOCKED (Cloudflare 403)
-        # print("\n🚀 Searching AngelList/Wellfound...")
-        # al_startups = self.angellist.search_startups(topic, limit=10)
-        # research['sources']['angellist'] = al_startups
-
-        # Kaggle datasets
-        print("\n📊 Searching Kaggle...")
-        kaggle_datasets = self.kaggle.get_trending_datasets(limit=5)
-        kaggle_competitions = self.kaggle.get_competitions(limit=5)
-        research['sources']['kaggle'] = {
-            'datasets': kaggle_datasets,
-            'competitions': kaggle_competitions
+        for key, harvest in harvesters:
+            log.info("Harvesting %s (up to %d items)", key, max_items)
+            record_type = RECORD_TYPES.get(key) if as_records else None
+            for item in harvest():
+                yield key, record_type.from_dict(item) if record_type else item
+
+    def _run_sources_concurrently(self, tasks: List[Tuple[str, str, Callable[[], Any], Any]],
+                                  max_workers: int, source_timeout: Optional[float] = None) -> Dict[str, Any]:
+        return dict(self._iter_sources_concurrently(tasks, max_workers, source_timeout))
+
+    def _iter_sources_concurrently(self, tasks: List[Tuple[str, str, Callable[[], Any], Any]],
+                                   max_workers: int, source_timeout: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """Run source tasks on a thread pool and yield (key, result) in completion order
+
+        A source that raises yields its fallback. A source that has been
+        running longer than source_timeout seconds is abandoned (see _guarded)
+        and its fallback is yielded instead. Its worker thread is left to
+        finish on its own; the per-request timeouts in the scrapers bound it.
+        """
+        started = {}
+
+        def run(key, label, task):
+            started[key] = time.monotonic()
+            log.info("%s", label)
+            return task()
+
+        # Workers run in a copy of the caller's context so their log records keep its run_id and topic
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        futures = {
+            executor.submit(contextvars.copy_context().run, run, key, label, task): (key, task, fallback)
+            for key, label, task, fallback in tasks
         }
+        pending = set(futures)
 
-        # Indie Hackers posts
-        print("\n💡 Searching Indie Hackers...")
-        ih_posts = self.indiehackers.get_trending_posts(limit=10)
-        research['sources']['indiehackers'] = ih_posts
-
-        # The Verge articles
-        print("\n📰 Searching The Verge...")
-        verge_articles = self.theverge.get_latest_articles(category="tech", limit=10)
-        research['sources']['theverge'] = verge_articles
-
-        # Ars Technica articles
-        print("\n🔬 Searching Ars Technica...")
-        ars_articles = self.arstechnica.get_latest_articles(limit=10)
-        research['sources']['arstechnica'] = ars_articles
-
-        # PyPI packages
-        print("\n🐍 Searching PyPI...")
-        pypi_packages = self.pypi.search_packages(topic, limit=10) if topic else self.pypi.get_trending_packages(limit=10)
-        research['sources']['pypi'] = pypi_packages
-
-        # npm packages
-        print("\n📦 Searching npm...")
-        npm_packages = self.npm.search_packages(topic, limit=10)
-        research['sources']['npm'] = npm_packages
-
-        # Fetch content from top URLs if requested
-        if fetch_content and hn_stories:
-            print("\n📖 Fetching article content...")
-            top_urls = [s['url'] for s in hn_stories[:3] if s.get('url') and not s['url'].startswith('https://news.ycombinator.com')]
-            research['fetched_content'] = []
-            for url in top_urls:
-                print(f"   Fetching: {url[:60]}...")
-                content = self.fetcher.fetch_article_content(url)
-                research['fetched_content'].append(content)
-
-        return research
+        try:
+            while pending:
+                timeout = None
+                if source_timeout is not None:
+                    starts = [started.get(futures[f][0]) for f in pending]
+                    if None in starts:
+                        # Some sources are still queued; poll until they start
+                        timeout = 0.05
+                    else:
+                        timeout = max(0.0, min(starts) + source_timeout - time.monotonic())
+
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, task, fallback = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        log.error("%s failed: %s: %s", key, type(e).__name__, e)
+                        result = fallback
+                    yield key, result
+
+                if source_timeout is not None:
+                    now = time.monotonic()
+                    for future in list(pending):
+                        key, task, fallback = futures[future]
+                        start = started.get(key)
+                        if start is not None and now - start >= source_timeout:
+                            log.warning("%s exceeded %.1fs deadline, skipping", key, source_timeout)
+                            task.abandon(f"exceeded {source_timeout:.1f}s deadline")
+                            pending.discard(future)
+                            yield key, fallback
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def multi_topic_research(self, topics: List[str], **kwargs) -> Dict:
         """Research multiple topics"""
         all_research = {}
         for topic in topics:
             all_research[topic] = self.research_topic(topic, **kwargs)
-        return all_research
\ No newline at end of file
+        return all_research
+
+    def export_multi_topic_research(self, topics: List[str], path: str, format: str = 'ndjson',
+                                    rotate_bytes: Optional[int] = None, compression: Optional[str] = None,
+                                    **kwargs) -> List[str]:
+        """Research topics one at a time, streaming each topic's items to disk
+
+        ndjson: one file at path (several when rotate_bytes splits the output).
+        parquet / feather: path is a directory with one typed file per source.
+        Only the topic being researched is held in memory. Returns the files written.
+        """
+        if format in ('parquet', 'feather'):
+            with ColumnarWriter(path, format, columns={'topic': 'string'}) as writer:
+                for topic in topics:
+                    write_research_columnar(self.research_topic(topic, **kwargs), path, writer=writer)
+                    log.info("Wrote %s items to %s", topic, path)
+            return list(writer.paths.values())
+
+        with NDJSONWriter(path, compression=compression, rotate_bytes=rotate_bytes) as writer:
+            for topic in topics:
+                research = self.research_topic(topic, **kwargs)
+                count = writer.write_many(iter_research_records(research))
+                log.info("Wrote %d %s items", count, topic)
+        return writer.paths
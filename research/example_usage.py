@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from scraper import HackerNewsScraper, RedditScraper, GitHubTrendingScraper, export_results
+from logs import configure_logging
 import json
 
 
@@ -91,4 +92,5 @@ def main():
 
 
 if __name__ == "__main__":
+    configure_logging()
     main()
\ No newline at end of file
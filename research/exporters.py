@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import textwrap
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from item_store import iter_research_items, to_epoch
+from records import as_dict
+
+try:
+    import zstandard
+except ImportError:  # Only .zst output needs zstandard
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Only Parquet / Feather output needs pyarrow
+    pyarrow = None
+
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Fields the scrapers store as epoch seconds; the text formats write them as
+# ISO 8601 local time, as the scrapers used to when they formatted each item
+EPOCH_FIELDS = frozenset(('scraped_at', 'created_utc', 'creation_date', 'last_activity'))
+
+
+def format_timestamps(value: Any) -> Any:
+    """Copy of value with every epoch field, at any depth, formatted as an ISO string"""
+    if isinstance(value, dict):
+        return {key: datetime.fromtimestamp(item).isoformat()
+                if key in EPOCH_FIELDS and isinstance(item, (int, float)) and not isinstance(item, bool)
+                else format_timestamps(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [format_timestamps(item) for item in value]
+    return value
+
+
+def detect_compression(path: str) -> Optional[str]:
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def open_text(path: str, compression: Optional[str] = None, append: bool = False) -> TextIO:
+    """Open path for writing text, through gzip or zstd when asked
+
+    Appending to a compressed file adds a new gzip member / zstd frame, which
+    standard readers decompress as one continuous stream.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if compression is None:
+        return open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+    if compression == 'gzip':
+        return gzip.open(path, 'at' if append else 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd compression requires zstandard: pip install zstandard")
+        raw = open(path, 'ab' if append else 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding='utf-8', newline='')
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class NDJSONWriter:
+    """Streams records to newline-delimited JSON, one object per line
+
+    With rotate_bytes (uncompressed bytes) or rotate_seconds set, output is
+    split into numbered, timestamped segments next to `path`, e.g.
+    results-20240101-120000-0001.jsonl.gz; otherwise everything goes to path.
+    Compression is taken from the path suffix (.gz, .zst) unless given.
+    Epoch timestamps are written as ISO strings unless iso_timestamps is False.
+    """
+
+    def __init__(self, path: str, compression: Optional[str] = None, rotate_bytes: Optional[int] = None,
+                 rotate_seconds: Optional[float] = None, append: bool = False, iso_timestamps: bool = True):
+        self.compression = compression or detect_compression(path)
+        suffix = COMPRESSION_SUFFIXES.get(self.compression, '')
+        base = path[:-len(suffix)] if suffix and path.endswith(suffix) else path
+        self._root, self._ext = os.path.splitext(base)
+        self._ext = self._ext or '.jsonl'
+        self._suffix = suffix
+
+        self.path = path if path.endswith(suffix) else path + suffix
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.append = append
+        self.iso_timestamps = iso_timestamps
+        self.paths = []
+        self.records = 0
+
+        self._file = None
+        self._bytes = 0
+        self._opened_at = 0.0
+
+    @property
+    def rotating(self) -> bool:
+        return bool(self.rotate_bytes or self.rotate_seconds)
+
+    def _open_next(self):
+        self._close_file()
+        if self.rotating:
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+            path = f"{self._root}-{stamp}-{len(self.paths) + 1:04d}{self._ext}{self._suffix}"
+        else:
+            path = self.path
+        self._file = open_text(path, self.compression, append=self.append)
+        self._bytes = 0
+        self._opened_at = time.monotonic()
+        self.paths.append(path)
+
+    def _due_for_rotation(self) -> bool:
+        if self.rotate_bytes and self._bytes >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self._opened_at >= self.rotate_seconds
+
+    def write(self, record: Dict):
+        if self._file is None or (self.rotating and self._due_for_rotation()):
+            self._open_next()
+
+        record = as_dict(record)
+        if self.iso_timestamps:
+            record = format_timestamps(record)
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        self._file.write(line)
+        self._bytes += len(line.encode('utf-8'))
+        self.records += 1
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVWriter:
+    """Writes records with differing keys to one CSV whose columns are the union of all keys
+
+    The header can only be written once every record has been seen, so rows
+    are spooled to a temporary file on disk and copied out on close; memory
+    use stays flat however many rows are written. Lists and dicts are stored
+    as JSON, epoch timestamps as ISO strings unless iso_timestamps is False.
+    Passing fieldnames skips the spool and drops any other keys. Without any
+    records (or keys) no file is written, not even a header.
+    """
+
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None, compression: Optional[str] = None,
+                 iso_timestamps: bool = True):
+        self.path = path
+        self.iso_timestamps = iso_timestamps
+        self.compression = compression or detect_compression(path)
+        self.records = 0
+        self._fields = dict.fromkeys(fieldnames) if fieldnames else {}
+        self._fixed = bool(fieldnames)
+
+        if self._fixed:
+            # Opened by the first write, like NDJSONWriter
+            self._file = None
+            self._writer = None
+        else:
+            self._spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+
+    @staticmethod
+    def _cell(value):
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, ensure_ascii=False, default=str)
+        return value
+
+    def write(self, record: Dict):
+        record = as_dict(record)
+        if self.iso_timestamps:
+            record = format_timestamps(record)
+        row = {key: self._cell(value) for key, value in record.items()}
+        if self._fixed:
+            if self._writer is None:
+                self._file = open_text(self.path, self.compression)
+                self._writer = csv.DictWriter(self._file, fieldnames=list(self._fields), extrasaction='ignore')
+                self._writer.writeheader()
+            self._writer.writerow(row)
+        else:
+            for key in row:
+                if key not in self._fields:
+                    self._fields[key] = None
+            self._spool.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+        self.records += 1
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def close(self):
+        if self._fixed:
+            if self._file is not None:
+                self._file.close()
+            return
+
+        if not self._fields:
+            self._spool.close()
+            return
+
+        self._spool.seek(0)
+        with open_text(self.path, self.compression) as f:
+            writer = csv.DictWriter(f, fieldnames=list(self._fields))
+            writer.writeheader()
+            for line in self._spool:
+                writer.writerow(json.loads(line))
+        self._spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_json(items: Iterable[Dict], path: str) -> int:
+    """Stream items to an indented JSON array, byte-identical to json.dump(list(items), indent=2)
+
+    Epoch timestamps are written as ISO strings, see format_timestamps.
+    """
+    count = 0
+    with open_text(path, detect_compression(path)) as f:
+        for item in items:
+            f.write(',\n' if count else '[\n')
+            f.write(textwrap.indent(json.dumps(format_timestamps(as_dict(item)), indent=2, default=str), '  '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    return count
+
+
+def write_ndjson(items: Iterable[Dict], path: str, **kwargs) -> int:
+    with NDJSONWriter(path, **kwargs) as writer:
+        return writer.write_many(items)
+
+
+def write_csv(items: Iterable[Dict], path: str, fieldnames: Optional[List[str]] = None) -> int:
+    with CSVWriter(path, fieldnames) as writer:
+        return writer.write_many(items)
+
+
+def iter_research_records(research: Dict) -> Iterator[Dict]:
+    """Flatten a research_topic result into one record per item, tagged with topic and source"""
+    topic = research.get('topic')
+    for source, items in iter_research_items(research):
+        for item in items:
+            yield {'topic': topic, 'source': source, **as_dict(item)}
+
+
+# Column types for the columnar formats, per source as named in research
+# results. Timestamps are parsed with to_epoch whatever form the scraper used
+# (epoch, ISO string, RFC 2822) and stored as UTC; keys not listed here end up
+# in a JSON `extra` column so nothing is dropped.
+COLUMN_SCHEMAS = {
+    'hackernews': [
+        ('id', 'string'), ('title', 'string'), ('url', 'string'), ('domain', 'string'), ('author', 'string'),
+        ('points', 'int64'), ('comments', 'int64'), ('created_at', 'timestamp'), ('hn_url', 'string'),
+    ],
+    'reddit': [
+        ('id', 'string'), ('title', 'string'), ('author', 'string'), ('url', 'string'), ('score', 'int64'),
+        ('comments', 'int64'), ('subreddit', 'string'), ('created_utc', 'timestamp'), ('permalink', 'string'),
+    ],
+    'github': [
+        ('full_name', 'string'), ('owner', 'string'), ('name', 'string'), ('description', 'string'),
+        ('url', 'string'), ('stars', 'int64'), ('forks', 'int64'), ('language', 'string'),
+        ('created_at', 'timestamp'), ('updated_at', 'timestamp'), ('topics', 'list<string>'),
+        ('license', 'string'), ('scraped_at', 'timestamp'),
+    ],
+    'devto': [
+        ('id', 'int64'), ('title', 'string'), ('description', 'string'), ('url', 'string'), ('author', 'string'),
+        ('tags', 'list<string>'), ('published_at', 'timestamp'), ('positive_reactions', 'int64'),
+        ('comments_count', 'int64'), ('reading_time_minutes', 'int64'), ('scraped_at', 'timestamp'),
+    ],
+    'arxiv': [
+        ('id', 'string'), ('title', 'string'), ('summary', 'string'), ('authors', 'list<string>'),
+        ('published', 'timestamp'), ('updated', 'timestamp'), ('categories', 'list<string>'),
+        ('pdf_url', 'string'), ('url', 'string'), ('scraped_at', 'timestamp'),
+    ],
+    'stackoverflow': [
+        ('id', 'int64'), ('title', 'string'), ('link', 'string'), ('score', 'int64'), ('answer_count', 'int64'),
+        ('view_count', 'int64'), ('is_answered', 'bool'), ('tags', 'list<string>'), ('owner', 'string'),
+        ('creation_date', 'timestamp'), ('body_preview', 'string'), ('scraped_at', 'timestamp'),
+    ],
+    'huggingface.models': [
+        ('id', 'string'), ('name', 'string'), ('author', 'string'), ('url', 'string'), ('downloads', 'int64'),
+        ('likes', 'int64'), ('task', 'string'), ('tags', 'list<string>'), ('scraped_at', 'timestamp'),
+    ],
+    'huggingface.datasets': [
+        ('id', 'string'), ('name', 'string'), ('author', 'string'), ('url', 'string'), ('downloads', 'int64'),
+        ('likes', 'int64'), ('task_categories', 'list<string>'), ('tags', 'list<string>'),
+        ('size_categories', 'list<string>'), ('created_at', 'timestamp'), ('modified_at', 'timestamp'),
+        ('scraped_at', 'timestamp'),
+    ],
+    'npm': [
+        ('name', 'string'), ('version', 'string'), ('description', 'string'), ('keywords', 'list<string>'),
+        ('author', 'string'), ('publisher', 'string'), ('date', 'timestamp'), ('score_final', 'float64'),
+        ('score_quality', 'float64'), ('score_popularity', 'float64'), ('score_maintenance', 'float64'),
+        ('url', 'string'), ('scraped_at', 'timestamp'),
+    ],
+    'pypi': [
+        ('name', 'string'), ('version', 'string'), ('description', 'string'), ('url', 'string'),
+        ('published_at', 'timestamp'), ('scraped_at', 'timestamp'),
+    ],
+}
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("Parquet / Feather export requires pyarrow: pip install pyarrow")
+
+
+def _arrow_type(kind: str):
+    return {
+        'string': pyarrow.string(),
+        'int64': pyarrow.int64(),
+        'float64': pyarrow.float64(),
+        'bool': pyarrow.bool_(),
+        'timestamp': pyarrow.timestamp('s', tz='UTC'),
+        'list<string>': pyarrow.list_(pyarrow.string()),
+    }[kind]
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """value converted for a column of the given kind, or None if it does not fit"""
+    if value is None or value == '':
+        return None
+    try:
+        if kind == 'string':
+            return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+        if kind == 'int64':
+            return len(value) if isinstance(value, list) else int(value)
+        if kind == 'float64':
+            return float(value)
+        if kind == 'bool':
+            return bool(value)
+        if kind == 'timestamp':
+            return to_epoch(value)
+        if kind == 'list<string>':
+            return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+def infer_columns(records: List[Dict]) -> List[Tuple[str, str]]:
+    """Column types for a source without a schema, from the first non-empty value of each key"""
+    kinds = {}
+    for record in records:
+        for key, value in record.items():
+            if kinds.get(key) or value in (None, ''):
+                kinds.setdefault(key, None)
+                continue
+            if isinstance(value, bool):
+                kinds[key] = 'bool'
+            elif isinstance(value, int):
+                kinds[key] = 'int64'
+            elif isinstance(value, float):
+                kinds[key] = 'float64'
+            elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+                kinds[key] = 'list<string>'
+            else:
+                kinds[key] = 'string'
+    return [(key, kind or 'string') for key, kind in kinds.items()]
+
+
+class ColumnarWriter:
+    """Writes items to typed Parquet or Feather (Arrow IPC) files, one per source
+
+    Each source gets a fixed schema from COLUMN_SCHEMAS (or one inferred from
+    its first batch), so files from different runs concatenate cleanly in
+    pandas, Polars or DuckDB. Rows are buffered and flushed every batch_size
+    items, so memory is bounded by one batch per source. `columns` adds
+    columns shared by every source, e.g. {'topic': 'string'}; `schemas` and
+    `paths` override the columns and output file of individual sources.
+    """
+
+    FORMATS = {'parquet': '.parquet', 'feather': '.feather'}
+
+    def __init__(self, directory: str, format: str = 'parquet', batch_size: int = 10000,
+                 columns: Optional[Dict[str, str]] = None, compression: str = 'zstd',
+                 schemas: Optional[Dict[str, List[Tuple[str, str]]]] = None, paths: Optional[Dict[str, str]] = None):
+        _require_pyarrow()
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported columnar format: {format}")
+
+        self.directory = directory
+        self.format = format
+        self.batch_size = batch_size
+        self.columns = list((columns or {}).items())
+        self.compression = compression
+        self.schemas = {**COLUMN_SCHEMAS, **(schemas or {})}
+        self.paths = dict(paths or {})
+        self._schemas = {}
+        self._buffers = {}
+        self._writers = {}
+
+    def path_for(self, source: str) -> str:
+        return self.paths.get(source) or os.path.join(self.directory, f"{source}{self.FORMATS[self.format]}")
+
+    def write(self, source: str, record: Dict):
+        buffer = self._buffers.setdefault(source, [])
+        buffer.append(as_dict(record))
+        if len(buffer) >= self.batch_size:
+            self._flush(source)
+
+    def write_many(self, source: str, records: Iterable[Dict]) -> int:
+        count = 0
+        for record in records:
+            self.write(source, record)
+            count += 1
+        return count
+
+    def _columns(self, source: str) -> List[Tuple[str, str]]:
+        if source not in self._schemas:
+            columns = self.schemas.get(source) or infer_columns(self._buffers[source])
+            shared = {name for name, _ in self.columns}
+            self._schemas[source] = self.columns + [(name, kind) for name, kind in columns if name not in shared]
+        return self._schemas[source]
+
+    def _flush(self, source: str):
+        records = self._buffers.get(source)
+        if not records:
+            return
+
+        columns = self._columns(source)
+        known = {name for name, _ in columns}
+        schema = pyarrow.schema([(name, _arrow_type(kind)) for name, kind in columns] + [('extra', pyarrow.string())])
+
+        data = {name: [_coerce(record.get(name), kind) for record in records] for name, kind in columns}
+        data['extra'] = [
+            json.dumps({k: v for k, v in record.items() if k not in known}, ensure_ascii=False, default=str)
+            if any(k not in known for k in record) else None
+            for record in records
+        ]
+        table = pyarrow.Table.from_pydict(data, schema=schema)
+
+        writer = self._writers.get(source)
+        if writer is None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path_for(source)
+            if self.format == 'parquet':
+                writer = pyarrow.parquet.ParquetWriter(path, schema, compression=self.compression)
+            else:
+                options = pyarrow.ipc.IpcWriteOptions(compression=self.compression)
+                writer = pyarrow.ipc.new_file(path, schema, options=options)
+            self._writers[source] = writer
+            self.paths[source] = path
+
+        writer.write_table(table)
+        self._buffers[source] = []
+
+    def close(self):
+        for source in list(self._buffers):
+            self._flush(source)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_columnar(items: Iterable[Dict], path: str, source: Optional[str] = None, format: str = 'parquet') -> int:
+    """Write items from one source to a single Parquet / Feather file"""
+    name = source or os.path.splitext(os.path.basename(path))[0]
+    with ColumnarWriter(os.path.dirname(path) or '.', format, paths={name: path}) as writer:
+        return writer.write_many(name, items)
+
+
+def write_research_columnar(research: Dict, directory: str, format: str = 'parquet',
+                            writer: Optional[ColumnarWriter] = None) -> Dict[str, str]:
+    """Write a research_topic result as one typed file per source, with a topic column
+
+    Pass an open writer to append several topics to the same files.
+    """
+    owned = writer is None
+    writer = writer or ColumnarWriter(directory, format, columns={'topic': 'string'})
+    topic = research.get('topic')
+    for source, items in iter_research_items(research):
+        writer.write_many(source, ({'topic': topic, **as_dict(item)} for item in items))
+    if owned:
+        writer.close()
+    return writer.paths
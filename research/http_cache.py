@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Headers that describe the wire encoding rather than the stored (decoded) body
+_HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+class CachedResponse:
+    """A response body plus the metadata needed to serve or revalidate it"""
+
+    def __init__(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes,
+                 etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def revalidation_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """On-disk HTTP response cache in a single SQLite file
+
+    Entries are keyed by method + canonical URL (query parameters sorted), live
+    for the TTL given when they are stored, keep their ETag / Last-Modified
+    validators for conditional revalidation, and are evicted least recently
+    used first once the stored bodies exceed max_bytes.
+    """
+
+    def __init__(self, path: str = '.research_cache/http_cache.sqlite3', max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend((k, str(v)) for k, v in params.items() if v is not None)
+        canonical = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(sorted(query)), ''))
+        return hashlib.sha256(f"{method.upper()} {canonical}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+
+        url, status, headers, body, etag, last_modified, expires_at = row
+        return CachedResponse(key, url, status, json.loads(headers), body, etag, last_modified, expires_at)
+
+    def put(self, key: str, method: str, url: str, status: int, headers: Dict[str, str], body: bytes, ttl: float):
+        headers = {k: v for k, v in headers.items() if k.lower() not in _HOP_HEADERS}
+        lowered = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, method.upper(), url, status, json.dumps(headers), body,
+                 lowered.get('etag'), lowered.get('last-modified'), now, now + ttl, now, len(body))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, key: str, ttl: float):
+        """Extend an entry's lifetime after the origin answered 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?',
+                (now + ttl, now, key)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def enable_cache(path: str = '.research_cache/http_cache.sqlite3', max_bytes: int = 256 * 1024 * 1024) -> ResponseCache:
+    """Turn on response caching for every scraper in this process"""
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = ResponseCache(path, max_bytes)
+    return _default_cache
+
+
+def disable_cache():
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = None
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """The process-wide cache, created from RESEARCH_HTTP_CACHE on first use if set"""
+    global _default_cache
+    if _default_cache is None and os.environ.get('RESEARCH_HTTP_CACHE'):
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache(os.environ['RESEARCH_HTTP_CACHE'])
+    return _default_cache
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from scraper import HackerNewsScraper, IncompleteFetch, RedditScraper
+from additional_scrapers import ArXivScraper
+from additional_scrapers_v2 import StackOverflowScraper
+from additional_scrapers_v3 import PyPIScraper
+from item_store import ItemStore, to_epoch
+from retry import get_retry_policy
+from logs import configure_logging, current_run_id, get_logger, log_context, new_run_id
+
+
+log = get_logger('incremental')
+
+
+class WatermarkStore:
+    """Per-(source, topic) high-water marks persisted as a small JSON file
+
+    A watermark is the epoch timestamp of the newest item already collected;
+    the next poll asks each source only for items created after it.
+    """
+
+    def __init__(self, path: str = '.research_cache/watermarks.json'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._marks = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._marks = json.load(f)
+
+    def get(self, source: str, topic: str) -> Optional[int]:
+        with self._lock:
+            return self._marks.get(source, {}).get(topic)
+
+    def advance(self, source: str, topic: str, value: int):
+        """Move a watermark forward; older values are ignored"""
+        with self._lock:
+            marks = self._marks.setdefault(source, {})
+            if value > marks.get(topic, 0):
+                marks[topic] = int(value)
+
+    def reset(self, source: Optional[str] = None, topic: Optional[str] = None):
+        with self._lock:
+            for name in [source] if source else list(self._marks):
+                if topic is None:
+                    self._marks.pop(name, None)
+                else:
+                    self._marks.get(name, {}).pop(topic, None)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self._marks, indent=2, sort_keys=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+class CorpusStore:
+    """Collected items, one append-only JSON Lines file per topic
+
+    Each line is {"source": ..., "id": ..., "item": {...}}. Items already in a
+    topic's file are not appended again, so polls only ever write the delta.
+    """
+
+    def __init__(self, directory: str = '.research_cache/corpus'):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._ids = {}
+
+    def _path(self, topic: str) -> str:
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', topic).strip('_') or 'topic'
+        return os.path.join(self.directory, f"{slug}.jsonl")
+
+    def _known_ids(self, topic: str) -> Set:
+        if topic not in self._ids:
+            ids = set()
+            for record in self.iter_items(topic):
+                ids.add((record['source'], record['id']))
+            self._ids[topic] = ids
+        return self._ids[topic]
+
+    def iter_items(self, topic: str, source: Optional[str] = None) -> Iterator[Dict]:
+        path = self._path(topic)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if source is None or record['source'] == source:
+                        yield record
+
+    def merge(self, topic: str, source: str, items: List[Dict], id_field: str = 'id') -> List[Dict]:
+        """Append items not yet stored for topic and return them"""
+        with self._lock:
+            known = self._known_ids(topic)
+            new_items = []
+            for item in items:
+                key = (source, str(item.get(id_field)))
+                if item.get(id_field) is None or key in known:
+                    continue
+                known.add(key)
+                new_items.append(item)
+
+            if new_items:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self._path(topic), 'a', encoding='utf-8') as f:
+                    for item in new_items:
+                        f.write(json.dumps({'source': source, 'id': str(item.get(id_field)), 'item': item},
+                                           ensure_ascii=False) + '\n')
+
+            return new_items
+
+
+class IncrementalSource:
+    """How to ask one source for items newer than a watermark
+
+    fetch_since yields items created after the watermark and raises
+    IncompleteFetch, after the items it got, if it could not fetch them all.
+    """
+
+    def __init__(self, scraper: Any, fetch_since: Callable[[Any, str, int, int], Iterator[Dict]],
+                 timestamp_field: str, id_field: str = 'id'):
+        self.scraper = scraper
+        self.fetch_since = fetch_since
+        self.timestamp_field = timestamp_field
+        self.id_field = id_field
+
+    def fetch(self, topic: str, since: int, max_items: int) -> Iterator[Dict]:
+        return self.fetch_since(self.scraper, topic, since, max_items)
+
+    def timestamp(self, item: Dict) -> Optional[int]:
+        return to_epoch(item.get(self.timestamp_field))
+
+
+def default_sources() -> Dict[str, IncrementalSource]:
+    return {
+        'hackernews': IncrementalSource(
+            HackerNewsScraper(), lambda s, topic, since, n: s.iter_stories_since(topic, since, n), 'created_at_i'),
+        'reddit': IncrementalSource(
+            RedditScraper(), lambda s, topic, since, n: s.iter_posts_since(topic, since, max_items=n), 'created_utc'),
+        'stackoverflow': IncrementalSource(
+            StackOverflowScraper(), lambda s, topic, since, n: s.iter_questions_since(topic, since, max_items=n),
+            'creation_date'),
+        'arxiv': IncrementalSource(
+            ArXivScraper(), lambda s, topic, since, n: s.iter_papers_since(topic, since, n), 'published'),
+        'pypi': IncrementalSource(
+            PyPIScraper(), lambda s, topic, since, n: s.iter_packages_since(since, query=topic), 'published_at',
+            id_field='url'),
+    }
+
+
+class IncrementalResearcher:
+    """Polls sources for items newer than their watermarks and merges them into a corpus
+
+    The first poll of a (source, topic) pair looks back initial_window seconds;
+    later polls only transfer what was created since the previous one. Fetched
+    items are also upserted into `store` when one is given.
+
+    Sources page newest first, so a watermark only moves when a poll got
+    every item after it: a poll that failed part-way or hit max_items keeps
+    the old one, and the next poll asks for the same range again.
+    """
+
+    def __init__(self, watermarks: Optional[WatermarkStore] = None, corpus: Optional[CorpusStore] = None,
+                 sources: Optional[Dict[str, IncrementalSource]] = None, initial_window: int = 7 * 86400,
+                 max_items: int = 1000, store: Optional[ItemStore] = None):
+        self.watermarks = watermarks or WatermarkStore()
+        self.corpus = corpus or CorpusStore()
+        self.store = store
+        self.sources = sources or default_sources()
+        self.initial_window = initial_window
+        self.max_items = max_items
+
+    def poll_source(self, key: str, topic: str) -> List[Dict]:
+        """Fetch, store and return one source's new items for topic"""
+        with log_context(topic=topic, source=key):
+            return self._poll_source(key, topic)
+
+    def _poll_source(self, key: str, topic: str) -> List[Dict]:
+        source = self.sources[key]
+        since = self.watermarks.get(key, topic)
+        if since is None:
+            since = int(time.time()) - self.initial_window
+
+        items = []
+        complete = True
+        try:
+            for item in source.fetch(topic, since, self.max_items):
+                items.append(item)
+        except IncompleteFetch as e:
+            log.warning("%s: %s fetch stopped early, keeping the watermark: %s", key, topic, e)
+            complete = False
+        if len(items) >= self.max_items:
+            log.warning("%s: %s has %d or more new items, keeping the watermark; raise max_items to catch up",
+                        key, topic, self.max_items)
+            complete = False
+
+        new_items = self.corpus.merge(topic, key, items, source.id_field)
+        if self.store is not None:
+            self.store.upsert(key, items, topic)
+
+        stamps = [ts for ts in map(source.timestamp, items) if ts is not None]
+        if complete and stamps:
+            self.watermarks.advance(key, topic, max(stamps))
+
+        return new_items
+
+    def poll(self, topic: str, max_workers: int = 5) -> Dict[str, List[Dict]]:
+        """Poll every source for topic concurrently; returns new items by source"""
+        with log_context(run_id=current_run_id() or new_run_id(), topic=topic):
+            log.info("Polling %s", topic)
+            keys = list(self.sources)
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, self.poll_source, key, topic)
+                           for key in keys]
+                results = {key: future.result() for key, future in zip(keys, futures)}
+            self.watermarks.save()
+
+            for key, items in results.items():
+                log.info("%s: %d new", key, len(items))
+        return results
+
+    def poll_topics(self, topics: List[str], **kwargs) -> Dict[str, Dict[str, List[Dict]]]:
+        """Poll each topic in turn; every call starts with a fresh retry budget"""
+        get_retry_policy().budget.reset()
+        return {topic: self.poll(topic, **kwargs) for topic in topics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch only items created since the last run")
+    parser.add_argument('topics', nargs='+')
+    parser.add_argument('--state', default='.research_cache/watermarks.json', help="watermark file")
+    parser.add_argument('--corpus', default='.research_cache/corpus', help="directory of per-topic JSONL files")
+    parser.add_argument('--store', help="also upsert items into this ItemStore database")
+    parser.add_argument('--initial-days', type=float, default=7, help="look-back for a topic's first poll")
+    parser.add_argument('--interval', type=float, help="keep polling every INTERVAL minutes")
+    parser.add_argument('--json-logs', action='store_true', help="log one JSON object per line")
+    parser.add_argument('--quiet', action='store_true', help="log warnings and errors only")
+    args = parser.parse_args()
+    configure_logging(json_output=args.json_logs, quiet=args.quiet)
+
+    researcher = IncrementalResearcher(WatermarkStore(args.state), CorpusStore(args.corpus),
+                                       initial_window=int(args.initial_days * 86400),
+                                       store=ItemStore(args.store) if args.store else None)
+    while True:
+        researcher.poll_topics(args.topics)
+        if not args.interval:
+            break
+        time.sleep(args.interval * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from records import as_dict
+
+
+# Candidate keys for each normalized column, in order of preference. The
+# scrapers name the same concept differently (HN points, GitHub stars, Dev.to
+# positive_reactions ...), so the first key present on an item wins.
+ID_FIELDS = ('id', 'full_name', 'name', 'url')
+TITLE_FIELDS = ('title', 'full_name', 'name')
+URL_FIELDS = ('url', 'link', 'hn_url', 'permalink')
+AUTHOR_FIELDS = ('author', 'owner', 'authors', 'publisher')
+SCORE_FIELDS = ('points', 'score', 'stars', 'positive_reactions', 'likes', 'score_final', 'downloads')
+COMMENT_FIELDS = ('comments', 'num_comments', 'comments_count', 'answer_count')
+TIME_FIELDS = ('created_at_i', 'created_utc', 'creation_date', 'published', 'published_at', 'created_at', 'date')
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """Epoch seconds from an int, an ISO 8601 string or an RFC 2822 date
+
+    Scrapers store their own stamps as epoch ints and pass on the sites'
+    ISO 8601 and RFC 2822 dates. Naive ISO strings are read as local time,
+    the form exporters.format_timestamps writes epoch fields in.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+    except ValueError:
+        pass
+    try:
+        return int(parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def _first(item: Dict, fields: Iterable[str]) -> Any:
+    for field in fields:
+        value = item.get(field)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def normalize_item(source: str, item: Dict) -> Dict:
+    """The indexed columns for one scraped item"""
+    url = _first(item, URL_FIELDS)
+    domain = item.get('domain') or (urlparse(url).netloc if isinstance(url, str) else '')
+    if domain.startswith('www.'):
+        domain = domain[4:]
+
+    author = _first(item, AUTHOR_FIELDS)
+    if isinstance(author, list):
+        author = author[0] if author else None
+
+    score = _first(item, SCORE_FIELDS)
+    comments = _first(item, COMMENT_FIELDS)
+    if isinstance(comments, list):
+        comments = len(comments)
+
+    item_id = _first(item, ID_FIELDS)
+
+    return {
+        'source': source,
+        'id': str(item_id) if item_id is not None else None,
+        'title': _first(item, TITLE_FIELDS),
+        'url': url,
+        'domain': domain or None,
+        'author': author,
+        'score': score if isinstance(score, (int, float)) else None,
+        'comments': comments if isinstance(comments, int) else None,
+        'created_at': to_epoch(_first(item, TIME_FIELDS)),
+        'scraped_at': to_epoch(item.get('scraped_at')) or int(time.time()),
+    }
+
+
+def iter_research_items(research: Dict) -> Iterator[Tuple[str, List[Dict]]]:
+    """(source, items) for each item list in a research_topic result
+
+    Sources that return several lists (e.g. Hugging Face models and datasets)
+    are named "<source>.<list>", e.g. huggingface.models.
+    """
+    for key, value in research.get('sources', {}).items():
+        if isinstance(value, list):
+            yield key, value
+        elif isinstance(value, dict):
+            lists = {name: items for name, items in value.items() if isinstance(items, list)}
+            for name, items in lists.items():
+                yield key if len(lists) == 1 else f"{key}.{name}", items
+
+
+class ItemStore:
+    """Local corpus of scraped items in a single SQLite file
+
+    Items are keyed by (source, id) and upserted, so re-scraping an item
+    refreshes its score and payload instead of duplicating it. The columns
+    used by the query methods are normalized across sources and indexed; the
+    original item is kept as JSON alongside them.
+    """
+
+    def __init__(self, path: str = '.research_cache/items.sqlite3'):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS items (
+                source TEXT NOT NULL,
+                id TEXT NOT NULL,
+                title TEXT,
+                url TEXT,
+                domain TEXT,
+                author TEXT,
+                score REAL,
+                comments INTEGER,
+                created_at INTEGER,
+                first_seen INTEGER NOT NULL,
+                scraped_at INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (source, id)
+            );
+            CREATE TABLE IF NOT EXISTS item_topics (
+                topic TEXT NOT NULL,
+                source TEXT NOT NULL,
+                id TEXT NOT NULL,
+                PRIMARY KEY (topic, source, id)
+            );
+            CREATE INDEX IF NOT EXISTS items_created_at ON items (created_at);
+            CREATE INDEX IF NOT EXISTS items_score ON items (score);
+            CREATE INDEX IF NOT EXISTS items_domain ON items (domain, created_at);
+            CREATE INDEX IF NOT EXISTS items_author ON items (author, created_at);
+            CREATE INDEX IF NOT EXISTS item_topics_item ON item_topics (source, id);
+        ''')
+        self._conn.commit()
+
+    def upsert(self, source: str, items: Iterable[Dict], topic: Optional[str] = None) -> int:
+        """Insert or refresh items from one source; returns how many were new"""
+        now = int(time.time())
+        rows = []
+        for item in map(as_dict, items):
+            row = normalize_item(source, item)
+            if row['id'] is None:
+                continue
+            rows.append({**row, 'first_seen': now, 'data': json.dumps(item, ensure_ascii=False, default=str)})
+
+        with self._lock:
+            # Refresh the items we already have, then add the rest; the insert's
+            # change count is the number of new items
+            self._conn.executemany('''
+                UPDATE items SET title = :title, url = :url, domain = :domain, author = :author,
+                                 score = :score, comments = :comments,
+                                 created_at = COALESCE(:created_at, created_at),
+                                 scraped_at = :scraped_at, data = :data
+                WHERE source = :source AND id = :id
+            ''', rows)
+            before = self._conn.total_changes
+            self._conn.executemany('''
+                INSERT OR IGNORE INTO items (source, id, title, url, domain, author, score, comments,
+                                             created_at, first_seen, scraped_at, data)
+                VALUES (:source, :id, :title, :url, :domain, :author, :score, :comments,
+                        :created_at, :first_seen, :scraped_at, :data)
+            ''', rows)
+            added = self._conn.total_changes - before
+            if topic is not None:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO item_topics (topic, source, id) VALUES (?, ?, ?)',
+                    [(topic, row['source'], row['id']) for row in rows]
+                )
+            self._conn.commit()
+
+        return added
+
+    def add_research(self, research: Dict) -> int:
+        """Upsert every item list in a ResearchAggregator.research_topic result"""
+        topic = research.get('topic')
+        return sum(self.upsert(source, items, topic) for source, items in iter_research_items(research))
+
+    def _query(self, where: List[str], args: List, order: str, limit: int, topic: Optional[str] = None) -> List[Dict]:
+        sql = 'SELECT items.source, items.data FROM items'
+        if topic is not None:
+            sql += ' JOIN item_topics t ON t.source = items.source AND t.id = items.id'
+            where = where + ['t.topic = ?']
+            args = args + [topic]
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f' ORDER BY {order} LIMIT ?'
+
+        with self._lock:
+            rows = self._conn.execute(sql, args + [limit]).fetchall()
+
+        results = []
+        for source, data in rows:
+            item = json.loads(data)
+            item.setdefault('source', source)
+            results.append(item)
+        return results
+
+    @staticmethod
+    def _window(since: Optional[int], until: Optional[int]):
+        where, args = [], []
+        if since is not None:
+            where.append('items.created_at >= ?')
+            args.append(since)
+        if until is not None:
+            where.append('items.created_at < ?')
+            args.append(until)
+        return where, args
+
+    def top_by_score(self, topic: Optional[str] = None, source: Optional[str] = None,
+                     since: Optional[int] = None, until: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """Highest scoring items, optionally within a created_at window (epoch seconds)"""
+        where, args = self._window(since, until)
+        where.append('items.score IS NOT NULL')
+        if source is not None:
+            where.append('items.source = ?')
+            args.append(source)
+        return self._query(where, args, 'items.score DESC', limit, topic)
+
+    def by_domain(self, domain: str, topic: Optional[str] = None, since: Optional[int] = None,
+                  until: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        """Newest items linking to domain (without a leading www.)"""
+        where, args = self._window(since, until)
+        where.append('items.domain = ?')
+        args.append(domain[4:] if domain.startswith('www.') else domain)
+        return self._query(where, args, 'items.created_at DESC', limit, topic)
+
+    def by_author(self, author: str, source: Optional[str] = None, since: Optional[int] = None,
+                  until: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        """Newest items by author, across sources unless one is given"""
+        where, args = self._window(since, until)
+        where.append('items.author = ?')
+        args.append(author)
+        if source is not None:
+            where.append('items.source = ?')
+            args.append(source)
+        return self._query(where, args, 'items.created_at DESC', limit)
+
+    def top_domains(self, topic: Optional[str] = None, since: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """Domains with the most items, with their item count and mean score"""
+        sql = 'SELECT items.domain, COUNT(*), AVG(items.score) FROM items'
+        where, args = self._window(since, None)
+        where.append('items.domain IS NOT NULL')
+        if topic is not None:
+            sql += ' JOIN item_topics t ON t.source = items.source AND t.id = items.id'
+            where.append('t.topic = ?')
+            args.append(topic)
+        sql += ' WHERE ' + ' AND '.join(where) + ' GROUP BY items.domain ORDER BY COUNT(*) DESC LIMIT ?'
+
+        with self._lock:
+            rows = self._conn.execute(sql, args + [limit]).fetchall()
+        return [{'domain': domain, 'items': count, 'avg_score': avg} for domain, count, avg in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            items = self._conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+            by_source = dict(self._conn.execute('SELECT source, COUNT(*) FROM items GROUP BY source').fetchall())
+            topics = self._conn.execute('SELECT COUNT(DISTINCT topic) FROM item_topics').fetchone()[0]
+        return {'items': items, 'topics': topics, 'by_source': by_source}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
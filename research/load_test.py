@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+from http_cache import disable_cache
+from logs import configure_logging
+from memo import get_memo_cache
+from metrics import get_metrics
+from mock_server import LatencyModel, MockServer
+from rate_limit import HostRateLimiter, set_rate_limiter
+from transport import configure_transport
+
+
+def run_load(server: MockServer, topics: List[str], workers: int, get_comments: bool) -> Dict:
+    """Research every topic with `workers` concurrent sources against the mock server"""
+    from enhanced_scraper import ResearchAggregator
+
+    # Fresh client state per run: cold caches and limiters, no open breakers
+    get_memo_cache().clear()
+    get_metrics().reset()
+    set_rate_limiter(HostRateLimiter())
+    before = server.stats()
+
+    aggregator = ResearchAggregator(max_workers=workers, breaker_threshold=1_000_000)
+    start = time.perf_counter()
+    aggregator.multi_topic_research(topics, concurrent=True, get_comments=get_comments)
+    elapsed = time.perf_counter() - start
+
+    after = server.stats()
+    requests_sent = after['requests'] - before['requests']
+    sources = get_metrics().summary('research_source_seconds').get('research_source_seconds', [])
+    p95 = max((row['p95'] for row in sources), default=0.0)
+    return {
+        'workers': workers,
+        'seconds': elapsed,
+        'topics_per_min': len(topics) / elapsed * 60 if elapsed else 0.0,
+        'requests_per_s': requests_sent / elapsed if elapsed else 0.0,
+        'requests': requests_sent,
+        'throttled': after['throttled'] - before['throttled'],
+        'not_found': after['not_found'] - before['not_found'],
+        'source_p95': p95,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure aggregator throughput against the local mock server")
+    parser.add_argument('topics', nargs='*', help="topics (default: the ones the cassette was recorded for)")
+    parser.add_argument('--cassette', default='fixtures/cassettes', help="directory of recorded responses")
+    parser.add_argument('--workers', default='1,4,8,16', help="comma-separated max_workers values to compare")
+    parser.add_argument('--latency-median', type=float, default=0.1, help="median response delay in seconds")
+    parser.add_argument('--latency-p99', type=float, default=1.0, help="99th percentile response delay in seconds")
+    parser.add_argument('--no-limits', action='store_true', help="do not enforce the upstream hosts' rate limits")
+    parser.add_argument('--throttle', type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument('--body-rate', type=float, help="send bodies at this many bytes per second")
+    parser.add_argument('--no-comments', action='store_true', help="skip the comment fetches of HN and Reddit")
+    parser.add_argument('--save', help="write the results as JSON")
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    disable_cache()
+
+    topics = args.topics
+    if not topics:
+        try:
+            with open(os.path.join(args.cassette, 'topics.json'), encoding='utf-8') as f:
+                topics = json.load(f)
+        except FileNotFoundError:
+            sys.exit(f"No topics given and no recording in {args.cassette}/; "
+                     f"record one first, e.g.: python bench_pipeline.py --record rust")
+
+    server = MockServer(args.cassette, latency=LatencyModel(args.latency_median, args.latency_p99),
+                        enforce_limits=not args.no_limits, throttle_rate=args.throttle, body_rate=args.body_rate)
+    results = []
+    with server:
+        configure_transport(routes=server.routes())
+        print(f"{len(server.index.entries)} recordings on {server.base_url} | {len(topics)} topics | "
+              f"latency p50 {args.latency_median * 1000:.0f} ms, p99 {args.latency_p99 * 1000:.0f} ms\n")
+        print(f"{'workers':>7} {'seconds':>9} {'topics/min':>11} {'req/s':>8} {'429s':>6} {'source p95':>11}")
+        print('-' * 57)
+        for workers in (int(w) for w in args.workers.split(',')):
+            row = run_load(server, topics, workers, not args.no_comments)
+            results.append(row)
+            print(f"{workers:>7} {row['seconds']:>9.2f} {row['topics_per_min']:>11.1f} "
+                  f"{row['requests_per_s']:>8.1f} {row['throttled']:>6} {row['source_p95']:>10.2f}s")
+
+    missing = sum(row['not_found'] for row in results)
+    if missing:
+        print(f"\n{missing} requests had no recording for their host and path")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import contextlib
+import contextvars
+import json
+import logging
+import sys
+import time
+import uuid
+from typing import Iterator, Optional, TextIO
+
+
+# Loggers are named research.<source> (research.hackernews, research.github ...)
+# plus research.aggregator and research.incremental for the orchestration code
+ROOT_LOGGER = 'research'
+
+_run_id = contextvars.ContextVar('run_id', default=None)
+_topic = contextvars.ContextVar('topic', default=None)
+_source = contextvars.ContextVar('source', default=None)
+_CONTEXT_VARS = {'run_id': _run_id, 'topic': _topic, 'source': _source}
+
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def current_run_id() -> Optional[str]:
+    return _run_id.get()
+
+
+@contextlib.contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """Tag log records emitted inside the block with run_id, topic and/or source
+
+    The values live in context variables: they follow the code into asyncio
+    tasks, and into worker threads started with contextvars.copy_context().run.
+    """
+    tokens = [(_CONTEXT_VARS[name], _CONTEXT_VARS[name].set(value)) for name, value in fields.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies run_id, topic and source onto each record
+
+    source falls back to the last part of the logger name, so records from a
+    scraper used outside the aggregator are still attributed.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = _run_id.get()
+        record.topic = _topic.get()
+        record.source = _source.get() or record.name.rpartition('.')[2]
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, context and exception"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'run_id': getattr(record, 'run_id', None),
+            'topic': getattr(record, 'topic', None),
+            'source': getattr(record, 'source', None),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s [%(source)s] %(message)s'
+
+
+def configure_logging(level: str = 'INFO', json_output: bool = False, quiet: bool = False,
+                      stream: Optional[TextIO] = None) -> logging.Handler:
+    """Send the research loggers to stream (stderr by default)
+
+    As a library the package logs nothing until this is called. quiet keeps
+    warnings and errors only; json_output writes one JSON object per line.
+    Calling it again replaces the previous handler.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if getattr(handler, '_research_handler', False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler._research_handler = True
+    handler.addFilter(ContextFilter())
+    handler.setFormatter(JSONFormatter() if json_output else logging.Formatter(TEXT_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING if quiet else (level.upper() if isinstance(level, str) else level))
+    logger.propagate = False
+    return handler
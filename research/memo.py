@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class MemoCache:
+    """Bounded in-process cache of parsed scraper results with LRU and TTL eviction"""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+_default_memo = MemoCache()
+
+
+def get_memo_cache() -> MemoCache:
+    return _default_memo
+
+
+def memoized(key: Optional[Callable[..., Hashable]] = None, ttl: Optional[float] = None):
+    """Cache a scraper method's result in the shared MemoCache
+
+    Entries are keyed by (method, instance, args). The instance part is the
+    scraper's memo_fingerprint() if it has one (its endpoints, API mode and
+    credentials), so differently configured scrapers keep separate entries.
+    `key` can derive the args part from the call instead. Empty results,
+    which the scrapers return on errors, are not cached. Pass use_cache=False
+    to a decorated method to bypass the cache for that call. Cached values are
+    shared between callers and should be treated as read-only.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, use_cache: bool = True, **kwargs):
+            if not use_cache:
+                return func(self, *args, **kwargs)
+
+            try:
+                call_key = key(self, *args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+                fingerprint = getattr(self, 'memo_fingerprint', None)
+                cache_key = (func.__qualname__, fingerprint() if fingerprint else None, call_key)
+                hash(cache_key)
+            except Exception:
+                return func(self, *args, **kwargs)
+
+            if call_key is None:
+                return func(self, *args, **kwargs)
+
+            cache = get_memo_cache()
+            value = cache.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            value = func(self, *args, **kwargs)
+            if value:
+                cache.set(cache_key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
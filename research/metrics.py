@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+import contextvars
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Summary:
+    """Count, sum and quantiles of one metric's observations for one label set
+
+    Quantiles are computed over the most recent max_samples observations.
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.count = 0
+        self.sum = 0.0
+        self._samples = deque(maxlen=max_samples)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self._samples.append(value)
+
+    def quantiles(self, quantiles=QUANTILES) -> Dict[float, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {q: 0.0 for q in quantiles}
+        # Nearest-rank: the smallest sample with at least q of the samples at or below it
+        return {q: samples[max(0, math.ceil(q * len(samples)) - 1)] for q in quantiles}
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters and summaries, keyed by metric name and labels"""
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self._summaries = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = Summary(self.max_samples)
+            summary.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._summaries.clear()
+            self._counters.clear()
+
+    def summary(self, name: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """{metric: [{labels..., count, sum, p50, p95, p99}, ...]} for every summary, or just `name`"""
+        with self._lock:
+            items = [(key, s.count, s.sum, s.quantiles()) for key, s in self._summaries.items()
+                     if name is None or key[0] == name]
+        result = {}
+        for (metric, labels), count, total, quantiles in sorted(items, key=lambda item: item[0]):
+            row = dict(labels)
+            row.update(count=count, sum=total, **{f"p{int(q * 100)}": v for q, v in quantiles.items()})
+            result.setdefault(metric, []).append(row)
+        return result
+
+    def counters(self, name: Optional[str] = None) -> Dict[str, List[Dict]]:
+        with self._lock:
+            items = [(key, value) for key, value in self._counters.items() if name is None or key[0] == name]
+        result = {}
+        for (metric, labels), value in sorted(items):
+            result.setdefault(metric, []).append(dict(labels, value=value))
+        return result
+
+    def totals(self, name: str, by: str = 'source') -> List[Tuple[str, float, int]]:
+        """(label value, summed observations, count) for one summary, largest sum first
+
+        totals('scraper_call_seconds') shows which scraper dominates run time.
+        """
+        totals = {}
+        with self._lock:
+            for (metric, labels), summary in self._summaries.items():
+                if metric != name:
+                    continue
+                value = dict(labels).get(by, '')
+                total, count = totals.get(value, (0.0, 0))
+                totals[value] = (total + summary.sum, count + summary.count)
+        return sorted(((value, total, count) for value, (total, count) in totals.items()),
+                      key=lambda row: row[1], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric, rows in self.counters().items():
+            lines.append(f"# TYPE {metric} counter")
+            for row in rows:
+                value = row.pop('value')
+                lines.append(f"{metric}{_labels(row)} {value}")
+        for metric, rows in self.summary().items():
+            lines.append(f"# TYPE {metric} summary")
+            for row in rows:
+                count, total = row.pop('count'), row.pop('sum')
+                values = [(q, row.pop(f"p{int(q * 100)}")) for q in QUANTILES]
+                for q, value in values:
+                    lines.append(f"{metric}{_labels(dict(row, quantile=q))} {value}")
+                lines.append(f"{metric}_sum{_labels(row)} {total}")
+                lines.append(f"{metric}_count{_labels(row)} {count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """Write to_prometheus() to path atomically, e.g. for node_exporter's textfile collector"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _labels(labels: Dict) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+_default_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _default_registry
+
+
+class CallStats:
+    """Time spent on the network and waiting for the rate limiter during one scraper call"""
+
+    __slots__ = ('source', 'method', 'network', 'waiting')
+
+    def __init__(self, source: str, method: str):
+        self.source = source
+        self.method = method
+        self.network = 0.0
+        self.waiting = 0.0
+
+
+_current_call = contextvars.ContextVar('scraper_call', default=None)
+
+
+def current_call() -> Optional[CallStats]:
+    """The outermost instrumented scraper call running in this context, if any"""
+    return _current_call.get()
+
+
+def _record_call(call: CallStats, elapsed: float, items: Optional[int]):
+    metrics = get_metrics()
+    labels = {'source': call.source, 'method': call.method}
+    metrics.observe('scraper_call_seconds', elapsed, **labels)
+    # What is left after the network and rate limit waits is parsing and bookkeeping
+    metrics.observe('scraper_parse_seconds', max(0.0, elapsed - call.network - call.waiting), **labels)
+    if items is not None:
+        metrics.observe('scraper_items', items, **labels)
+
+
+def _count(result: Any) -> Optional[int]:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1 if result else 0
+    return 0 if result is None else None
+
+
+def instrumented(func: Callable) -> Callable:
+    """Record duration, parse time and item count of a scraper method, tagged by class and method
+
+    Only the outermost instrumented call is recorded; calls it makes to other
+    instrumented methods, and the requests they send, are attributed to it.
+    Generator methods are timed while they produce items, not while the
+    consumer handles them.
+    """
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            if _current_call.get() is not None:
+                yield from func(self, *args, **kwargs)
+                return
+
+            call = CallStats(type(self).__name__, func.__name__)
+            generator = func(self, *args, **kwargs)
+            elapsed = 0.0
+            items = 0
+            try:
+                while True:
+                    token = _current_call.set(call)
+                    start = time.perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - start
+                        _current_call.reset(token)
+                    items += 1
+                    yield item
+            finally:
+                generator.close()
+                _record_call(call, elapsed, items)
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _current_call.get() is not None:
+            return func(self, *args, **kwargs)
+
+        call = CallStats(type(self).__name__, func.__name__)
+        token = _current_call.set(call)
+        start = time.perf_counter()
+        result = None
+        try:
+            result = func(self, *args, **kwargs)
+            return result
+        finally:
+            _current_call.reset(token)
+            _record_call(call, time.perf_counter() - start, _count(result))
+
+    return wrapper
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+import argparse
+import base64
+import glob
+import json
+import math
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from rate_limit import DEFAULT_HOST_LIMITS
+from endpoints import get_endpoints
+from replay import Cassette
+
+
+class RecordingIndex:
+    """The responses of a cassette directory (see replay), looked up by request
+
+    A request without an exact recording gets the first recording for the
+    same method, host and path, so a load test can use any topic once one
+    topic has been recorded.
+    """
+
+    def __init__(self, directory: str):
+        self.cassette = Cassette(directory, mode='replay')
+        self.entries = {}
+        self.by_path = {}
+        for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            if not isinstance(entry, dict) or 'url' not in entry:
+                continue
+            key = os.path.splitext(os.path.basename(path))[0]
+            self.entries[key] = entry
+            parts = urlsplit(entry['url'])
+            self.by_path.setdefault((entry['method'], parts.scheme, parts.netloc, parts.path), entry)
+
+    def origins(self) -> List[str]:
+        return sorted({f"{scheme}://{netloc}" for method, scheme, netloc, path in self.by_path})
+
+    def find(self, method: str, url: str, body: bytes = b'') -> Optional[Dict]:
+        request = requests.Request(method, url, data=body or None).prepare()
+        entry = self.entries.get(self.cassette.make_key(request))
+        if entry is None:
+            parts = urlsplit(url)
+            entry = self.by_path.get((method, parts.scheme, parts.netloc, parts.path))
+        return entry
+
+
+class LatencyModel:
+    """Log-normal response delays with the given median and 99th percentile, in seconds"""
+
+    def __init__(self, median: float = 0.0, p99: Optional[float] = None, seed: int = 0):
+        self.median = median
+        self.sigma = math.log(p99 / median) / 2.326 if median > 0 and p99 and p99 > median else 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self.median <= 0:
+            return 0.0
+        if not self.sigma:
+            return self.median
+        with self._lock:
+            return self._random.lognormvariate(math.log(self.median), self.sigma)
+
+
+class HostLimits:
+    """Server-side token buckets per upstream host; over-limit requests get a 429"""
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]]):
+        self.limits = {host.lower(): limit for host, limit in limits.items()}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def check(self, host: str) -> float:
+        """0 if a request to host may go through now, else the seconds until it may"""
+        limit = self.limits.get(host.lower())
+        if limit is None:
+            return 0.0
+        rate, burst = limit
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(host, (float(burst), now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[host] = (tokens - 1, now)
+                return 0.0
+            self._buckets[host] = (tokens, now)
+            return (1 - tokens) / rate
+
+
+class MockServer:
+    """Local stand-in for the upstream sites, serving recorded responses
+
+    Requests arrive as /<scheme>/<host>/<path>?<query>; routes() maps each
+    recorded origin there, for Transport(routes=...). Responses are delayed
+    by `latency`; requests beyond the upstream hosts' published rate limits
+    (rate_limit.DEFAULT_HOST_LIMITS, overridden by rate_limits) or picked at
+    random with probability throttle_rate get a 429 with Retry-After; with
+    body_rate set, bodies are sent at that many bytes per second.
+    """
+
+    def __init__(self, directory: str, host: str = '127.0.0.1', port: int = 0,
+                 latency: Optional[LatencyModel] = None, rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 enforce_limits: bool = True, throttle_rate: float = 0.0, retry_after: int = 1,
+                 body_rate: Optional[float] = None, seed: int = 0):
+        self.index = RecordingIndex(directory)
+        self.latency = latency or LatencyModel()
+        limits = dict(DEFAULT_HOST_LIMITS) if enforce_limits else {}
+        limits.update(rate_limits or {})
+        self.limits = HostLimits(limits)
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.body_rate = body_rate
+        self.counts = {'requests': 0, 'served': 0, 'throttled': 0, 'not_found': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def routes(self, origins: Optional[List[str]] = None) -> Dict[str, str]:
+        """{origin: base} sending each origin to this server
+
+        By default that is every origin in the endpoint registry plus any
+        other recorded one, so nothing reaches the real sites.
+        """
+        routes = {}
+        for origin in origins or sorted(set(get_endpoints().origins()) | set(self.index.origins())):
+            parts = urlsplit(origin)
+            routes[origin] = f"{self.base_url}/{parts.scheme}/{parts.netloc}"
+        return routes
+
+    def endpoints(self) -> Dict[str, str]:
+        """Endpoint registry overrides pointing every endpoint at this server
+
+        Unlike routes(), these change the URLs the scrapers request, so the
+        client's per-host rate limits no longer tell the sites apart.
+        """
+        overrides = {}
+        for name, url in get_endpoints().all().items():
+            parts = urlsplit(url)
+            overrides[name] = f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path}"
+        return overrides
+
+    def start(self) -> 'MockServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def throttled(self, host: str) -> Optional[int]:
+        """Retry-After seconds if this request should be answered with a 429"""
+        wait = self.limits.check(host)
+        if wait > 0:
+            return max(1, math.ceil(wait))
+        if self.throttle_rate:
+            with self._lock:
+                if self._random.random() < self.throttle_rate:
+                    return self.retry_after
+        return None
+
+
+def _make_handler(server: MockServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self._handle()
+
+        def do_POST(self):
+            self._handle()
+
+        def _handle(self):
+            server._count('requests')
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+
+            scheme, _, rest = self.path.lstrip('/').partition('/')
+            host, slash, path = rest.partition('/')
+            if scheme not in ('http', 'https') or not host:
+                return self._reply(404, {}, b'Expected /<scheme>/<host>/<path>')
+
+            retry_after = server.throttled(host.split(':')[0])
+            if retry_after is not None:
+                server._count('throttled')
+                return self._reply(429, {'Retry-After': str(retry_after)}, b'Too Many Requests')
+
+            delay = server.latency.sample()
+            if delay:
+                time.sleep(delay)
+
+            entry = server.index.find(self.command, f"{scheme}://{host}/{path}", body)
+            if entry is None:
+                server._count('not_found')
+                return self._reply(404, {}, b'No recording')
+
+            server._count('served')
+            payload = entry['body']
+            content = base64.b64decode(payload) if entry.get('encoding') == 'base64' else payload.encode('utf-8')
+            self._reply(entry['status'], entry['headers'], content)
+
+        def _reply(self, status: int, headers: Dict[str, str], content: bytes):
+            self.send_response(status)
+            for name, value in headers.items():
+                if name.lower() not in ('content-length', 'connection', 'date', 'server'):
+                    self.send_header(name, value)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+
+            if not server.body_rate:
+                self.wfile.write(content)
+                return
+            # Dribble the body out in 10 chunks per second
+            chunk = max(1, int(server.body_rate / 10))
+            for start in range(0, len(content), chunk):
+                self.wfile.write(content[start:start + chunk])
+                self.wfile.flush()
+                time.sleep(0.1)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded responses as a local stand-in for the upstream sites")
+    parser.add_argument('cassette', nargs='?', default='fixtures/cassettes', help="directory of recorded responses")
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency-median', type=float, default=0.05, help="median response delay in seconds")
+    parser.add_argument('--latency-p99', type=float, default=0.5, help="99th percentile response delay in seconds")
+    parser.add_argument('--no-limits', action='store_true', help="do not enforce the upstream hosts' rate limits")
+    parser.add_argument('--throttle', type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument('--body-rate', type=float, help="send bodies at this many bytes per second")
+    args = parser.parse_args()
+
+    server = MockServer(args.cassette, port=args.port,
+                        latency=LatencyModel(args.latency_median, args.latency_p99),
+                        enforce_limits=not args.no_limits, throttle_rate=args.throttle, body_rate=args.body_rate)
+    print(f"Serving {len(server.index.entries)} recordings on {server.base_url}")
+    print("Routes for configure_transport(routes=...):")
+    print(json.dumps(server.routes(), indent=2))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats()))
+
+
+if __name__ == "__main__":
+    main()
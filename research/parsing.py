@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import os
+from functools import lru_cache
+from typing import List
+from bs4 import BeautifulSoup, FeatureNotFound
+
+
+# BeautifulSoup tree builders, fastest first. html.parser ships with Python
+# and is always available; lxml is a C parser and typically several times
+# faster on large pages. html5lib is slower than both and is only used when
+# asked for explicitly.
+HTML_PARSERS = ('lxml', 'html.parser')
+
+
+@lru_cache(maxsize=None)
+def parser_available(name: str) -> bool:
+    try:
+        BeautifulSoup('<p></p>', name)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+def available_parsers() -> List[str]:
+    return [name for name in HTML_PARSERS + ('html5lib',) if parser_available(name)]
+
+
+def default_html_parser() -> str:
+    """Parser used by WebScraper.parse_html
+
+    RESEARCH_HTML_PARSER picks a specific backend; otherwise the fastest
+    installed one is used, falling back to the pure-Python html.parser.
+    """
+    requested = os.environ.get('RESEARCH_HTML_PARSER')
+    if requested:
+        if not parser_available(requested):
+            raise FeatureNotFound(f"RESEARCH_HTML_PARSER={requested} is not installed")
+        return requested
+
+    for name in HTML_PARSERS:
+        if parser_available(name):
+            return name
+    return 'html.parser'
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+import contextlib
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from typing import Iterator, List, Optional, Tuple
+
+
+# Work inside a source is attributed to the 'parse' phase unless it happens
+# while a request is being sent (ScraperAdapter.send), which is 'fetch':
+# waiting for the rate limiter, the cache lookup and the HTTP transfer.
+PHASES = ('fetch', 'parse')
+
+_active = contextvars.ContextVar('profiled_source', default=None)
+
+
+def fetch_phase():
+    """Attribute the enclosed block to the fetch phase of the source being profiled, if any"""
+    active = _active.get()
+    if active is None:
+        return contextlib.nullcontext()
+    profiler, key = active
+    return profiler.phase(key, 'fetch')
+
+
+class Profiler:
+    """Collects per-source profiles; subclasses decide how
+
+    Wrap the work of one source in `with profiler.source(key):`. Requests it
+    sends switch to the fetch phase on their own, so the profiles separate
+    network time from parsing without touching the scrapers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def source(self, key: str) -> Iterator[None]:
+        token = _active.set((self, key))
+        try:
+            with self.phase(key, 'parse'):
+                yield
+        finally:
+            _active.reset(token)
+
+    def phase(self, key: str, phase: str):
+        raise NotImplementedError
+
+    def stop(self):
+        """Stop any background work; the profiles collected so far are kept"""
+
+    def write(self, directory: str) -> List[str]:
+        """Write the profiles collected so far into directory; returns the files written"""
+        raise NotImplementedError
+
+
+class CProfileProfiler(Profiler):
+    """Deterministic profiles, one cProfile.Profile per (source, phase)
+
+    write() produces <source>.<phase>.prof files (for pstats, snakeviz ...)
+    and a summary.txt with the functions taking the most time in each.
+
+    cProfile follows only the thread that enabled it. On Python 3.12+ only
+    one profiler may be active in the whole process, so sources that start
+    while another one is being profiled are skipped; run sources one after
+    another (concurrent=False) there, or use the sampling profiler.
+    """
+
+    def __init__(self, top: int = 25):
+        super().__init__()
+        self.top = top
+        self.skipped = 0
+        self._profiles = {}
+        self._local = threading.local()
+
+    def _profile(self, key: str, phase: str) -> cProfile.Profile:
+        with self._lock:
+            profile = self._profiles.get((key, phase))
+            if profile is None:
+                profile = self._profiles[(key, phase)] = cProfile.Profile()
+            return profile
+
+    @contextlib.contextmanager
+    def phase(self, key: str, phase: str) -> Iterator[None]:
+        outer = getattr(self._local, 'profile', None)
+        if outer is not None:
+            outer.disable()
+        profile = self._profile(key, phase)
+        try:
+            profile.enable()
+        except ValueError:  # Another profiler is active (Python 3.12+)
+            profile = None
+            with self._lock:
+                self.skipped += 1
+
+        self._local.profile = profile
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._local.profile = outer
+            if outer is not None:
+                outer.enable()
+
+    def write(self, directory: str) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            profiles = sorted(self._profiles.items())
+
+        paths = []
+        report = io.StringIO()
+        for (key, phase), profile in profiles:
+            path = os.path.join(directory, f"{key}.{phase}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+            try:
+                stats = pstats.Stats(profile, stream=report)
+            except TypeError:  # Nothing was recorded
+                continue
+            report.write(f"==== {key} ({phase}) ====\n")
+            stats.sort_stats('tottime').print_stats(self.top)
+
+        summary_path = os.path.join(directory, 'summary.txt')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        paths.append(summary_path)
+        return paths
+
+
+class SamplingProfiler(Profiler):
+    """Statistical profiler: a background thread samples the stacks of the
+    threads currently working on a source every `interval` seconds
+
+    Overhead is low enough to leave on for real runs, and concurrent sources
+    are profiled at the same time. write() produces collapsed stacks
+    ("frame;frame;frame count" lines, as consumed by flamegraph.pl,
+    speedscope or inferno): stacks.collapsed for all sources, with the source
+    and phase as the two root frames, and <source>.collapsed for each one.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__()
+        self.interval = interval
+        self.samples = 0
+        self._threads = {}
+        self._stacks = Counter()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @contextlib.contextmanager
+    def phase(self, key: str, phase: str) -> Iterator[None]:
+        self.start()
+        ident = threading.get_ident()
+        with self._lock:
+            outer = self._threads.get(ident)
+            self._threads[ident] = (key, phase)
+        try:
+            yield
+        finally:
+            with self._lock:
+                if outer is None:
+                    self._threads.pop(ident, None)
+                else:
+                    self._threads[ident] = outer
+
+    def start(self):
+        """Start the sampling thread; called on first use"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, (key, phase) in threads:
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                with self._lock:
+                    self._stacks[(key, phase) + tuple(stack)] += 1
+                    self.samples += 1
+
+    def collapsed(self, key: Optional[str] = None) -> List[Tuple[str, int]]:
+        """(collapsed stack, sample count) pairs, for one source or for all of them"""
+        with self._lock:
+            stacks = list(self._stacks.items())
+        if key is None:
+            lines = [(';'.join(stack), count) for stack, count in stacks]
+        else:
+            lines = [(';'.join(stack[1:]), count) for stack, count in stacks if stack[0] == key]
+        return sorted(lines)
+
+    def top_frames(self, key: Optional[str] = None, phase: Optional[str] = 'parse', limit: int = 20,
+                   inclusive: bool = True) -> List[Tuple[str, int]]:
+        """Functions found in the most samples, optionally for one source and phase
+
+        inclusive counts a function whenever it is on the stack (its own time
+        plus what it calls, e.g. HackerNewsScraper._parse_story_item);
+        otherwise only when it is the innermost frame.
+        """
+        with self._lock:
+            stacks = list(self._stacks.items())
+        counts = Counter()
+        for stack, count in stacks:
+            if (key is not None and stack[0] != key) or (phase is not None and stack[1] != phase):
+                continue
+            frames = stack[2:]
+            for frame in (set(frames) if inclusive else frames[-1:]):
+                counts[frame] += count
+        return counts.most_common(limit)
+
+    def write(self, directory: str) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            keys = sorted({stack[0] for stack in self._stacks})
+
+        paths = [_write_collapsed(os.path.join(directory, 'stacks.collapsed'), self.collapsed())]
+        for key in keys:
+            paths.append(_write_collapsed(os.path.join(directory, f"{key}.collapsed"), self.collapsed(key)))
+        return paths
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', code.co_name)
+    module = frame.f_globals.get('__name__', '?')
+    # ';' separates frames and ' ' the count in the collapsed format
+    return f"{module}.{name}".replace(';', ':').replace(' ', '_')
+
+
+def _write_collapsed(path: str, lines: List[Tuple[str, int]]) -> str:
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in lines:
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+PROFILERS = {'sampling': SamplingProfiler, 'cprofile': CProfileProfiler}
+
+
+def make_profiler(kind: str = 'sampling', **kwargs) -> Profiler:
+    if kind not in PROFILERS:
+        raise ValueError(f"Unknown profiler {kind!r}, expected one of {', '.join(PROFILERS)}")
+    return PROFILERS[kind](**kwargs)
+
+
+@contextlib.contextmanager
+def profile(directory: str, kind: str = 'sampling', **kwargs) -> Iterator[Profiler]:
+    """Profile scrapers outside the aggregator; the profiles are written to directory on exit
+
+        with profile('profiles') as profiler:
+            with profiler.source('hackernews'):
+                HackerNewsScraper().get_front_page()
+    """
+    profiler = make_profiler(kind, **kwargs)
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write(directory)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# Published limits for hosts we hit hard: (requests per second, burst)
+DEFAULT_HOST_LIMITS = {
+    'hn.algolia.com': (10000 / 3600, 10),      # 10,000 requests per hour per IP
+    'api.stackexchange.com': (25.0, 30),       # 30 requests per second per IP
+    'export.arxiv.org': (1 / 3, 1),            # one request every three seconds
+    'api.github.com': (10 / 60, 10),           # search API, unauthenticated
+    'hacker-news.firebaseio.com': (50.0, 50),  # no published limit; item-per-request API
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `burst`"""
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now and return how many seconds the caller must wait before using them
+
+        The balance may go negative, so concurrent callers queue up behind each
+        other instead of all waking at the same moment.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """Process-wide rate limiter with one token bucket per host
+
+    Limits set with configure() win over the per-scraper default rate that
+    callers pass to acquire(); hosts with neither are not limited. pause()
+    holds back every request to a host for a while, e.g. when the server
+    asks clients to back off.
+    """
+
+    def __init__(self, host_limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self._limits = dict(DEFAULT_HOST_LIMITS if host_limits is None else host_limits)
+        self._buckets = {}
+        self._paused_until = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, burst: float = 1):
+        """Set the sustained rate (requests/second) and burst size for a host"""
+        host = host.lower()
+        with self._lock:
+            self._limits[host] = (rate, burst)
+            self._buckets[host] = TokenBucket(rate, burst)
+
+    def _bucket(self, host: str, rate: Optional[float], burst: float) -> Optional[TokenBucket]:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                if host in self._limits:
+                    rate, burst = self._limits[host]
+                if not rate:
+                    return None
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def pause(self, url: str, seconds: float):
+        """Hold back requests to url's host for at least `seconds` from now"""
+        host = (urlparse(url).hostname or url).lower()
+        until = time.monotonic() + seconds
+        with self._lock:
+            if until > self._paused_until.get(host, 0.0):
+                self._paused_until[host] = until
+
+    def reserve(self, url: str, rate: Optional[float] = None, burst: float = 1) -> float:
+        host = (urlparse(url).hostname or url).lower()
+        with self._lock:
+            paused = self._paused_until.get(host, 0.0) - time.monotonic()
+        bucket = self._bucket(host, rate, burst)
+        wait = bucket.reserve() if bucket is not None else 0.0
+        return max(wait, paused)
+
+    def acquire(self, url: str, rate: Optional[float] = None, burst: float = 1):
+        """Block until a request to url's host may be sent
+
+        rate/burst are used for hosts without a configured limit.
+        """
+        wait = self.reserve(url, rate, burst)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str, rate: Optional[float] = None, burst: float = 1):
+        """Awaitable acquire() that yields to the event loop while waiting"""
+        wait = self.reserve(url, rate, burst)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_default_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    return _default_limiter
+
+
+def set_rate_limiter(limiter: HostRateLimiter):
+    """Use limiter for every scraper in this process; HostRateLimiter({}) only applies the scrapers' own delays"""
+    global _default_limiter
+    _default_limiter = limiter
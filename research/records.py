@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, Type
+
+
+_MISSING = object()
+
+
+class Record:
+    """Compact, slotted container for one scraped item
+
+    Subclasses declare their keys once with `__slots__ = FIELDS = (...)`, so an
+    instance stores values only instead of a per-item hash table of repeated
+    keys. Conversion is lossless: slots that were never set are left out of
+    to_dict(), and keys outside FIELDS are kept in _extra, so
+    Record.from_dict(d).to_dict() == d for any dict a scraper returns.
+    Strings in INTERNED fields (authors, languages, licenses ...) are
+    interned so repeated values share one object.
+    """
+
+    __slots__ = ('_extra',)
+    FIELDS = ()
+    INTERNED = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+        cls._interned_set = frozenset(cls.INTERNED)
+
+    def __init__(self, **fields):
+        self._extra = None
+        self._assign(fields)
+
+    def _assign(self, data: Dict):
+        for key, value in data.items():
+            if key in self._field_set:
+                if key in self._interned_set and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Record':
+        record = cls.__new__(cls)
+        record._extra = None
+        record._assign(data)
+        return record
+
+    def to_dict(self) -> Dict:
+        data = {}
+        for name in self.FIELDS:
+            try:
+                data[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    # Read-only mapping access, so code written against the dicts keeps working
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._field_set:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    # Only the keys that are set, as in to_dict(); json.dumps still needs to_dict()
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Story(Record):
+    """Hacker News story (front page or Algolia search)"""
+    __slots__ = FIELDS = ('id', 'title', 'url', 'domain', 'points', 'author', 'age', 'comments',
+                          'created_at', 'created_at_i', 'hn_url')
+    INTERNED = ('domain', 'author')
+
+
+class Post(Record):
+    """Reddit post"""
+    __slots__ = FIELDS = ('id', 'title', 'author', 'url', 'text', 'score', 'comments', 'subreddit',
+                          'created_utc', 'permalink')
+    INTERNED = ('author', 'subreddit')
+
+
+class Repo(Record):
+    """GitHub repository (trending page or search API)"""
+    __slots__ = FIELDS = ('owner', 'name', 'full_name', 'description', 'url', 'stars', 'forks', 'stars_today',
+                          'language', 'created_at', 'updated_at', 'topics', 'license', 'scraped_at')
+    INTERNED = ('owner', 'language', 'license')
+
+
+class Paper(Record):
+    """arXiv paper"""
+    __slots__ = FIELDS = ('id', 'title', 'summary', 'authors', 'published', 'updated', 'categories',
+                          'pdf_url', 'url', 'scraped_at')
+
+
+class Question(Record):
+    """Stack Overflow question"""
+    __slots__ = FIELDS = ('id', 'title', 'link', 'score', 'answer_count', 'view_count', 'is_answered', 'tags',
+                          'owner', 'creation_date', 'last_activity', 'body_preview', 'scraped_at')
+    INTERNED = ('owner',)
+
+
+class Package(Record):
+    """npm or PyPI package"""
+    __slots__ = FIELDS = ('name', 'version', 'description', 'keywords', 'author', 'publisher', 'date', 'links',
+                          'score_final', 'score_quality', 'score_popularity', 'score_maintenance', 'url',
+                          'published_at', 'scraped_at')
+    INTERNED = ('author', 'publisher')
+
+
+class Article(Record):
+    """Dev.to article"""
+    __slots__ = FIELDS = ('id', 'title', 'description', 'url', 'canonical_url', 'author', 'author_name', 'tags',
+                          'published_at', 'created_at', 'reading_time_minutes', 'positive_reactions',
+                          'comments_count', 'scraped_at')
+    INTERNED = ('author', 'author_name')
+
+
+# Record type for each source key used in research results
+RECORD_TYPES = {
+    'hackernews': Story,
+    'lobsters': Story,
+    'reddit': Post,
+    'github': Repo,
+    'arxiv': Paper,
+    'stackoverflow': Question,
+    'npm': Package,
+    'pypi': Package,
+    'devto': Article,
+}
+
+
+def as_records(items: Iterable[Dict], record_type: Type[Record]) -> Iterator[Record]:
+    """Convert a stream of item dicts, e.g. from a harvest_* generator, into records"""
+    from_dict = record_type.from_dict
+    for item in items:
+        yield from_dict(item)
+
+
+def as_dict(item: Any) -> Dict:
+    """item as a plain dict, whether it is a Record or already a dict"""
+    return item.to_dict() if isinstance(item, Record) else item
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+# Headers that describe the wire encoding rather than the recorded (decoded) body
+_HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+# Query parameters computed from the current time; left out of the match key so
+# a cassette recorded yesterday still answers today's requests
+VOLATILE_PARAMS = frozenset(('numericFilters',))
+
+MODES = ('record', 'replay', 'auto')
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """A request in replay mode that the cassette has no recording for
+
+    It is a ConnectionError, so scrapers handle it like being offline.
+    """
+
+
+class Cassette:
+    """Recorded HTTP responses in a directory, one JSON file per request
+
+    record: requests go to the network and their final responses (after
+    retries) are written to the cassette, replacing earlier recordings.
+    replay: responses come only from the cassette; a request without a
+    recording raises CassetteMiss and nothing touches the network.
+    auto: replays what is recorded and records the rest.
+
+    Requests are matched on method, canonical URL (query parameters sorted,
+    ignore_params dropped) and body. Replayed requests skip the rate limiter
+    and the retry loop; each is delayed by `latency` seconds plus up to
+    `jitter` more, drawn from a generator seeded with `seed` so runs are
+    repeatable. latency=None replays the time the recorded request took.
+    """
+
+    def __init__(self, directory: str, mode: str = 'replay', latency: Optional[float] = 0.0,
+                 jitter: float = 0.0, seed: int = 0, ignore_params: Iterable[str] = VOLATILE_PARAMS):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.ignore_params = frozenset(ignore_params)
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, request: requests.PreparedRequest) -> str:
+        parts = urlsplit(request.url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if k not in self.ignore_params)
+        canonical = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256(f"{request.method.upper()} {canonical}\n".encode() + body).hexdigest()
+        return f"{parts.hostname or 'local'}_{digest[:20]}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def send(self, request: requests.PreparedRequest, send_live: Callable[[], requests.Response],
+             adapter=None) -> requests.Response:
+        """The recorded response for request, or send_live()'s, recorded, as the mode allows"""
+        key = self.make_key(request)
+        if self.mode != 'record':
+            entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                return self._replay(entry, request, adapter)
+            if self.mode == 'replay':
+                with self._lock:
+                    self.misses += 1
+                raise CassetteMiss(f"No recording for {request.method} {request.url} in {self.directory}",
+                                   request=request)
+
+        start = time.perf_counter()
+        response = send_live()
+        elapsed = time.perf_counter() - start
+        self._record(key, request, response, elapsed)
+        return response
+
+    def _load(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _record(self, key: str, request: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        body = response.content
+        try:
+            text, encoding = body.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(body).decode('ascii'), 'base64'
+
+        entry = {
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS},
+            'elapsed': round(elapsed, 4),
+            'encoding': encoding,
+            'body': text,
+        }
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._path(key))
+        with self._lock:
+            self.recorded += 1
+
+    def _delay(self, entry: Dict) -> float:
+        base = entry.get('elapsed', 0.0) if self.latency is None else self.latency
+        if not self.jitter:
+            return base
+        with self._lock:
+            return base + self._random.uniform(0, self.jitter)
+
+    def _replay(self, entry: Dict, request: requests.PreparedRequest, adapter=None) -> requests.Response:
+        delay = self._delay(entry)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = entry['body']
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason') or ''
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(body) if entry.get('encoding') == 'base64' else body.encode('utf-8')
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        response.from_cassette = True
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'mode': self.mode, 'hits': self.hits, 'misses': self.misses, 'recorded': self.recorded}
+
+
+_active_cassette = None
+
+
+def get_cassette() -> Optional[Cassette]:
+    return _active_cassette
+
+
+def set_cassette(cassette: Optional[Cassette]):
+    """Route every scraper's requests through cassette (None turns replay off)"""
+    global _active_cassette
+    _active_cassette = cassette
+
+
+@contextlib.contextmanager
+def use_cassette(directory: str, mode: str = 'replay', **kwargs) -> Iterator[Cassette]:
+    """Record or replay the requests made inside the block
+
+        with use_cassette('fixtures/cassettes/rust', mode='record'):
+            ResearchAggregator().research_topic('rust')
+    """
+    previous = get_cassette()
+    cassette = Cassette(directory, mode, **kwargs)
+    set_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        set_cassette(previous)
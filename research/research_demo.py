@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 from enhanced_scraper import ResearchAggregator, EnhancedHackerNewsScraper, EnhancedRedditScraper, ContentFetcher
+from exporters import format_timestamps
+from logs import configure_logging
 import json
 from datetime import datetime
 
@@ -79,7 +81,7 @@ def demo_topic_research():
     # Save to JSON
     filename = f"research_{topic.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     with open(filename, 'w') as f:
-        json.dump(research, f, indent=2, default=str)
+        json.dump(format_timestamps(research), f, indent=2, default=str)
     print(f"\n\n✅ Full research saved to: {filename}")
 
 
@@ -168,4 +170,5 @@ def main():
 
 
 if __name__ == "__main__":
+    configure_logging()
     main()
\ No newline at end of file
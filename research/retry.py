@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import json
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from urllib.parse import urlparse
+
+
+# Methods that can be resent without changing anything on the server
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'))
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Hosts that ask for back-off in the JSON body rather than in headers
+# (Stack Exchange sends "backoff": <seconds> on otherwise successful responses)
+BODY_BACKOFF_HOSTS = frozenset(('api.stackexchange.com',))
+
+
+class RetryBudget:
+    """Caps the number of retries across all requests of a run, so a failing
+    host degrades the run instead of stalling it"""
+
+    def __init__(self, max_retries: Optional[int] = 100):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.max_retries is not None and self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    def reset(self):
+        with self._lock:
+            self.used = 0
+
+
+class RetryPolicy:
+    """When and how long to wait before resending a failed request
+
+    Only idempotent requests are retried: after connection errors, timeouts,
+    429 and 5xx responses, and GitHub's 403 once its rate limit is used up.
+    The wait is the server's Retry-After or X-RateLimit-Reset when given,
+    otherwise full-jitter exponential backoff (uniform between 0 and
+    base_delay * 2**attempt, at most max_delay). Waits the server asks for
+    that exceed max_delay are not attempted: the request fails as before and
+    the run carries on without that source.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 60.0,
+                 budget: Optional[RetryBudget] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _allowed(self, method: str, attempt: int) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS and attempt + 1 < self.max_attempts
+
+    def delay_after_error(self, method: str, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a request that raised, or None to give up"""
+        if not self._allowed(method, attempt) or not self.budget.take():
+            return None
+        return self.backoff(attempt)
+
+    def delay_after_response(self, method: str, status: int, headers: Mapping[str, str],
+                             attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a request that got `status`, or None to keep the response"""
+        rate_limited = status == 403 and headers.get('X-RateLimit-Remaining') == '0'
+        if status not in RETRY_STATUSES and not rate_limited:
+            return None
+        if not self._allowed(method, attempt):
+            return None
+
+        delay = server_delay(headers)
+        if delay is None:
+            delay = self.backoff(attempt)
+        elif delay > self.max_delay:
+            return None
+
+        if not self.budget.take():
+            return None
+        return delay
+
+
+def server_delay(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After or X-RateLimit-Reset"""
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+
+    reset = headers.get('X-RateLimit-Reset')
+    if reset and headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return None
+
+
+def body_backoff(url: str, body: bytes) -> Optional[float]:
+    """The back-off a JSON API asked for in the response body, in seconds"""
+    if (urlparse(url).hostname or '') not in BODY_BACKOFF_HOSTS or b'"backoff"' not in body:
+        return None
+    try:
+        backoff = json.loads(body).get('backoff')
+    except (ValueError, AttributeError):
+        return None
+    return float(backoff) if isinstance(backoff, (int, float)) else None
+
+
+_default_policy = RetryPolicy()
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _default_policy
+
+
+def set_retry_policy(policy: RetryPolicy):
+    """Use policy for every scraper in this process; RetryPolicy(max_attempts=1) disables retries"""
+    global _default_policy
+    _default_policy = policy
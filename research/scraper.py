@@ -1,56 +1,396 @@
 #!/usr/bin/env python3
 
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-import json
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from bs4 import BeautifulSoup, NavigableString, Tag
+from email.utils import parsedate_to_datetime
+from html import unescape
+import contextvars
+import inspect
+import math
 import time
-from typing import List, Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import re
+from itertools import islice
+from rate_limit import get_rate_limiter
+from http_cache import get_default_cache
+from transport import Transport, get_transport
+from retry import body_backoff, get_retry_policy
+from metrics import current_call, get_metrics, instrumented
+from logs import get_logger
+from endpoints import endpoint
+from profiling import fetch_phase
+from replay import get_cassette
+from memo import memoized
+from parsing import default_html_parser
+from exporters import write_columnar, write_csv, write_json, write_ndjson
+
+
+# Responses that mean the source is refusing or failing us, as opposed to a
+# request for something that does not exist (404)
+FAILURE_STATUSES = frozenset((401, 403, 429))
+
+
+class ScraperAdapter(HTTPAdapter):
+    """Transport adapter that every request made through a scraper's session passes through
+
+    Requests wait on the process-wide per-host rate limiter before they are
+    sent, so the scraper's delay is honoured by fetch() and by direct
+    session.get() calls alike, and is shared by all scrapers hitting a host.
+
+    When a response cache is enabled (see http_cache), GET requests are served
+    from it while fresh and revalidated with ETag / Last-Modified once stale.
+
+    Connections come from the process-wide Transport (see transport), so all
+    scrapers share one set of keep-alive pools, and HTTP/2 when enabled.
+    Failed idempotent requests are retried with backoff (see retry). With a
+    cassette in use (see replay), responses are recorded or replayed.
+    """
+
+    def __init__(self, scraper: 'WebScraper', transport: Optional[Transport] = None, **kwargs):
+        self.scraper = scraper
+        self.transport = transport or get_transport()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        self.poolmanager = self.transport.pool_manager
+
+    def close(self):
+        # The pools belong to the transport and outlive any one session
+        for proxy_manager in self.proxy_manager.values():
+            proxy_manager.clear()
+
+    def _labels(self) -> Dict[str, str]:
+        call = current_call()
+        return {'source': type(self.scraper).__name__, 'method': call.method if call else ''}
+
+    def send(self, request, **kwargs):
+        try:
+            with fetch_phase():
+                response = self._send_cached(request, **kwargs)
+        except Exception as e:
+            self.scraper.requests_failed += 1
+            get_metrics().inc('http_requests_total', status=type(e).__name__, cached=False, **self._labels())
+            raise
+        if response.status_code in FAILURE_STATUSES or response.status_code >= 500:
+            self.scraper.requests_failed += 1
+        else:
+            self.scraper.requests_ok += 1
+        get_metrics().inc('http_requests_total', status=response.status_code,
+                          cached=getattr(response, 'from_cache', False), **self._labels())
+        return response
+
+    def _send_cached(self, request, **kwargs):
+        cache = get_default_cache()
+        ttl = self.scraper.cache_ttl
+        if cache is None or request.method != 'GET' or ttl <= 0:
+            return self._send(request, **kwargs)
+
+        key = cache.make_key(request.method, request.url)
+        entry = cache.get(key)
+        if entry is not None and entry.fresh:
+            return self._cached_response(entry, request)
+
+        if entry is not None:
+            request.headers.update(entry.revalidation_headers())
+
+        response = self._send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            cache.refresh(key, ttl)
+            return self._cached_response(entry, request)
+
+        if response.status_code == 200:
+            cache.put(key, request.method, request.url, response.status_code,
+                      dict(response.headers), response.content, ttl)
+
+        return response
+
+    def _send(self, request, **kwargs):
+        """_send_live, or the recorded response when a cassette is in use (see replay)"""
+        cassette = get_cassette()
+        if cassette is None:
+            return self._send_live(request, **kwargs)
+
+        call = current_call()
+        start = time.perf_counter()
+        response = cassette.send(request, lambda: self._send_live(request, **kwargs), adapter=self)
+        if call is not None and getattr(response, 'from_cassette', False):
+            call.network += time.perf_counter() - start
+        return response
+
+    def _send_live(self, request, **kwargs):
+        """Send one request, retrying it as the retry policy allows
+
+        Waits, whether the server asked for them or they come from backoff,
+        pause the request's host in the rate limiter, so every scraper
+        holds off that host, not just this request.
+        """
+        limiter = get_rate_limiter()
+        policy = get_retry_policy()
+        rate = 1.0 / self.scraper.delay if self.scraper.delay > 0 else None
+        call = current_call()
+        attempt = 0
+
+        while True:
+            start = time.perf_counter()
+            limiter.acquire(request.url, rate=rate)
+            if call is not None:
+                call.waiting += time.perf_counter() - start
+            try:
+                response = self._timed_send(request, call, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                wait = policy.delay_after_error(request.method, attempt)
+                if wait is None:
+                    raise
+            else:
+                wait = policy.delay_after_response(request.method, response.status_code, response.headers, attempt)
+                if wait is None:
+                    if not kwargs.get('stream'):
+                        backoff = body_backoff(request.url, response.content)
+                        if backoff:
+                            limiter.pause(request.url, backoff)
+                    return response
+                response.close()
+
+            limiter.pause(request.url, wait)
+            attempt += 1
+
+    def _timed_send(self, request, call, **kwargs):
+        """_send_once, recording time to first byte, body transfer time and size
+
+        Connection setup (DNS + TCP connect, TLS) is recorded per host by the
+        transport when a new connection is opened.
+        """
+        start = time.perf_counter()
+        try:
+            response = self._send_once(request, **kwargs)
+        finally:
+            ttfb = time.perf_counter() - start
+            if call is not None:
+                call.network += ttfb
+
+        transfer = 0.0
+        if not kwargs.get('stream'):
+            start = time.perf_counter()
+            size = len(response.content)
+            transfer = time.perf_counter() - start
+            if call is not None:
+                call.network += transfer
+            if response.raw is not None and hasattr(response.raw, 'tell'):
+                size = response.raw.tell() or size
+
+        metrics = get_metrics()
+        labels = dict(self._labels(), host=urlparse(request.url).hostname or '')
+        metrics.observe('http_ttfb_seconds', ttfb, **labels)
+        if not kwargs.get('stream'):
+            metrics.observe('http_transfer_seconds', transfer, **labels)
+            metrics.observe('http_response_bytes', size, **labels)
+        return response
+
+    def _send_once(self, request, **kwargs):
+        routed = self.transport.route(request)
+        if self.transport.use_http2(routed, kwargs.get('stream', False), kwargs.get('proxies')):
+            response = self.transport.send_http2(routed, **kwargs)
+            response.connection = self
+        else:
+            response = super().send(routed, **kwargs)
+        if routed is not request:
+            # Callers see the URL they asked for, not where it was routed
+            response.url = request.url
+            response.request = request
+        return response
+
+    def _cached_response(self, entry, request) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry.status
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry.body
+        response.url = entry.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+
+class IncompleteFetch(Exception):
+    """A paged fetch stopped before reaching the end of its results
+
+    Raised by strict harvests after they have yielded what they did fetch,
+    so callers keeping a watermark know not to advance it past the gap.
+    """
+
+
+class FetchContext:
+    """Per-response facts shared by every item parsed from that response
+
+    scraped_at is captured once, in epoch seconds: the time of the request, or
+    the origin's Date header when the response was served from the HTTP
+    cache. Items store it as an int and exporters format it on the way out.
+    """
+
+    __slots__ = ('url', 'scraped_at')
+
+    def __init__(self, url: Optional[str] = None, scraped_at: Optional[int] = None):
+        self.url = url
+        self.scraped_at = int(time.time()) if scraped_at is None else scraped_at
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> 'FetchContext':
+        scraped_at = None
+        if getattr(response, 'from_cache', False) and response.headers.get('Date'):
+            try:
+                scraped_at = int(parsedate_to_datetime(response.headers['Date']).timestamp())
+            except (TypeError, ValueError):
+                pass
+        return cls(response.url, scraped_at)
 
 
 class WebScraper:
+    # Seconds a cached response stays fresh before it is revalidated
+    cache_ttl = 600
+
+    log = get_logger('web')
+
+    def __init_subclass__(cls, **kwargs):
+        # One logger per source (research.hackernews, research.github ...);
+        # time every public scraper method and count its items (see metrics)
+        super().__init_subclass__(**kwargs)
+        if 'log' not in vars(cls):
+            name = cls.__name__
+            if name.startswith('Enhanced'):
+                name = name[len('Enhanced'):]
+            if name.endswith('Scraper'):
+                name = name[:-len('Scraper')]
+            cls.log = get_logger(name.lower() or 'web')
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith('_') and inspect.isfunction(attr):
+                setattr(cls, name, instrumented(attr))
+
+    # Attributes that change what a memoized method returns; see memo_fingerprint
+    memo_settings = ('base_url', 'api_url', 'search_api', 'downloads_api', 'use_api', 'token', 'key', 'html_parser')
+
     def __init__(self, delay: float = 1.0):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        adapter = ScraperAdapter(self)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.delay = delay
-        self.last_request_time = 0
+        self.html_parser = default_html_parser()
+        # Outcomes of the requests sent through this scraper's session
+        self.requests_ok = 0
+        self.requests_failed = 0
 
-    def _rate_limit(self):
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.delay:
-            time.sleep(self.delay - elapsed)
-        self.last_request_time = time.time()
+    def memo_fingerprint(self) -> Tuple:
+        """Part of every memo key, so scrapers set up differently never share results"""
+        return tuple(getattr(self, name, None) for name in self.memo_settings)
 
     def fetch(self, url: str) -> Optional[str]:
-        self._rate_limit()
         try:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             return response.text
         except Exception as e:
-            print(f"Error fetching {url}: {e}")
+            self.log.error("Error fetching %s: %s", url, e)
             return None
 
     def parse_html(self, html: str) -> BeautifulSoup:
-        return BeautifulSoup(html, 'html.parser')
+        return BeautifulSoup(html, self.html_parser)
+
+    def _harvest_pages(self, fetch_page: Callable[[int], Tuple[List[Dict], bool]], pages: int,
+                       max_items: int, prefetch: int = 4) -> Iterator[Dict]:
+        """Yield items from pages 0..pages-1 in order, keeping up to `prefetch` pages in flight
+
+        fetch_page(n) returns the parsed items of the n-th page and whether more
+        pages follow; it should report its own errors and return ([], False),
+        or raise to end the harvest after the items of the pages before it.
+        Every request still waits on the per-host rate limiter, so prefetching
+        overlaps latency without exceeding a host's rate. Up to prefetch - 1
+        pages past the last one needed may be requested and discarded.
+        """
+        if max_items <= 0 or pages <= 0:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        in_flight = deque()
+        next_page = 0
+        count = 0
+
+        try:
+            while True:
+                while next_page < pages and len(in_flight) < max(1, prefetch):
+                    # Run in a copy of this context so requests are attributed to the calling method
+                    in_flight.append(executor.submit(contextvars.copy_context().run, fetch_page, next_page))
+                    next_page += 1
+
+                if not in_flight:
+                    return
+
+                items, has_more = in_flight.popleft().result()
+                for item in items:
+                    yield item
+                    count += 1
+                    if count >= max_items:
+                        return
+
+                if not has_more:
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 class HackerNewsScraper(WebScraper):
-    def __init__(self):
+    cache_ttl = 300
+
+    # Firebase API story lists and the HTML pages showing the same stories
+    FEEDS = {
+        'topstories': '',
+        'newstories': 'newest',
+        'beststories': 'best',
+        'askstories': 'ask',
+        'showstories': 'show',
+        'jobstories': 'jobs',
+    }
+
+    def __init__(self, use_api: bool = False, batch_size: int = 16):
+        """use_api: read stories and comments from the Firebase API instead of the HTML pages
+        batch_size: API items fetched concurrently
+        """
         super().__init__(delay=0.5)
-        self.base_url = "https://news.ycombinator.com"
-        self.api_url = "https://hacker-news.firebaseio.com/v0"
+        self.base_url = endpoint('hackernews.web')
+        self.api_url = endpoint('hackernews.firebase')
+        self.search_api = endpoint('hackernews.algolia')
+        self.use_api = use_api
+        self.batch_size = batch_size
 
-    def get_top_stories(self, limit: int = 30) -> List[Dict]:
-        stories = []
+    def get_top_stories(self, limit: int = 30, feed: str = 'topstories') -> List[Dict]:
+        return list(self.iter_top_stories(limit, feed))
 
-        html = self.fetch(self.base_url)
+    def iter_top_stories(self, limit: int = 30, feed: str = 'topstories') -> Iterator[Dict]:
+        """Yield stories of a feed as they are parsed, stopping after limit
+
+        From the HTML pages a feed has at most 30 stories; with use_api it has
+        up to 500 (200 for best, ask, show and jobs).
+        """
+        if self.use_api:
+            yield from self.iter_api_stories(feed, limit)
+            return
+
+        path = self.FEEDS[feed]
+        html = self.fetch(f"{self.base_url}/{path}" if path else self.base_url)
         if not html:
-            return stories
+            return
 
         soup = self.parse_html(html)
 
@@ -58,9 +398,179 @@ class HackerNewsScraper(WebScraper):
         for item in items[:limit]:
             story = self._parse_story_item(item, soup)
             if story:
-                stories.append(story)
+                yield story
+
+    @memoized()
+    def get_story_ids(self, feed: str = 'topstories') -> List[int]:
+        """Story ids of a feed from the Firebase API, in feed order"""
+        if feed not in self.FEEDS:
+            raise ValueError(f"Unknown feed {feed!r}, expected one of {', '.join(self.FEEDS)}")
+        try:
+            response = self.session.get(f"{self.api_url}/{feed}.json", timeout=10)
+            response.raise_for_status()
+            return response.json() or []
+        except Exception as e:
+            self.log.error("Error fetching %s: %s", feed, e)
+            return []
+
+    @memoized()
+    def get_item(self, item_id) -> Optional[Dict]:
+        """One raw story, comment or poll from the Firebase API"""
+        try:
+            response = self.session.get(f"{self.api_url}/item/{item_id}.json", timeout=10)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self.log.error("Error fetching item %s: %s", item_id, e)
+            return None
+
+    def get_items(self, item_ids: List) -> List[Dict]:
+        """Raw API items for item_ids, in the same order, skipping the ones that could not be fetched"""
+        return list(self._iter_items(item_ids))
+
+    def _iter_items(self, item_ids: List) -> Iterator[Dict]:
+        # One item per "page", with batch_size of them in flight at a time
+        def fetch_item(n):
+            item = self.get_item(item_ids[n])
+            return ([item] if item else []), True
+
+        yield from self._harvest_pages(fetch_item, len(item_ids), len(item_ids), prefetch=self.batch_size)
+
+    def iter_api_stories(self, feed: str = 'topstories', limit: int = 30) -> Iterator[Dict]:
+        """Yield up to limit stories of a feed from the Firebase API, in feed order"""
+        for item in self._iter_items(self.get_story_ids(feed)[:limit]):
+            story = self._parse_api_story(item)
+            if story:
+                yield story
 
-        return stories
+    def _parse_api_story(self, item: Dict) -> Optional[Dict]:
+        if item.get('deleted') or item.get('dead'):
+            return None
+        story_id = str(item.get('id', ''))
+        hn_url = f"{self.base_url}/item?id={story_id}"
+        url = item.get('url') or hn_url
+        return {
+            'id': story_id,
+            'title': item.get('title', ''),
+            'url': url,
+            'domain': urlparse(url).netloc,
+            'points': item.get('score', 0),
+            'author': item.get('by', ''),
+            'age': self._api_age(item),
+            'comments': item.get('descendants', 0),
+            'hn_url': hn_url,
+            'created_at_i': item.get('time'),
+        }
+
+    def get_comment_tree(self, story_id, max_comments: Optional[int] = None,
+                         max_depth: Optional[int] = None) -> List[Dict]:
+        """A story's comments as nested nodes, in thread order
+
+        Each node has the comment fields, its indent, `replies` (number of
+        direct replies on HN, included or not), `children` and `subtree_size`
+        (the comment plus all its included descendants). max_depth=1 keeps
+        top-level comments only; max_comments keeps the first max_comments
+        comments of that in thread order (depth-first, as on the page).
+
+        From the HTML item page the tree is rebuilt in one pass over the
+        comment rows (see _build_comment_tree). With use_api, comments are
+        fetched one thread level at a time, each level's items concurrently,
+        and only those that can be among the first max_comments.
+        """
+        if not self.use_api:
+            html = self.fetch(f"{self.base_url}/item?id={story_id}")
+            if not html:
+                return []
+            return self._build_comment_tree(self.parse_html(html), max_comments, max_depth)
+
+        story = self.get_item(story_id)
+        if not story:
+            return []
+
+        root = {'children': None, '_kids': story.get('kids') or []}
+        frontier = [root]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            wanted = _wanted_kids(root, max_comments) if max_comments is not None else None
+            ids = [kid for node in frontier for kid in node['_kids'] if wanted is None or kid in wanted]
+            items = {item.get('id'): item for item in self._iter_items(ids)}
+
+            next_frontier = []
+            for node in frontier:
+                node['children'] = []
+                for kid in node['_kids']:
+                    item = items.get(kid)
+                    if item is None or ((item.get('deleted') or item.get('dead')) and not item.get('kids')):
+                        continue
+                    child = self._parse_api_comment(item, depth)
+                    node['children'].append(child)
+                    if child['_kids']:
+                        next_frontier.append(child)
+            frontier = next_frontier
+            depth += 1
+
+        nodes = root['children'] or []
+        if max_comments is not None:
+            # Whole sibling groups are fetched, so a level can overshoot the limit
+            nodes = _first_nodes(nodes, max_comments)
+        return _finish_nodes(nodes)
+
+    def _build_comment_tree(self, soup, max_comments: Optional[int] = None,
+                            max_depth: Optional[int] = None) -> List[Dict]:
+        """Nested comment nodes from an item page's flat comment rows
+
+        HN renders a thread as one row per comment in depth-first order, each
+        with its indent. A stack holding the current comment's ancestors is
+        enough to find every row's parent, so the rows are read once and
+        nothing is searched for outside a row.
+        """
+        roots = []
+        stack = []  # (indent, node or None for a row left out) of the current row's ancestors
+        kept = 0
+
+        for comment in self._iter_comment_rows(soup):
+            indent = comment['indent']
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            parent = stack[-1][1] if stack else None
+            if parent is not None and stack[-1][0] == indent - 1:
+                parent['replies'] += 1
+
+            keep = ((max_depth is None or indent < max_depth)
+                    and (max_comments is None or kept < max_comments)
+                    and (not stack or parent is not None))
+            if keep:
+                kept += 1
+                comment['replies'] = 0
+                comment['children'] = []
+                (parent['children'] if parent is not None else roots).append(comment)
+            stack.append((indent, comment if keep else None))
+
+        return _finish_nodes(roots)
+
+    def _parse_api_comment(self, item: Dict, indent: int) -> Dict:
+        kids = item.get('kids') or []
+        return {
+            'id': str(item.get('id', '')),
+            'author': item.get('by') or '[deleted]',
+            'text': self._api_text(item.get('text') or ''),
+            'age': self._api_age(item),
+            'indent': indent,
+            'replies': len(kids),
+            'children': None,
+            '_kids': kids,
+        }
+
+    @staticmethod
+    def _api_text(text: str) -> str:
+        """Plain text of an API comment body (HTML with <p> between paragraphs)"""
+        text = re.sub(r'<p>', '\n', text)
+        return unescape(re.sub(r'<[^>]+>', '', text)).strip()
+
+    @staticmethod
+    def _api_age(item: Dict) -> str:
+        posted = item.get('time')
+        return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(posted)) if posted else ''
 
     def _parse_story_item(self, item, soup) -> Optional[Dict]:
         try:
@@ -131,11 +641,97 @@ class HackerNewsScraper(WebScraper):
             }
 
         except Exception as e:
-            print(f"Error parsing story item: {e}")
+            self.log.warning("Error parsing story item: %s", e)
             return None
 
+    @memoized()
     def search_stories(self, query: str, sort: str = 'popularity', dateRange: str = 'week') -> List[Dict]:
-        search_url = "https://hn.algolia.com/api/v1/search"
+        return list(self.iter_search_stories(query, sort, dateRange))
+
+    def iter_search_stories(self, query: str, sort: str = 'popularity', dateRange: str = 'week', max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield search hits as they are parsed, stopping after max_items"""
+        search_url, params = self._search_request(query, sort, dateRange)
+
+        try:
+            response = self.session.get(search_url, params=params, timeout=10)
+            response.raise_for_status()
+            yield from islice(self._parse_search_hits(response.json()), max_items)
+
+        except Exception as e:
+            self.log.error("Error searching stories: %s", e)
+
+    def harvest_stories(self, query: str, sort: str = 'date', dateRange: str = 'all', max_items: int = 1000,
+                        page_size: int = 100, prefetch: int = 4, since: Optional[int] = None,
+                        strict: bool = False) -> Iterator[Dict]:
+        """Yield up to max_items search hits, fetching result pages concurrently
+
+        Algolia serves at most 1000 hits per query. Date-sorted harvests work
+        around this by re-querying with created_at_i at or before the oldest hit
+        seen so far, so they can reach arbitrarily far back; popularity-sorted
+        harvests stop after the first 1000 hits. `since` (epoch seconds) limits
+        the harvest to stories created after it. With strict, a failed page
+        raises IncompleteFetch instead of quietly ending the harvest.
+        """
+        search_url, params = self._search_request(query, sort, dateRange)
+        page_size = max(1, min(page_size, 1000))
+        pages = 1000 // page_size
+        date_filter = params.pop('numericFilters', None)
+        if since is not None:
+            date_filter = ','.join(f for f in (date_filter, f'created_at_i>{int(since)}') if f)
+        seen = set()
+        before = None
+
+        while len(seen) < max_items:
+            filters = [f for f in (date_filter, f'created_at_i<={before}' if before is not None else None) if f]
+            window_params = dict(params, hitsPerPage=page_size)
+            if filters:
+                window_params['numericFilters'] = ','.join(filters)
+            oldest = []
+            full_pages = []
+
+            def fetch_page(n, window_params=window_params, oldest=oldest, full_pages=full_pages):
+                try:
+                    response = self.session.get(search_url, params=dict(window_params, page=n), timeout=10)
+                    response.raise_for_status()
+                    data = response.json()
+                except Exception as e:
+                    self.log.error("Error harvesting stories (page %s): %s", n, e)
+                    if strict:
+                        raise IncompleteFetch(f"Hacker News search page {n} failed: {e}") from e
+                    return [], False
+
+                hits = data.get('hits', [])
+                oldest.extend(hit['created_at_i'] for hit in hits if 'created_at_i' in hit)
+                if len(hits) == page_size:
+                    full_pages.append(n)
+                return list(self._parse_search_hits(data)), n + 1 < data.get('nbPages', 0)
+
+            # Windows overlap by the hits sharing the oldest timestamp, so the
+            # budget is enforced here on unique items rather than by the pager
+            new_items = 0
+            for item in self._harvest_pages(fetch_page, pages, pages * page_size, prefetch):
+                if item['id'] in seen:
+                    continue
+                seen.add(item['id'])
+                new_items += 1
+                yield item
+                if len(seen) >= max_items:
+                    return
+
+            if sort != 'date' or not new_items or len(full_pages) < pages or not oldest:
+                break
+            before = min(oldest)
+
+    def iter_stories_since(self, query: str, since: int, max_items: int = 1000) -> Iterator[Dict]:
+        """Yield stories matching query created after `since` (epoch seconds), newest first
+
+        Raises IncompleteFetch, after the stories it got, if a page fails.
+        """
+        yield from self.harvest_stories(query, sort='date', dateRange='all', max_items=max_items, since=since,
+                                        strict=True)
+
+    def _search_request(self, query: str, sort: str = 'popularity', dateRange: str = 'week') -> Tuple[str, Dict]:
+        search_url = f"{self.search_api}/search"
 
         date_filters = {
             'day': 86400,
@@ -155,96 +751,157 @@ class HackerNewsScraper(WebScraper):
             params['numericFilters'] = f'created_at_i>{timestamp}'
 
         if sort == 'date':
-            search_url = "https://hn.algolia.com/api/v1/search_by_date"
-
-        try:
-            response = self.session.get(search_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            stories = []
-            for hit in data.get('hits', []):
-                stories.append({
-                    'id': hit.get('objectID'),
-                    'title': hit.get('title', ''),
-                    'url': hit.get('url', ''),
-                    'author': hit.get('author', ''),
-                    'points': hit.get('points', 0),
-                    'comments': hit.get('num_comments', 0),
-                    'created_at': hit.get('created_at', ''),
-                    'hn_url': f"https://news.ycombinator.com/item?id={hit.get('objectID')}"
-                })
-
-            return stories
-
-        except Exception as e:
-            print(f"Error searching stories: {e}")
-            return []
+            search_url = f"{self.search_api}/search_by_date"
+
+        return search_url, params
+
+    def _parse_search_hits(self, data: Dict) -> Iterator[Dict]:
+        for hit in data.get('hits', []):
+            yield {
+                'id': hit.get('objectID'),
+                'title': hit.get('title', ''),
+                'url': hit.get('url', ''),
+                'author': hit.get('author', ''),
+                'points': hit.get('points', 0),
+                'comments': hit.get('num_comments', 0),
+                'created_at': hit.get('created_at', ''),
+                'created_at_i': hit.get('created_at_i'),
+                'hn_url': f"https://news.ycombinator.com/item?id={hit.get('objectID')}"
+            }
 
+    @memoized()
     def get_comments(self, story_id: str, limit: int = 10) -> List[Dict]:
+        """The first limit comments of a story in thread order, with their indent"""
+        if self.use_api:
+            tree = self.get_comment_tree(story_id, max_comments=limit)
+            return [{key: node[key] for key in ('id', 'author', 'text', 'age', 'indent')}
+                    for node in islice(walk_comment_tree(tree), limit)]
+
         url = f"{self.base_url}/item?id={story_id}"
         html = self.fetch(url)
         if not html:
             return []
 
-        soup = self.parse_html(html)
-        comments = []
+        return list(islice(self._iter_comment_rows(self.parse_html(html)), limit))
 
-        comment_trees = soup.select('.comment-tree .athing.comtr')
+    def _iter_comment_rows(self, soup) -> Iterator[Dict]:
+        """Yield an item page's comments in thread order, each with its indent
 
-        for comment in comment_trees[:limit]:
-            parsed = self._parse_comment(comment)
-            if parsed:
-                comments.append(parsed)
+        One walk over the comment table, reading each element's class once;
+        selectors per row would cost several times the page parse on long
+        threads.
+        """
+        table = soup.find(class_='comment-tree')
+        if table is None:
+            return
+
+        comment = None
+        for elem in table.descendants:
+            if not isinstance(elem, Tag):
+                continue
+            classes = elem.get('class') or ()
+            if elem.name == 'tr' and 'comtr' in classes:
+                if comment is not None:
+                    yield comment
+                comment = {'id': elem.get('id'), 'author': '[deleted]', 'text': '', 'age': '', 'indent': 0}
+            elif comment is None:
+                continue
+            elif 'ind' in classes:
+                comment['indent'] = self._comment_indent(elem)
+            elif 'hnuser' in classes:
+                comment['author'] = elem.get_text().strip()
+            elif 'age' in classes:
+                comment['age'] = elem.get_text().strip()
+            elif 'commtext' in classes:
+                # <br> as a line break; markup comments in the text are dropped
+                comment['text'] = ''.join('\n' if node.name == 'br' else node for node in elem.descendants
+                                          if node.name == 'br' or type(node) is NavigableString).strip()
+        if comment is not None:
+            yield comment
+
+    @staticmethod
+    def _comment_indent(ind) -> int:
+        """Depth of a comment from its td.ind: the indent attribute, or the spacer image's width / 40"""
+        if ind.get('indent', '').isdigit():
+            return int(ind['indent'])
+        img = ind.find('img')
+        if img is not None and img.get('width', '').isdigit():
+            return int(img['width']) // 40
+        return 0
 
-        return comments
 
-    def _parse_comment(self, comment_elem) -> Optional[Dict]:
-        try:
-            comment_id = comment_elem.get('id')
+def _wanted_kids(root: Dict, limit: int) -> set:
+    """Ids of the not yet fetched comments that can be among the first limit in thread order
+
+    Walks the tree fetched so far depth-first; an unfetched comment's own
+    replies are unknown, so the positions counted are lower bounds.
+    """
+    wanted = set()
+    position = 0
+    stack = [root]
+    while stack:
+        entry = stack.pop()
+        if entry is not root:
+            position += 1
+            if position > limit:
+                break
+        if isinstance(entry, dict):
+            stack.extend(reversed(entry['_kids'] if entry['children'] is None else entry['children']))
+        else:
+            wanted.add(entry)
+    return wanted
 
-            indent_elem = comment_elem.select_one('.ind img')
-            indent = 0
-            if indent_elem and indent_elem.get('width'):
-                indent = int(indent_elem['width']) // 40
 
-            text_elem = comment_elem.select_one('.commtext')
-            text = ''
-            if text_elem:
-                for br in text_elem.find_all('br'):
-                    br.replace_with('\n')
-                text = text_elem.get_text().strip()
+def _first_nodes(nodes: List[Dict], limit: int) -> List[Dict]:
+    """The comment tree cut down to its first limit nodes in thread order
 
-            user_elem = comment_elem.select_one('.hnuser')
-            author = user_elem.text.strip() if user_elem else '[deleted]'
+    >>> tree = [{'id': 10, 'children': [{'id': 11, 'children': []}, {'id': 12, 'children': []}]},
+    ...         {'id': 20, 'children': []}, {'id': 30, 'children': []}]
+    >>> [node['id'] for node in walk_comment_tree(_first_nodes(tree, 3))]
+    [10, 11, 12]
+    """
+    kept = {id(node) for node in islice(walk_comment_tree(nodes), limit)}
+    # walk_comment_tree reads a node's children after yielding it, so they are filtered first
+    for node in walk_comment_tree(nodes):
+        node['children'] = [child for child in node['children'] or [] if id(child) in kept]
+    return [node for node in nodes if id(node) in kept]
 
-            age_elem = comment_elem.select_one('.age')
-            age = age_elem.text.strip() if age_elem else ''
 
-            return {
-                'id': comment_id,
-                'author': author,
-                'text': text,
-                'age': age,
-                'indent': indent
-            }
+def _finish_nodes(nodes: List[Dict]) -> List[Dict]:
+    # Children come after their parent in thread order, so walking it backwards
+    # sizes every subtree before the node containing it
+    for node in reversed(list(walk_comment_tree(nodes))):
+        node.pop('_kids', None)
+        if node['children'] is None:
+            node['children'] = []
+        node['subtree_size'] = 1 + sum(child['subtree_size'] for child in node['children'])
+    return nodes
 
-        except Exception as e:
-            print(f"Error parsing comment: {e}")
-            return None
+
+def walk_comment_tree(nodes: List[Dict]) -> Iterator[Dict]:
+    """Nodes of a comment tree depth-first, in thread order"""
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node['children'] or []))
 
 
 class RedditScraper(WebScraper):
+    cache_ttl = 300
+
     def __init__(self):
         super().__init__(delay=2.0)
-        self.base_url = "https://www.reddit.com"
+        self.base_url = endpoint('reddit.web')
 
+    @memoized()
     def get_subreddit_posts(self, subreddit: str, sort: str = 'hot', limit: int = 25) -> List[Dict]:
         url = f"{self.base_url}/r/{subreddit}/{sort}.json"
         params = {'limit': limit, 'raw_json': 1}
 
         try:
             response = self.session.get(url, params=params, timeout=10)
+            ctx = FetchContext.from_response(response)
             response.raise_for_status()
             data = response.json()
 
@@ -259,57 +916,100 @@ class RedditScraper(WebScraper):
                     'text': post.get('selftext', ''),
                     'score': post['score'],
                     'comments': post['num_comments'],
-                    'created_utc': datetime.fromtimestamp(post['created_utc']).isoformat(),
+                    'created_utc': int(post['created_utc']),
                     'subreddit': post['subreddit'],
-                    'permalink': f"https://reddit.com{post['permalink']}"
+                    'permalink': f"https://reddit.com{post['permalink']}",
+                    'scraped_at': ctx.scraped_at
                 })
 
             return posts
 
         except Exception as e:
-            print(f"Error fetching subreddit posts: {e}")
+            self.log.error("Error fetching subreddit posts: %s", e)
             return []
 
+    @memoized()
     def search_posts(self, query: str, subreddit: Optional[str] = None, sort: str = 'relevance', time: str = 'week') -> List[Dict]:
-        if subreddit:
-            url = f"{self.base_url}/r/{subreddit}/search.json"
-            params = {'q': query, 'restrict_sr': 'on', 'sort': sort, 't': time, 'limit': 25}
-        else:
-            url = f"{self.base_url}/search.json"
-            params = {'q': query, 'sort': sort, 't': time, 'limit': 25}
+        return list(self.iter_search_posts(query, subreddit, sort, time))
+
+    def iter_search_posts(self, query: str, subreddit: Optional[str] = None, sort: str = 'relevance', time: str = 'week', max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield search results as they are parsed, stopping after max_items"""
+        url, params = self._search_request(query, subreddit, sort, time)
 
         try:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            yield from islice(self._parse_search_listing(response.json()), max_items)
 
-            posts = []
-            for child in data['data']['children']:
-                post = child['data']
-                posts.append({
-                    'id': post['id'],
-                    'title': post['title'],
-                    'author': post['author'],
-                    'url': post['url'],
-                    'score': post['score'],
-                    'comments': post['num_comments'],
-                    'subreddit': post['subreddit'],
-                    'created_utc': datetime.fromtimestamp(post['created_utc']).isoformat(),
-                    'permalink': f"https://reddit.com{post['permalink']}"
-                })
+        except Exception as e:
+            self.log.error("Error searching Reddit: %s", e)
 
-            return posts
+    def iter_posts_since(self, query: str, since: int, subreddit: Optional[str] = None, max_items: int = 1000) -> Iterator[Dict]:
+        """Yield posts matching query created after `since` (epoch seconds), newest first
 
-        except Exception as e:
-            print(f"Error searching Reddit: {e}")
-            return []
+        Walks the sort=new listing with its `after` cursor and stops at the
+        first post at or before the watermark. Raises IncompleteFetch, after
+        the posts it got, if a page fails.
+        """
+        url, params = self._search_request(query, subreddit, sort='new', time='all')
+        params['limit'] = 100
+        count = 0
+
+        while count < max_items:
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                self.log.error("Error fetching new Reddit posts: %s", e)
+                raise IncompleteFetch(f"Reddit listing page failed: {e}") from e
+
+            children = data['data']['children']
+            for child, post in zip(children, self._parse_search_listing(data)):
+                if child['data']['created_utc'] <= since:
+                    return
+                yield post
+                count += 1
+                if count >= max_items:
+                    return
+
+            after = data['data'].get('after')
+            if not children or not after:
+                return
+            params['after'] = after
+
+    def _search_request(self, query: str, subreddit: Optional[str] = None, sort: str = 'relevance', time: str = 'week') -> Tuple[str, Dict]:
+        if subreddit:
+            url = f"{self.base_url}/r/{subreddit}/search.json"
+            params = {'q': query, 'restrict_sr': 'on', 'sort': sort, 't': time, 'limit': 25}
+        else:
+            url = f"{self.base_url}/search.json"
+            params = {'q': query, 'sort': sort, 't': time, 'limit': 25}
 
+        return url, params
+
+    def _parse_search_listing(self, data: Dict) -> Iterator[Dict]:
+        for child in data['data']['children']:
+            post = child['data']
+            yield {
+                'id': post['id'],
+                'title': post['title'],
+                'author': post['author'],
+                'url': post['url'],
+                'score': post['score'],
+                'comments': post['num_comments'],
+                'subreddit': post['subreddit'],
+                'created_utc': int(post['created_utc']),
+                'permalink': f"https://reddit.com{post['permalink']}"
+            }
 
 class GitHubTrendingScraper(WebScraper):
+    cache_ttl = 3600
+
     def __init__(self):
         super().__init__(delay=1.0)
-        self.base_url = "https://github.com"
-        self.api_url = "https://api.github.com"
+        self.base_url = endpoint('github.web')
+        self.api_url = endpoint('github.api')
         # Get GitHub token from environment
         import os
         self.token = os.environ.get('GITHUB_TOKEN')
@@ -318,7 +1018,10 @@ class GitHubTrendingScraper(WebScraper):
                 'Authorization': f'token {self.token}',
                 'Accept': 'application/vnd.github.v3+json'
             })
+            # Authenticated search allows 30 requests per minute
+            get_rate_limiter().configure('api.github.com', rate=30 / 60, burst=30)
 
+    @memoized()
     def get_trending(self, language: Optional[str] = None, since: str = 'daily') -> List[Dict]:
         if language:
             url = f"{self.base_url}/trending/{language}?since={since}"
@@ -385,7 +1088,7 @@ class GitHubTrendingScraper(WebScraper):
             }
 
         except Exception as e:
-            print(f"Error parsing repo: {e}")
+            self.log.warning("Error parsing repo: %s", e)
             return None
 
     def _parse_number(self, text: str) -> int:
@@ -395,66 +1098,106 @@ class GitHubTrendingScraper(WebScraper):
             return int(match.group(1))
         return 0
 
+    @memoized()
     def search_repos(self, query: str, sort: str = 'stars', order: str = 'desc', limit: int = 30) -> List[Dict]:
         """Search GitHub repositories using the API
         sort: stars, forks, updated, help-wanted-issues
         order: desc, asc
         """
-        url = f"{self.api_url}/search/repositories"
-        params = {
-            'q': query,
-            'sort': sort,
-            'order': order,
-            'per_page': min(limit, 100)  # GitHub API max is 100
-        }
+        return list(self.iter_search_repos(query, sort, order, limit))
+
+    def iter_search_repos(self, query: str, sort: str = 'stars', order: str = 'desc', limit: int = 30, max_items: Optional[int] = None) -> Iterator[Dict]:
+        """Yield repositories as they are parsed, stopping after max_items"""
+        url, params = self._search_request(query, sort, order, limit)
 
         try:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
-
-            repos = []
-            for repo in data.get('items', []):
-                repos.append({
-                    'owner': repo['owner']['login'],
-                    'name': repo['name'],
-                    'full_name': repo['full_name'],
-                    'description': repo.get('description', ''),
-                    'url': repo['html_url'],
-                    'stars': repo['stargazers_count'],
-                    'forks': repo['forks_count'],
-                    'language': repo.get('language', ''),
-                    'created_at': repo['created_at'],
-                    'updated_at': repo['updated_at'],
-                    'topics': repo.get('topics', []),
-                    'license': repo.get('license', {}).get('spdx_id', '') if repo.get('license') else '',
-                    'scraped_at': datetime.now().isoformat()
-                })
-
-            return repos
+            yield from islice(self._parse_search_results(response.json(), FetchContext.from_response(response)), max_items)
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 403:
-                print(f"GitHub API rate limit exceeded. Token: {'Yes' if self.token else 'No'}")
+                self.log.error("GitHub API rate limit exceeded. Token: %s", 'Yes' if self.token else 'No')
             else:
-                print(f"GitHub API error: {e}")
-            return []
+                self.log.error("GitHub API error: %s", e)
         except Exception as e:
-            print(f"Error searching GitHub: {e}")
-            return []
+            self.log.error("Error searching GitHub: %s", e)
+
+    def harvest_repos(self, query: str, sort: str = 'stars', order: str = 'desc', max_items: int = 1000,
+                      page_size: int = 100, prefetch: int = 4) -> Iterator[Dict]:
+        """Yield up to max_items repositories, fetching result pages concurrently
+
+        The search API returns at most 1000 results per query; narrow the query
+        (e.g. with created: or stars: qualifiers) to go deeper.
+        """
+        url, params = self._search_request(query, sort, order, page_size)
+        page_size = params['per_page']
+        pages = min(math.ceil(max_items / page_size), 1000 // page_size)
+
+        def fetch_page(n):
+            try:
+                response = self.session.get(url, params=dict(params, page=n + 1), timeout=10)
+                response.raise_for_status()
+                items = list(self._parse_search_results(response.json(), FetchContext.from_response(response)))
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code == 403:
+                    self.log.error("GitHub API rate limit exceeded. Token: %s", 'Yes' if self.token else 'No')
+                else:
+                    self.log.error("GitHub API error: %s", e)
+                return [], False
+            except Exception as e:
+                self.log.error("Error harvesting GitHub (page %s): %s", n + 1, e)
+                return [], False
+
+            return items, len(items) == page_size
+
+        yield from self._harvest_pages(fetch_page, pages, max_items, prefetch)
+
+    def _search_request(self, query: str, sort: str = 'stars', order: str = 'desc', limit: int = 30) -> Tuple[str, Dict]:
+        url = f"{self.api_url}/search/repositories"
+        params = {
+            'q': query,
+            'sort': sort,
+            'order': order,
+            'per_page': min(limit, 100)  # GitHub API max is 100
+        }
+
+        return url, params
+
+    def _parse_search_results(self, data: Dict, ctx: Optional[FetchContext] = None) -> Iterator[Dict]:
+        scraped_at = (ctx or FetchContext()).scraped_at
+        for repo in data.get('items', []):
+            yield {
+                'owner': repo['owner']['login'],
+                'name': repo['name'],
+                'full_name': repo['full_name'],
+                'description': repo.get('description', ''),
+                'url': repo['html_url'],
+                'stars': repo['stargazers_count'],
+                'forks': repo['forks_count'],
+                'language': repo.get('language', ''),
+                'created_at': repo['created_at'],
+                'updated_at': repo['updated_at'],
+                'topics': repo.get('topics', []),
+                'license': repo.get('license', {}).get('spdx_id', '') if repo.get('license') else '',
+                'scraped_at': scraped_at
+            }
 
+def export_results(data: Iterable[Dict], filename: str, format: str = 'json', source: Optional[str] = None):
+    """Write scraped items to filename; data may be any iterable, including a generator
 
-def export_results(data: List[Dict], filename: str, format: str = 'json'):
+    json: an indented array; csv: one column per key seen in any item, no file if there are none;
+    jsonl / ndjson: one JSON object per line. A .gz or .zst suffix compresses.
+    parquet / feather: typed columns (needs pyarrow), using the schema of
+    `source` (e.g. 'hackernews', see exporters.COLUMN_SCHEMAS) when given.
+    """
     if format == 'json':
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        write_json(data, filename)
     elif format == 'csv':
-        import csv
-        if data:
-            keys = data[0].keys()
-            with open(filename, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=keys)
-                writer.writeheader()
-                writer.writerows(data)
+        write_csv(data, filename)
+    elif format in ('jsonl', 'ndjson'):
+        write_ndjson(data, filename)
+    elif format in ('parquet', 'feather'):
+        write_columnar(data, filename, source, format)
     else:
-        raise ValueError(f"Unsupported format: {format}")
\ No newline at end of file
+        raise ValueError(f"Unsupported format: {format}")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse, urlsplit, urlunsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from metrics import get_metrics
+
+try:
+    import httpx
+except ImportError:  # Only HTTP/2 needs httpx (with its h2 extra)
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError:  # Only the async stack needs aiohttp
+    aiohttp = None
+
+
+# TCP keep-alive on top of urllib3's defaults, so idle pooled connections are
+# not silently dropped by NAT boxes between bursts of requests
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class _TimedConnectionMixin:
+    """Records how long new connections take to set up, per host
+
+    http_connect_seconds covers DNS resolution and the TCP handshake;
+    http_tls_seconds the TLS handshake that follows on HTTPS connections.
+    """
+
+    _connect_elapsed = 0.0
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        self._connect_elapsed = time.perf_counter() - start
+        get_metrics().observe('http_connect_seconds', self._connect_elapsed, host=self.host)
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        if isinstance(self, HTTPSConnection):
+            tls = time.perf_counter() - start - self._connect_elapsed
+            get_metrics().observe('http_tls_seconds', max(0.0, tls), host=self.host)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _MeteredPoolMixin:
+    """Counts connections that were dropped because the pool was already full"""
+
+    discarded = 0
+
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            self.discarded += 1
+        super()._put_conn(conn)
+
+
+class MeteredHTTPConnectionPool(_MeteredPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class MeteredHTTPSConnectionPool(_MeteredPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class HostPoolManager(PoolManager):
+    """PoolManager whose per-host pool size can be set host by host"""
+
+    def __init__(self, host_maxsize: Optional[Dict[str, int]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.host_maxsize = {host.lower(): size for host, size in (host_maxsize or {}).items()}
+        self.pool_classes_by_scheme = {'http': MeteredHTTPConnectionPool, 'https': MeteredHTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        if request_context is not None and host in self.host_maxsize:
+            request_context = dict(request_context, maxsize=self.host_maxsize[host])
+        return super()._new_pool(scheme, host, port, request_context)
+
+
+class Transport:
+    """Connection pools shared by every scraper session in the process
+
+    Each WebScraper keeps its own requests.Session (headers, auth), but their
+    adapters all draw connections from one HostPoolManager, so a host's
+    keep-alive connections and TLS sessions are reused across scrapers and
+    threads instead of being opened per scraper instance.
+
+    pool_maxsize is the number of connections kept per host (host_pool_sizes
+    overrides it for individual hosts); with pool_block the pool makes
+    callers wait for a free connection rather than opening extra ones that
+    are discarded afterwards. With http2=True, HTTPS requests go through a
+    shared httpx client that multiplexes them over one HTTP/2 connection
+    per host where the server supports it, and fall back to HTTP/1.1 where
+    it does not.
+
+    routes sends requests for an origin somewhere else, e.g.
+    {'https://hn.algolia.com': 'http://127.0.0.1:8099/https/hn.algolia.com'}
+    for a local mock server: the path and query are appended to the new
+    base. Rate limits, caching, retries and metrics still see the original
+    URL; only the connection goes to the new base.
+    """
+
+    def __init__(self, pool_connections: int = 32, pool_maxsize: int = 16,
+                 host_pool_sizes: Optional[Dict[str, int]] = None, pool_block: bool = False,
+                 http2: bool = False, keepalive_expiry: float = 60.0, routes: Optional[Dict[str, str]] = None):
+        if http2 and httpx is None:
+            raise ImportError("HTTP/2 support requires httpx: pip install 'httpx[http2]'")
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(host_pool_sizes or {})
+        self.pool_block = pool_block
+        self.http2 = http2
+        self.keepalive_expiry = keepalive_expiry
+        self.routes = {origin.rstrip('/').lower(): base.rstrip('/') for origin, base in (routes or {}).items()}
+
+        self.pool_manager = HostPoolManager(
+            self.host_pool_sizes, num_pools=pool_connections, maxsize=pool_maxsize, block=pool_block,
+            socket_options=KEEPALIVE_SOCKET_OPTIONS
+        )
+        self._http2_client = None
+        self._http2_counts = {}
+        self._lock = threading.Lock()
+
+    def route_url(self, url: str) -> str:
+        """Where a request for url is actually sent"""
+        if not self.routes:
+            return url
+        parts = urlsplit(url)
+        base = self.routes.get(f"{parts.scheme}://{parts.netloc}".lower())
+        if base is None:
+            return url
+        return base + urlunsplit(('', '', parts.path or '/', parts.query, ''))
+
+    def route(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        """request itself, or a copy addressed to the base its origin is routed to"""
+        url = self.route_url(request.url)
+        if url == request.url:
+            return request
+        routed = request.copy()
+        routed.url = url
+        routed.headers.pop('Host', None)
+        return routed
+
+    def _get_http2_client(self, verify, cert) -> 'httpx.Client':
+        with self._lock:
+            if self._http2_client is None:
+                limits = httpx.Limits(max_connections=self.pool_connections * self.pool_maxsize,
+                                      max_keepalive_connections=self.pool_connections,
+                                      keepalive_expiry=self.keepalive_expiry)
+                self._http2_client = httpx.Client(http2=True, limits=limits, verify=verify, cert=cert,
+                                                  follow_redirects=False)
+            return self._http2_client
+
+    def use_http2(self, request: requests.PreparedRequest, stream: bool = False, proxies=None) -> bool:
+        """Whether request can go over the shared HTTP/2 client"""
+        return self.http2 and not stream and not proxies and request.url.startswith('https://')
+
+    def send_http2(self, request: requests.PreparedRequest, timeout=None, verify=True, cert=None,
+                   **kwargs) -> requests.Response:
+        """Send a prepared request over the HTTP/2 client and wrap the result as a requests.Response"""
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        client = self._get_http2_client(verify, cert)
+        try:
+            reply = client.request(request.method, request.url, headers=dict(request.headers),
+                                   content=request.body, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        host = urlparse(request.url).hostname
+        with self._lock:
+            counts = self._http2_counts.setdefault(host, {})
+            counts[reply.http_version] = counts.get(reply.http_version, 0) + 1
+
+        # Header values are already decoded by httpx; drop the framing headers
+        headers = CaseInsensitiveDict((k, v) for k, v in reply.headers.items()
+                                      if k.lower() not in ('content-encoding', 'transfer-encoding'))
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.reason = reply.reason_phrase
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response._content = reply.content
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.http_version = reply.http_version
+        return response
+
+    def aiohttp_connector(self, limit: Optional[int] = None, limit_per_host: Optional[int] = None) -> 'aiohttp.TCPConnector':
+        """A TCPConnector sized like the sync pools, for a ClientSession shared by the async scrapers"""
+        if aiohttp is None:
+            raise ImportError("The async scrapers require aiohttp: pip install aiohttp")
+        return aiohttp.TCPConnector(
+            limit=self.pool_connections * self.pool_maxsize if limit is None else limit,
+            limit_per_host=self.pool_maxsize if limit_per_host is None else limit_per_host,
+            keepalive_timeout=self.keepalive_expiry, ttl_dns_cache=300
+        )
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-host connection reuse: requests sent, connections opened, reuse ratio, discards"""
+        stats = {}
+        for key in list(self.pool_manager.pools.keys()):
+            pool = self.pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            host = stats.setdefault(key.key_host, {'requests': 0, 'connections': 0, 'discarded': 0})
+            host['requests'] += pool.num_requests
+            host['connections'] += pool.num_connections
+            host['discarded'] += pool.discarded
+
+        for host in stats.values():
+            host['reused'] = max(0, host['requests'] - host['connections'])
+            host['reuse_ratio'] = host['reused'] / host['requests'] if host['requests'] else 0.0
+
+        with self._lock:
+            for name, counts in self._http2_counts.items():
+                stats.setdefault(name, {'requests': 0, 'connections': 0, 'discarded': 0,
+                                        'reused': 0, 'reuse_ratio': 0.0})['http2'] = dict(counts)
+        return stats
+
+    def close(self):
+        self.pool_manager.clear()
+        with self._lock:
+            if self._http2_client is not None:
+                self._http2_client.close()
+                self._http2_client = None
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def configure_transport(**kwargs) -> Transport:
+    """Replace the process-wide transport; takes Transport's keyword arguments
+
+    Scrapers created afterwards use the new pools. Existing ones keep the
+    pools they were created with.
+    """
+    global _default_transport
+    with _default_transport_lock:
+        _default_transport = Transport(**kwargs)
+    return _default_transport
+
+
+def get_transport() -> Transport:
+    """The process-wide transport, with HTTP/2 turned on by RESEARCH_HTTP2=1"""
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport(http2=os.environ.get('RESEARCH_HTTP2') == '1' and httpx is not None)
+    return _default_transport